@@ -1,19 +1,13 @@
-import json
 from pathlib import Path
-from typing import Dict, Tuple
 
-from flask import Flask, jsonify, redirect, render_template, request, url_for
+from flask import Flask, jsonify, redirect, render_template, request, stream_with_context, url_for
 
-from controllers import owner, rental
+from controllers import market, owner, rental, tax
+from capital_market.backtest import PriceStore
 from capital_market.models import simulate_market_investment
+from data_registry import DataFileRegistry
 from real_estate.market_data import get_real_estate_market_placeholder
 from real_estate.finance_data import get_real_estate_finance_data_placeholder
-from tax_calculations import (
-    est_2026,
-    est_2026_married,
-    tax_rates_married,
-    tax_rates_single,
-)
 
 
 app = Flask(__name__, static_folder="static", template_folder="templates")
@@ -31,17 +25,9 @@ real_estate_finance_data = get_real_estate_finance_data_placeholder(
     FINANCE_DATA_PLACEHOLDER_FILE.read_text(encoding="utf-8")
 )
 
+price_store = PriceStore(DATA_DIR / "prices")
 
-
-
-def load_data_files() -> Dict[str, object]:
-    data_files: Dict[str, object] = {}
-
-    for file_path in DATA_DIR.glob("*.json"):
-        with file_path.open("r", encoding="utf-8") as file:
-            data_files[file_path.name] = json.load(file)
-
-    return data_files
+data_registry = DataFileRegistry(DATA_DIR)
 
 
 @app.route("/properties")
@@ -59,71 +45,41 @@ def average_rent():
     return jsonify(owner.average_rent(request.args))
 
 
-@app.route("/api/tax", methods=["POST"])
+@app.route("/api/tax", methods=["GET", "POST"])
 def calculate_tax():
-    payload = request.get_json(silent=True) or {}
-    primary_zve = max(payload.get("zve", 0.0) or 0.0, 0.0)
-    partner_zve = max(payload.get("partner_zve", 0.0) or 0.0, 0.0)
-    filing_status = (payload.get("filing_status") or "single").lower()
-
-    if filing_status == "married":
-        est, avg_rate, marginal_rate = tax_rates_married(primary_zve, partner_zve)
-        total_zve = primary_zve + partner_zve
-
-        def _tax_calc(income: float) -> Tuple[float, float, float]:
-            return tax_rates_married(income, 0.0)
-
+    if request.method == "GET":
+        payload = request.args
     else:
-        est, avg_rate, marginal_rate = tax_rates_single(primary_zve)
-        total_zve = primary_zve
-
-        def _tax_calc(income: float) -> Tuple[float, float, float]:
-            return tax_rates_single(income)
-
-    def _tax_curve(max_income: float, step: float = 1_000.0) -> list[dict]:
-        capped_income = max(max_income, 300_000)
-        points = []
-        income = 0.0
-
-        while income <= capped_income:
-            est_point, avg_point, marginal_point = _tax_calc(income)
-            points.append(
-                {
-                    "zve": round(income, 2),
-                    "est": round(est_point, 2),
-                    "avg_rate": round(avg_point, 2),
-                    "marginal_rate": round(marginal_point, 2),
-                }
-            )
-            income += step
-
-        if capped_income % step != 0:
-            # Ensure the upper bound is included for consistent chart lines
-            est_point, avg_point, marginal_point = _tax_calc(capped_income)
-            points.append(
-                {
-                    "zve": round(capped_income, 2),
-                    "est": round(est_point, 2),
-                    "avg_rate": round(avg_point, 2),
-                    "marginal_rate": round(marginal_point, 2),
-                }
-            )
-
-        return points
+        payload = request.get_json(silent=True) or {}
 
-    return jsonify(
-        {
-            "zve": total_zve,
-            "est": round(est, 2),
-            "avg_rate": round(avg_rate, 2),
-            "marginal_rate": round(marginal_rate, 2),
-            "curve": _tax_curve(max_income=total_zve),
-            "filing_status": filing_status,
-            "partner_zve": partner_zve if filing_status == "married" else 0.0,
-        }
+    try:
+        body, etag = tax.calculate_response(payload)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@app.route("/api/tax/bulk", methods=["POST"])
+def calculate_tax_bulk():
+    households = tax.iter_households(request.stream)
+    return app.response_class(
+        stream_with_context(tax.bulk_calculate(households)),
+        mimetype="application/x-ndjson",
     )
 
 
+@app.route("/api/tax/splitting-surface", methods=["POST"])
+def tax_splitting_surface():
+    payload = request.get_json(silent=True) or {}
+    try:
+        return jsonify(tax.splitting_surface(payload))
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
+
 @app.route("/api/plz/<plz>/market-data")
 def plz_market_data(plz: str):
     """Return fixed market data metrics for a given postal code."""
@@ -139,12 +95,57 @@ def plz_market_data(plz: str):
     )
 
 
+@app.route("/api/eigenheim/projection", methods=["POST"])
+def owner_projection():
+    payload = request.get_json(silent=True) or {}
+    result = owner.run_projection(payload)
+    if "error" in result:
+        return jsonify(result), 400
+    return jsonify(result)
+
+
+@app.route("/api/eigenheim/rent-vs-buy", methods=["POST"])
+def owner_rent_vs_buy():
+    payload = request.get_json(silent=True) or {}
+    result = owner.run_rent_vs_buy(payload)
+    if "error" in result:
+        return jsonify(result), 400
+    return jsonify(result)
+
+
 @app.route("/api/vermietung/simulation", methods=["POST"])
 def buy_to_let_simulation():
     payload = request.get_json(silent=True) or {}
     return jsonify(rental.run_simulation(payload))
 
 
+@app.route("/api/vermietung/sweep", methods=["POST"])
+def buy_to_let_sweep():
+    payload = request.get_json(silent=True) or {}
+    result = rental.run_sweep(payload)
+    if "error" in result:
+        return jsonify(result), 400
+    return jsonify(result)
+
+
+@app.route("/api/vermietung/solve", methods=["POST"])
+def buy_to_let_solve():
+    payload = request.get_json(silent=True) or {}
+    result = rental.run_solve(payload)
+    if "error" in result:
+        return jsonify(result), 400
+    return jsonify(result)
+
+
+@app.route("/api/vermietung/monte-carlo", methods=["POST"])
+def buy_to_let_monte_carlo():
+    payload = request.get_json(silent=True) or {}
+    result = rental.run_monte_carlo(payload)
+    if "error" in result:
+        return jsonify(result), 400
+    return jsonify(result)
+
+
 @app.route("/api/capitalmarket/simulation", methods=["POST"])
 def capital_market_simulation():
     payload = request.get_json(silent=True) or {}
@@ -153,10 +154,9 @@ def capital_market_simulation():
     yearly_savings = float(payload.get("yearly_savings") or 0.0)
     years = max(int(payload.get("years") or 0), 1)
 
-    data_files = load_data_files()
-    capitalmarket_data = data_files.get("capitalmarketdata.json", [])
+    capitalmarket_data = data_registry.get("capitalmarketdata.json", ())
 
-    if not isinstance(capitalmarket_data, list) or not capitalmarket_data:
+    if not isinstance(capitalmarket_data, tuple) or not capitalmarket_data:
         return jsonify({"error": "Keine Kapitalmarktdaten vorhanden."}), 400
 
     try:
@@ -193,10 +193,38 @@ def capital_market_simulation():
     )
 
 
+@app.route("/api/capitalmarket/comparison", methods=["POST"])
+def capital_market_comparison():
+    payload = request.get_json(silent=True) or {}
+    products = data_registry.get("capitalmarketdata.json", ())
+    result = market.run_comparison(payload, products)
+    if "error" in result:
+        return jsonify(result), 400
+    return jsonify(result)
+
+
+@app.route("/api/capitalmarket/monte-carlo", methods=["POST"])
+def capital_market_monte_carlo():
+    payload = request.get_json(silent=True) or {}
+    products = data_registry.get("capitalmarketdata.json", ())
+    result = market.run_monte_carlo(payload, products)
+    if "error" in result:
+        return jsonify(result), 400
+    return jsonify(result)
+
+
+@app.route("/api/capitalmarket/backtest", methods=["POST"])
+def capital_market_backtest():
+    payload = request.get_json(silent=True) or {}
+    result = market.run_backtest(payload, price_store)
+    if "error" in result:
+        return jsonify(result), 400
+    return jsonify(result)
+
+
 @app.route("/")
 def home_page():
-    data_files = load_data_files()
-    capitalmarket_data = data_files.get("capitalmarketdata.json", [])
+    capitalmarket_data = data_registry.get("capitalmarketdata.json", ())
 
     return render_template("index.html", capitalmarket_data=capitalmarket_data)
 
@@ -1,25 +1,37 @@
 """Capital market utilities for property search and mortgage calculations."""
 from dataclasses import asdict
+import math
 import random
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from capital_market.models import CapitalMarketInvestment
 from real_estate.models import Property
-from real_estate.finance import MAX_AMORTIZATION_YEARS, mortgage_schedule
+from real_estate.finance import MAX_AMORTIZATION_YEARS, mortgage_summary, scaled_mortgage_schedule
+from real_estate.listings import ListingStore
+from real_estate.spatial import destination_point, haversine_km
+from real_estate.monthly_loan import (
+    MONTHS_PER_YEAR,
+    MonthlyLoanOptions,
+    monthly_installment,
+    monthly_loan_summary,
+)
 
 DEFAULT_INTEREST_RATE = 0.01
 DEFAULT_TILGUNG_RATE = 0.04
 ADDITIONAL_COST_RATE = 0.105
 
 
-def _deg_per_km() -> float:
-    """Approximate number of degrees latitude per kilometre."""
-    return 1.0 / 111.0
-
+def _random_location(
+    base_lat: float, base_lon: float, radius_km: float, rng: random.Random
+) -> Tuple[float, float]:
+    """Uniformly distributed point within ``radius_km`` (great-circle distance) of the base."""
 
-def _random_coordinate(base: float, radius_km: float, rng: random.Random) -> float:
-    jitter = rng.uniform(-radius_km, radius_km) * _deg_per_km()
-    return base + jitter
+    distance = radius_km * math.sqrt(rng.random())
+    bearing = rng.uniform(0, 360)
+    latitude, longitude = destination_point(base_lat, base_lon, distance, bearing)
+    return float(latitude), float(longitude)
 
 
 def _generate_property(
@@ -29,13 +41,14 @@ def _generate_property(
     price = int(rng.uniform(100_000, 1_500_000))
     rooms = rng.randint(1, 6)
     rent_price = int(rng.uniform(800, 4000)) if rng.random() > 0.4 else None
+    latitude, longitude = _random_location(base_lat, base_lon, radius, rng)
     return Property(
         identifier=f"property-{index}",
         price_eur=price,
         living_space_sqm=size,
         rooms=rooms,
-        latitude=_random_coordinate(base_lat, radius, rng),
-        longitude=_random_coordinate(base_lon, radius, rng),
+        latitude=latitude,
+        longitude=longitude,
         address=f"Random Street {rng.randint(1, 200)}, {rng.randint(10000, 99999)} Sample City",
         property_type=rng.choice(["apartment", "loft", "condo", "house"]),
         rent_price_eur=rent_price,
@@ -49,27 +62,6 @@ def _generate_properties(
     return [_generate_property(base_lat, base_lon, radius, i, rng) for i in range(count)]
 
 
-def _filter_properties(
-    properties: List[Property],
-    min_price: float,
-    max_price: float,
-    min_size: float,
-    max_size: float,
-    min_rooms: int,
-    max_rooms: int,
-) -> List[Property]:
-    result = []
-    for prop in properties:
-        if not (min_price <= prop.price_eur <= max_price):
-            continue
-        if not (min_size <= prop.living_space_sqm <= max_size):
-            continue
-        if not (min_rooms <= prop.rooms <= max_rooms):
-            continue
-        result.append(prop)
-    return result
-
-
 def estimate_rent(
     living_space_sqm: float, rent_per_sqm: Optional[float], fallback_rent_per_sqm: float
 ) -> Tuple[float, float]:
@@ -80,6 +72,51 @@ def estimate_rent(
     return round(monthly_rent, 2), rent_rate
 
 
+def _loan_amount(prop: Property, available_assets: float, additional_cost_rate: float) -> float:
+    total_price = prop.price_eur * (1 + max(additional_cost_rate, 0))
+    return max(total_price - max(available_assets, 0), 0)
+
+
+def monthly_mortgage_details(
+    loan_amounts: Sequence[float],
+    interest_rate: float,
+    initial_tilgung_rate: float,
+    loan_options: MonthlyLoanOptions,
+) -> List[dict]:
+    """Mortgage figures of the monthly loan engine for many loans in one batch."""
+
+    loans = np.asarray(loan_amounts, dtype=float)
+    installment = monthly_installment(loans, interest_rate, initial_tilgung_rate)
+    columns = loan_options.columns(loans, interest_rate, installment, MAX_AMORTIZATION_YEARS)
+    summary = monthly_loan_summary(columns)
+
+    fixed_years = loan_options.fixed_rate_years
+    if fixed_years and 0 < fixed_years <= MAX_AMORTIZATION_YEARS:
+        remaining_after_fixed = np.round(columns["loan_rest_end"][:, fixed_years - 1], 2).tolist()
+    else:
+        remaining_after_fixed = [None] * len(loans)
+
+    return [
+        {
+            "mortgage_years": math.ceil(months / MONTHS_PER_YEAR),
+            "mortgage_months": int(months),
+            "mortgage_total_interest": round(total_interest, 2),
+            "mortgage_total_paid": round(total_paid, 2),
+            "mortgage_monthly_rate": round(rate, 2),
+            "mortgage_special_repayment_total": round(special_total, 2),
+            "mortgage_remaining_after_fixed_rate": remaining,
+        }
+        for months, total_interest, total_paid, rate, special_total, remaining in zip(
+            summary["months"].tolist(),
+            summary["total_interest"].tolist(),
+            summary["total_paid"].tolist(),
+            installment.tolist(),
+            summary["total_special_repayment"].tolist(),
+            remaining_after_fixed,
+        )
+    ]
+
+
 def _serialize_property_with_mortgage(
     prop: Property,
     interest_rate: float,
@@ -87,12 +124,14 @@ def _serialize_property_with_mortgage(
     available_assets: float,
     additional_cost_rate: float,
     average_rent_per_sqm: float,
+    monthly_details: Optional[dict] = None,
+    include_schedule: bool = False,
 ) -> dict:
     usable_assets = max(available_assets, 0)
     cost_rate = max(additional_cost_rate, 0)
     total_price = prop.price_eur * (1 + cost_rate)
     additional_costs = total_price - prop.price_eur
-    loan_amount = max(total_price - usable_assets, 0)
+    loan_amount = _loan_amount(prop, available_assets, additional_cost_rate)
 
     estimated_rent_month, used_rent_rate = estimate_rent(
         prop.living_space_sqm,
@@ -100,22 +139,53 @@ def _serialize_property_with_mortgage(
         average_rent_per_sqm,
     )
 
-    if loan_amount > 0:
-        schedule, total_interest, total_paid = mortgage_schedule(
-            loan_amount,
-            interest_rate,
-            initial_tilgung_rate,
-            MAX_AMORTIZATION_YEARS,
-        )
-        mortgage_years = len(schedule)
+    if monthly_details is not None:
+        mortgage = monthly_details
+    elif loan_amount > 0:
+        schedule = None
+        if include_schedule:
+            # Listings sharing the loan terms reuse one cached per-euro amortization run.
+            schedule, total_interest, total_paid = scaled_mortgage_schedule(
+                loan_amount,
+                interest_rate,
+                initial_tilgung_rate,
+                MAX_AMORTIZATION_YEARS,
+            )
+            mortgage_years = len(schedule)
+        else:
+            mortgage_years, total_interest, total_paid = mortgage_summary(
+                loan_amount,
+                interest_rate,
+                initial_tilgung_rate,
+                MAX_AMORTIZATION_YEARS,
+            )
         annual_annuity = loan_amount * (interest_rate + initial_tilgung_rate)
         monthly_rate = annual_annuity / 12 if annual_annuity > 0 else 0
+        mortgage = {
+            "mortgage_years": mortgage_years,
+            "mortgage_total_interest": round(total_interest, 2),
+            "mortgage_total_paid": round(total_paid, 2),
+            "mortgage_monthly_rate": round(monthly_rate, 2),
+        }
+        if schedule is not None:
+            mortgage["mortgage_schedule"] = [
+                {
+                    "year": record.year,
+                    "interest_paid": round(record.interest_paid, 2),
+                    "principal_paid": round(record.principal_paid, 2),
+                    "remaining_principal": round(record.remaining_principal, 2),
+                }
+                for record in schedule
+            ]
     else:
-        schedule = []
-        total_interest = 0.0
-        total_paid = 0.0
-        mortgage_years = 0
-        monthly_rate = 0.0
+        mortgage = {
+            "mortgage_years": 0,
+            "mortgage_total_interest": 0.0,
+            "mortgage_total_paid": 0.0,
+            "mortgage_monthly_rate": 0.0,
+        }
+        if include_schedule:
+            mortgage["mortgage_schedule"] = []
 
     return {
         **asdict(prop),
@@ -125,10 +195,7 @@ def _serialize_property_with_mortgage(
         "additional_costs_eur": round(additional_costs),
         "total_price_eur": round(total_price),
         "additional_cost_rate": cost_rate,
-        "mortgage_years": mortgage_years,
-        "mortgage_total_interest": round(total_interest, 2),
-        "mortgage_total_paid": round(total_paid, 2),
-        "mortgage_monthly_rate": round(monthly_rate, 2),
+        **mortgage,
         "mortgage_interest_rate": interest_rate,
         "mortgage_tilgung_rate": initial_tilgung_rate,
         "mortgage_loan_amount": loan_amount,
@@ -152,25 +219,60 @@ def build_property_payload(
     available_assets: float,
     additional_cost_rate: float,
     rng: Optional[random.Random] = None,
+    loan_options: Optional[MonthlyLoanOptions] = None,
+    listings: Optional[ListingStore] = None,
+    sort_by_distance: bool = False,
+    include_schedule: bool = False,
 ) -> List[dict]:
+    """Listings within ``radius`` km matching the filters, with mortgage figures.
+
+    Results are ordered most expensive first, or nearest first with
+    ``sort_by_distance``, and carry their great-circle ``distance_km``.
+    Without ``listings`` 30 random listings around the location are
+    generated. With ``loan_options`` the mortgages of all listings are
+    evaluated in one batch by the monthly loan engine (Zinsbindung,
+    Sondertilgung); otherwise the yearly annuity summary is used, and
+    ``include_schedule`` adds each listing's yearly ``mortgage_schedule`` rows.
+    """
+
     rng = rng or random
-    properties = _generate_properties(30, latitude, longitude, radius, rng)
-    filtered = _filter_properties(
-        properties, min_price, max_price, min_size, max_size, min_rooms, max_rooms
+    if listings is None:
+        listings = ListingStore.from_properties(_generate_properties(30, latitude, longitude, radius, rng))
+    nearby, _ = listings.within(latitude, longitude, radius)
+    rows = listings.query(min_price, max_price, min_size, max_size, min_rooms, max_rooms, candidates=nearby)
+    if sort_by_distance:
+        rows = nearby[np.isin(nearby, rows)]
+    distances = haversine_km(
+        latitude, longitude, listings.columns["latitude"][rows], listings.columns["longitude"][rows]
     )
-    filtered.sort(key=lambda prop: prop.price_eur, reverse=True)
+    filtered = listings.properties(rows)
     average_rent_per_sqm = average_price_per_sqm(latitude, longitude, radius, rent=True, rng=rng)
 
-    return [
-        _serialize_property_with_mortgage(
-            prop,
+    if loan_options is not None:
+        details = monthly_mortgage_details(
+            [_loan_amount(prop, available_assets, additional_cost_rate) for prop in filtered],
             interest_rate,
             initial_tilgung_rate,
-            available_assets,
-            additional_cost_rate,
-            average_rent_per_sqm,
+            loan_options,
         )
-        for prop in filtered
+    else:
+        details = [None] * len(filtered)
+
+    return [
+        {
+            **_serialize_property_with_mortgage(
+                prop,
+                interest_rate,
+                initial_tilgung_rate,
+                available_assets,
+                additional_cost_rate,
+                average_rent_per_sqm,
+                monthly_details=monthly_details,
+                include_schedule=include_schedule,
+            ),
+            "distance_km": round(distance, 3),
+        }
+        for prop, distance, monthly_details in zip(filtered, distances.tolist(), details)
     ]
 
 
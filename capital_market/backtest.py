@@ -0,0 +1,161 @@
+"""Historical backtests of savings plans over local price series.
+
+Price files are CSVs named ``<ISIN>.csv`` with a header row and ``date``
+(ISO format) and ``close`` columns, daily or monthly. Closes are taken as
+total-return prices, i.e. distributions are assumed to be reinvested.
+:class:`PriceStore` converts every file once into a ``.npy`` file holding
+both columns (``datetime64[D]`` dates and ``float64`` closes) and memory-maps
+it, so decades of daily data for many ISINs are never held as Python objects.
+
+A backtest samples month-end closes and evaluates the savings plan of
+``simulate_market_investment`` (lump sum plus a yearly savings rate invested
+at the start of every year) for every rolling start month at once.
+"""
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+STORE_DIRNAME = ".store"
+PRICE_DTYPE = np.dtype([("date", "datetime64[D]"), ("close", "f8")])
+ISIN_PATTERN = re.compile(r"^[A-Z]{2}[A-Z0-9]{9}[0-9]$")
+MONTHS_PER_YEAR = 12
+DEFAULT_HORIZONS = (5, 10, 15, 20, 30)
+
+
+class PriceStore:
+    """Memory-mapped columnar store of price series keyed by ISIN.
+
+    ``source_dir`` holds the CSV files; the converted columns live in
+    ``store_dir`` (default ``source_dir/.store``) and are rebuilt whenever a
+    CSV is newer than its columns. Only file names that are well-formed ISINs
+    are served, so a key can never address a path outside the store.
+    """
+
+    def __init__(self, source_dir: Union[str, Path], store_dir: Optional[Union[str, Path]] = None):
+        self.source_dir = Path(source_dir)
+        self.store_dir = Path(store_dir) if store_dir is not None else self.source_dir / STORE_DIRNAME
+
+    def isins(self) -> List[str]:
+        if not self.source_dir.is_dir():
+            return []
+        return sorted(path.stem for path in self.source_dir.glob("*.csv") if ISIN_PATTERN.match(path.stem))
+
+    def _store_path(self, isin: str) -> Path:
+        return self.store_dir / f"{isin}.npy"
+
+    def _build(self, isin: str, source: Path) -> None:
+        rows = np.loadtxt(
+            source,
+            delimiter=",",
+            skiprows=1,
+            usecols=(0, 1),
+            dtype=PRICE_DTYPE,
+            ndmin=1,
+        )
+        rows = rows[np.isfinite(rows["close"]) & (rows["close"] > 0)]
+        rows.sort(order="date", kind="stable")
+
+        # Both columns go into one file, replaced atomically under a unique temporary
+        # name, so concurrent rebuilds never clobber each other or pair mismatched columns.
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.store_dir, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                np.save(tmp_file, rows)
+            os.replace(tmp_name, self._store_path(isin))
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    def load(self, isin: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Read-only memory maps ``(dates, closes)`` of ``isin``, sorted by date.
+
+        Raises ``KeyError`` for malformed ISINs and missing files, and
+        ``ValueError`` for price files that cannot be parsed.
+        """
+
+        if not isinstance(isin, str) or not ISIN_PATTERN.match(isin):
+            raise KeyError(f"Invalid ISIN {isin!r}.")
+        source = self.source_dir / f"{isin}.csv"
+        if not source.is_file():
+            raise KeyError(f"No price file for {isin!r}.")
+        path = self._store_path(isin)
+        if not path.is_file() or path.stat().st_mtime_ns < source.stat().st_mtime_ns:
+            self._build(isin, source)
+        rows = np.load(path, mmap_mode="r")
+        if rows.dtype != PRICE_DTYPE:
+            raise ValueError(f"Unexpected column layout in {path}.")
+        return rows["date"], rows["close"]
+
+    def monthly(self, isin: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Month-end closes ``(months, closes)``; months without quotes carry the last close forward."""
+
+        dates, closes = self.load(isin)
+        if len(dates) == 0:
+            return np.array([], dtype="datetime64[M]"), np.array([], dtype=float)
+        months = np.arange(dates[0].astype("datetime64[M]"), dates[-1].astype("datetime64[M]") + 1)
+        month_ends = (months + 1).astype("datetime64[D]")
+        last_quote = np.searchsorted(dates, month_ends, side="left") - 1
+        return months, np.asarray(closes[last_quote], dtype=float)
+
+
+def rolling_savings_plan(
+    prices: np.ndarray, initial_investment_amount: float, yearly_investment_rate: float, years: int
+) -> np.ndarray:
+    """Final wealth of the savings plan for every start month with ``years`` of data.
+
+    ``prices`` are month-end closes. Contributions buy at the close of the
+    start month and of every anniversary; the plan is valued ``12 * years``
+    months after the start. Returns one value per start month.
+    """
+
+    months = years * MONTHS_PER_YEAR
+    n_starts = len(prices) - months
+    if years < 1 or n_starts < 1:
+        return np.array([], dtype=float)
+
+    prices = np.asarray(prices, dtype=float)
+    units_per_euro = 1 / prices
+    windows = np.lib.stride_tricks.sliding_window_view(units_per_euro[:-1], months)[:, ::MONTHS_PER_YEAR]
+    units = initial_investment_amount * units_per_euro[:n_starts] + yearly_investment_rate * windows.sum(axis=1)
+    return units * prices[months:]
+
+
+def backtest_savings_plan(
+    months: np.ndarray,
+    prices: np.ndarray,
+    initial_investment_amount: float,
+    yearly_investment_rate: float,
+    horizons: Iterable[int] = DEFAULT_HORIZONS,
+) -> Dict[int, dict]:
+    """Best, worst and median outcome over all rolling start months per horizon (in years).
+
+    Horizons longer than the price history are left out.
+    """
+
+    summary: Dict[int, dict] = {}
+    for years in horizons:
+        finals = rolling_savings_plan(prices, initial_investment_amount, yearly_investment_rate, years)
+        if finals.size == 0:
+            continue
+        invested = initial_investment_amount + yearly_investment_rate * years
+        order = np.argsort(finals, kind="stable")
+        outcomes = {}
+        for name, position in (("worst", order[0]), ("median", order[len(order) // 2]), ("best", order[-1])):
+            final_value = float(finals[position])
+            outcomes[name] = {
+                "start": str(months[position]),
+                "final_value": final_value,
+                "multiple": final_value / invested if invested > 0 else None,
+            }
+        summary[years] = {
+            "windows": int(finals.size),
+            "invested": invested,
+            **outcomes,
+            "shortfall_probability": float(np.count_nonzero(finals < invested) / finals.size),
+        }
+    return summary
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class CapitalMarketInvestment:
     def __init__(self, name, isin, expected_return):
         self.name = name
@@ -29,3 +32,25 @@ def simulate_market_investment(name, isin, expected_return, initial_investment_a
     return values, years
 
 
+def simulate_market_products(expected_returns, initial_investment_amount, yearly_investment_rate, years):
+    """Closed-form wealth paths of many products at once.
+
+    Matches ``simulate_market_investment``: the savings rate is invested at
+    the start of every year, so after year ``k``
+
+        V_k = W * g**k + S * g * (g**k - 1) / r,    g = 1 + r
+
+    Arguments broadcast against each other; the result has shape
+    ``(*batch, years)`` with the value after year ``k`` in column ``k - 1``.
+    """
+
+    returns = np.asarray(expected_returns, dtype=float)[..., None]
+    initial = np.asarray(initial_investment_amount, dtype=float)[..., None]
+    yearly = np.asarray(yearly_investment_rate, dtype=float)[..., None]
+    elapsed = np.arange(1, years + 1, dtype=float)
+
+    # g**k - 1 via expm1/log1p stays accurate for returns close to zero.
+    growth_minus_one = np.expm1(elapsed * np.log1p(returns))
+    safe_returns = np.where(returns == 0, 1.0, returns)
+    savings_factor = np.where(returns == 0, elapsed, (1 + returns) * growth_minus_one / safe_returns)
+    return initial * (1 + growth_minus_one) + yearly * savings_factor
@@ -0,0 +1,117 @@
+"""Monte Carlo mode for ETF savings plans.
+
+Annual returns are drawn per path and year (by default lognormal around the
+product's expected return with a given volatility). Paths are simulated in
+vectorized batches and folded into the per-year histograms of
+``real_estate.monte_carlo``, so memory does not grow with the number of
+paths. Shortfall probabilities are exact counts, not histogram estimates.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from real_estate.monte_carlo import DEFAULT_PERCENTILES, Distribution, PercentileAggregator
+
+DEFAULT_VOLATILITY = 0.15
+
+
+@dataclass
+class MarketMonteCarloParams:
+    """Configuration of a Monte Carlo run of a savings plan.
+
+    ``annual_return`` is the distribution of every year's return; returns
+    below -100 % are clipped to a total loss. ``target_wealth`` adds the
+    probability of ending each year below that amount to the shortfalls.
+    """
+
+    annual_return: Distribution
+    n_paths: int = 10_000
+    batch_size: int = 2_000
+    seed: Optional[int] = None
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    bins: int = 512
+    target_wealth: Optional[float] = None
+
+
+def _simulate_wealth_paths(
+    initial_investment_amount: float,
+    yearly_investment_rate: float,
+    years: int,
+    distribution: Distribution,
+    rng: np.random.Generator,
+    n_paths: int,
+) -> np.ndarray:
+    """Wealth at the end of every year, shape ``(n_paths, years)``.
+
+    Like ``simulate_market_investment`` the savings rate is invested at the
+    start of each year, together with the lump sum in the first year.
+    """
+
+    growth = 1 + np.maximum(distribution.sample(rng, (n_paths, years)), -1.0)
+    wealth = np.empty((n_paths, years))
+    value = np.full(n_paths, initial_investment_amount, dtype=float)
+    for year in range(years):
+        value += yearly_investment_rate
+        value *= growth[:, year]
+        wealth[:, year] = value
+    return wealth
+
+
+def simulate_market_monte_carlo(
+    initial_investment_amount: float,
+    yearly_investment_rate: float,
+    years: int,
+    mc: MarketMonteCarloParams,
+) -> Dict[str, object]:
+    """Run ``mc.n_paths`` savings-plan paths and return per-year bands and shortfalls.
+
+    Every batch draws from its own child of ``SeedSequence(mc.seed)``, so a
+    given seed always reproduces the same result. ``shortfall`` holds the
+    per-year probability of ending below the amount invested so far
+    (``below_invested``) and, if set, below ``mc.target_wealth``.
+    """
+
+    years = max(int(years), 1)
+    n_paths = max(int(mc.n_paths), 1)
+    batch_size = max(min(int(mc.batch_size), n_paths), 1)
+    sizes = [batch_size] * (n_paths // batch_size)
+    if n_paths % batch_size:
+        sizes.append(n_paths % batch_size)
+    seeds = np.random.SeedSequence(mc.seed).spawn(len(sizes))
+
+    invested = initial_investment_amount + yearly_investment_rate * np.arange(1, years + 1)
+    thresholds = {"below_invested": invested}
+    if mc.target_wealth is not None:
+        thresholds["below_target"] = np.full(years, float(mc.target_wealth))
+    shortfall_counts = {name: np.zeros(years, dtype=np.int64) for name in thresholds}
+
+    aggregator = None
+    for seed, size in zip(seeds, sizes):
+        wealth = _simulate_wealth_paths(
+            initial_investment_amount,
+            yearly_investment_rate,
+            years,
+            mc.annual_return,
+            np.random.default_rng(seed),
+            size,
+        )
+        if aggregator is None:
+            aggregator = PercentileAggregator.from_sample(wealth, mc.bins)
+        aggregator.add(wealth)
+        for name, threshold in thresholds.items():
+            shortfall_counts[name] += np.count_nonzero(wealth < threshold, axis=0)
+
+    percentiles = list(mc.percentiles)
+    values = aggregator.percentiles(percentiles)
+    bands = {f"p{q:g}": values[row] for row, q in enumerate(percentiles)}
+    bands["mean"] = aggregator.mean()
+
+    return {
+        "years": np.arange(1, years + 1),
+        "n_paths": n_paths,
+        "percentiles": percentiles,
+        "invested": invested,
+        "bands": bands,
+        "shortfall": {name: counts / n_paths for name, counts in shortfall_counts.items()},
+    }
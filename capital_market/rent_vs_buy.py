@@ -0,0 +1,114 @@
+"""Rent-versus-buy comparison over a common horizon.
+
+The buyer owns the home described by a ``SelfUsedPropertyInvestment``; the
+renter pays its ``imputed_rent_savings`` as rent (growing by
+``rent_increase_rate`` per year) and invests the buyer's upfront equity
+(down payment plus transaction costs) in an ETF. Every year whichever side
+has the lower housing cost invests the difference, spread over the twelve
+months, in the same ETF. Wealth is property equity plus ETF portfolio for the
+buyer and the ETF portfolio for the renter.
+
+All years are evaluated at once: loan and property value come from the
+closed-form stages of ``real_estate.simulation``, and the ETF portfolios from
+a triangular growth matrix applied to the yearly contributions.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from real_estate.models import SelfUsedPropertyInvestment
+from real_estate.simulation import loan_stage, value_stage
+
+Columns = Dict[str, np.ndarray]
+MONTHS_PER_YEAR = 12
+
+
+def _monthly_stream_factor(growth: np.ndarray) -> np.ndarray:
+    """Year-end value of one euro per year paid in twelve installments at the start of each month."""
+
+    monthly_growth = growth ** (1 / MONTHS_PER_YEAR)
+    safe = np.where(monthly_growth == 1, 2.0, monthly_growth)
+    factor = safe * (growth - 1) / (MONTHS_PER_YEAR * (safe - 1))
+    return np.where(monthly_growth == 1, 1.0, factor)
+
+
+def etf_wealth(initial_investment_amount, yearly_contributions, etf_return) -> np.ndarray:
+    """Portfolio value at the end of every year.
+
+    ``initial_investment_amount`` is invested at the start, ``yearly_contributions``
+    (shape ``(..., n_years)``) are paid in monthly installments over their year.
+    """
+
+    contributions = np.asarray(yearly_contributions, dtype=float)
+    n_years = contributions.shape[-1]
+    growth = 1 + np.asarray(etf_return, dtype=float)[..., None, None]
+
+    years = np.arange(n_years)
+    exponent = years[None, :] - years[:, None]
+    compounding = np.where(exponent >= 0, growth ** np.maximum(exponent, 0), 0.0)
+
+    contributed = np.einsum("...j,...jk->...k", contributions * _monthly_stream_factor(growth[..., 0, :]), compounding)
+    return np.asarray(initial_investment_amount, dtype=float)[..., None] * growth[..., 0, :] ** (years + 1) + contributed
+
+
+def rent_vs_buy_columns(
+    investment: SelfUsedPropertyInvestment,
+    rent_increase_rate: float = 0.0,
+    etf_return: Optional[float] = None,
+    n_years: Optional[int] = None,
+) -> Columns:
+    """Aligned yearly cost and wealth columns of buying ``investment`` versus renting.
+
+    ``etf_return`` defaults to the investment's ``opportunity_cost_rate`` and
+    ``n_years`` to its ``holding_years``. Loan payments stop once the loan is
+    repaid, like in ``SelfUsedPropertyInvestment.projection_series``.
+    """
+
+    n_years = investment.holding_years if n_years is None else n_years
+    if n_years < 1:
+        raise ValueError("Rent-versus-buy horizon must be at least one year.")
+    etf_return = investment.opportunity_cost_rate if etf_return is None else etf_return
+
+    prop = investment.property_params
+    loan_params = investment.loan_params
+    annuity = investment._annuity()
+    rate = loan_params.interest_rate
+
+    value = value_stage(prop.purchase_price, prop.value_growth_rate, n_years)["property_value_end"]
+    loan = loan_stage(loan_params.principal, rate, loan_params.years, annuity, n_years)
+    rest_start = np.maximum(loan["loan_rest_start"], 0.0)
+    rest_end = np.maximum(loan["loan_rest_end"], 0.0)
+    loan_payment = np.minimum(annuity, rest_start * (1 + rate))
+
+    years = np.arange(n_years)
+    owner_cost = loan_payment + prop.purchase_price * investment.maintenance_reserve_pct
+    rent_cost = investment.imputed_rent_savings * MONTHS_PER_YEAR * (1 + rent_increase_rate) ** years
+    cost_difference = owner_cost - rent_cost
+
+    upfront = max(prop.purchase_price * (1 + prop.transaction_cost_factor) - loan_params.principal, 0.0)
+    renter_wealth = etf_wealth(upfront, np.maximum(cost_difference, 0.0), etf_return)
+    buyer_portfolio = etf_wealth(0.0, np.maximum(-cost_difference, 0.0), etf_return)
+    buyer_wealth = value - rest_end + buyer_portfolio
+
+    return {
+        "year": years + 1,
+        "property_value": value,
+        "loan_balance": rest_end,
+        "owner_cost": owner_cost,
+        "rent_cost": rent_cost,
+        "cost_difference_month": cost_difference / MONTHS_PER_YEAR,
+        "buyer_portfolio": buyer_portfolio,
+        "buyer_wealth": buyer_wealth,
+        "renter_wealth": renter_wealth,
+        "wealth_difference": buyer_wealth - renter_wealth,
+    }
+
+
+def crossover_year(columns: Columns) -> Optional[int]:
+    """First year from which buying stays at least as wealthy as renting, or ``None``."""
+
+    ahead = columns["wealth_difference"] >= 0
+    if not ahead[-1]:
+        return None
+    behind = np.flatnonzero(~ahead)
+    return int(columns["year"][behind[-1] + 1]) if behind.size else int(columns["year"][0])
@@ -57,5 +57,5 @@ def json_int(payload: Mapping[str, Any], key: str, default: int) -> int:
 
     try:
         return int(raw_value)
-    except (TypeError, ValueError):
+    except (TypeError, ValueError, OverflowError):
         return default
@@ -0,0 +1,217 @@
+import math
+from typing import Any, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from capital_market.backtest import DEFAULT_HORIZONS, PriceStore, backtest_savings_plan
+from capital_market.models import simulate_market_products
+from capital_market.monte_carlo import DEFAULT_VOLATILITY, MarketMonteCarloParams, simulate_market_monte_carlo
+from controllers.controller_utils import json_float, json_int
+from real_estate.monte_carlo import Distribution
+
+MAX_COMPARISON_PRODUCTS = 100
+MAX_COMPARISON_YEARS = 100
+MAX_MONTE_CARLO_PATHS = 100_000
+MAX_BACKTEST_ISINS = 100
+
+
+def _product_return(product: Mapping[str, Any]) -> Optional[float]:
+    """Expected return of ``product`` (default 0), or ``None`` if it is not a number above -100 %."""
+
+    raw_value = product.get("return")
+    if raw_value in ("", None):
+        return 0.0
+    try:
+        expected_return = float(raw_value)
+    except (TypeError, ValueError):
+        return None
+    return expected_return if math.isfinite(expected_return) and expected_return > -1 else None
+
+
+def _product_volatility(product: Mapping[str, Any]) -> float:
+    raw_value = product.get("volatility")
+    if raw_value in ("", None):
+        return DEFAULT_VOLATILITY
+    try:
+        return max(float(raw_value), 0.0)
+    except (TypeError, ValueError):
+        return DEFAULT_VOLATILITY
+
+
+def _horizon_years(value: Any) -> Optional[int]:
+    """Whole number of years in ``1..MAX_COMPARISON_YEARS``, or ``None`` if ``value`` is not one."""
+
+    try:
+        years = int(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if isinstance(value, float) and years != value:
+        return None
+    return years if 1 <= years <= MAX_COMPARISON_YEARS else None
+
+
+def run_comparison(payload: Mapping[str, Any], products: Sequence[Mapping[str, Any]]) -> dict:
+    """Wealth paths of several capital market products for one savings plan.
+
+    ``payload["products"]`` may replace ``products`` (the entries of
+    ``capitalmarketdata.json``) with a caller-supplied list of
+    ``{"name", "isin", "return"}`` objects. All products are evaluated in a
+    single vectorized pass.
+    """
+
+    requested = payload.get("products")
+    if requested is not None:
+        products = requested
+    if not isinstance(products, (list, tuple)) or not products:
+        return {"error": "Keine Kapitalmarktdaten vorhanden."}
+    if len(products) > MAX_COMPARISON_PRODUCTS:
+        return {"error": f"Es können höchstens {MAX_COMPARISON_PRODUCTS} Produkte verglichen werden."}
+    if not all(isinstance(product, Mapping) for product in products):
+        return {"error": "Jedes Produkt muss ein Objekt mit name, isin und return sein."}
+
+    available_wealth = json_float(payload, "available_wealth", 0.0)
+    yearly_savings = json_float(payload, "yearly_savings", 0.0)
+    if not (math.isfinite(available_wealth) and math.isfinite(yearly_savings)):
+        return {"error": "Vermögen und Sparrate müssen endliche Zahlen sein."}
+    years = max(json_int(payload, "years", 1), 1)
+    if years > MAX_COMPARISON_YEARS:
+        return {"error": f"Der Anlagezeitraum darf höchstens {MAX_COMPARISON_YEARS} Jahre betragen."}
+
+    expected_returns = [_product_return(product) for product in products]
+    if None in expected_returns:
+        return {"error": "Die erwartete Rendite jedes Produkts muss eine Zahl größer als -100 % sein."}
+    values = simulate_market_products(expected_returns, available_wealth, yearly_savings, years)
+
+    results: List[dict] = []
+    for product, expected_return, path in zip(products, expected_returns, values.tolist()):
+        results.append(
+            {
+                "product": {
+                    "name": product.get("name", ""),
+                    "isin": product.get("isin", ""),
+                    "expected_return": expected_return,
+                },
+                "final_value": path[-1],
+                "timeseries": [{"year": index + 1, "value": value} for index, value in enumerate(path)],
+            }
+        )
+
+    return {
+        "years": years,
+        "invested_amount": available_wealth + yearly_savings * years,
+        "products": results,
+    }
+
+
+def run_monte_carlo(payload: Mapping[str, Any], products: Sequence[Mapping[str, Any]]) -> dict:
+    """Percentile fan and shortfall probabilities of a stochastic savings plan.
+
+    The product is ``payload["product"]`` or entry ``product_index`` of
+    ``products``. Annual returns are lognormal around its ``return`` with its
+    ``volatility`` (default ``DEFAULT_VOLATILITY``); ``monte_carlo`` may
+    override ``volatility`` and set ``n_paths``, ``seed`` and ``target_wealth``.
+    """
+
+    product = payload.get("product")
+    if not isinstance(product, Mapping):
+        if not isinstance(products, (list, tuple)) or not products:
+            return {"error": "Keine Kapitalmarktdaten vorhanden."}
+        index = json_int(payload, "product_index", 0)
+        if not 0 <= index < len(products):
+            return {"error": f"product_index muss zwischen 0 und {len(products) - 1} liegen."}
+        product = products[index]
+    if not isinstance(product, Mapping):
+        return {"error": "Jedes Produkt muss ein Objekt mit name, isin und return sein."}
+
+    years = max(json_int(payload, "years", 1), 1)
+    if years > MAX_COMPARISON_YEARS:
+        return {"error": f"Der Anlagezeitraum darf höchstens {MAX_COMPARISON_YEARS} Jahre betragen."}
+
+    spec = payload.get("monte_carlo")
+    spec = spec if isinstance(spec, Mapping) else {}
+    expected_return = _product_return(product)
+    if expected_return is None:
+        return {"error": "Die erwartete Rendite muss eine Zahl größer als -100 % sein."}
+    available_wealth = json_float(payload, "available_wealth", 0.0)
+    yearly_savings = json_float(payload, "yearly_savings", 0.0)
+    if not (math.isfinite(available_wealth) and math.isfinite(yearly_savings)):
+        return {"error": "Vermögen und Sparrate müssen endliche Zahlen sein."}
+    volatility = max(json_float(spec, "volatility", _product_volatility(product)), 0.0)
+    if not math.isfinite(volatility):
+        return {"error": "Die Volatilität muss eine endliche Zahl sein."}
+    target_raw = spec.get("target_wealth")
+    seed_raw = spec.get("seed")
+    mc = MarketMonteCarloParams(
+        annual_return=Distribution("lognormal", mean=expected_return, std=volatility),
+        n_paths=min(max(json_int(spec, "n_paths", 10_000), 1), MAX_MONTE_CARLO_PATHS),
+        seed=json_int(spec, "seed", 0) if seed_raw not in ("", None) else None,
+        target_wealth=json_float(spec, "target_wealth", 0.0) if target_raw not in ("", None) else None,
+    )
+    result = simulate_market_monte_carlo(available_wealth, yearly_savings, years, mc)
+
+    return {
+        "product": {
+            "name": product.get("name", ""),
+            "isin": product.get("isin", ""),
+            "expected_return": expected_return,
+            "volatility": volatility,
+        },
+        "inputs": {"n_paths": mc.n_paths, "seed": mc.seed, "target_wealth": mc.target_wealth},
+        "years": result["years"].tolist(),
+        "percentiles": result["percentiles"],
+        "invested": np.round(result["invested"], 2).tolist(),
+        "bands": {name: np.round(values, 2).tolist() for name, values in result["bands"].items()},
+        "shortfall": {name: np.round(values, 6).tolist() for name, values in result["shortfall"].items()},
+    }
+
+
+def run_backtest(payload: Mapping[str, Any], store: PriceStore) -> dict:
+    """Best, worst and median savings-plan outcomes over historical rolling windows.
+
+    ``isins`` (or a single ``isin``) selects price series of ``store``
+    (default: all of them); ``horizons`` lists the plan lengths in whole
+    years between 1 and ``MAX_COMPARISON_YEARS``.
+    """
+
+    requested = payload.get("isins")
+    if requested in (None, "") and payload.get("isin"):
+        requested = [payload.get("isin")]
+    available = store.isins()
+    isins = [str(isin) for isin in requested] if isinstance(requested, list) else available
+    if not isins:
+        return {"error": "Keine Kursdaten vorhanden."}
+    unknown = [isin for isin in isins if isin not in available]
+    if unknown:
+        return {"error": f"Keine Kursdaten für {unknown[0]} vorhanden."}
+    if len(isins) > MAX_BACKTEST_ISINS:
+        return {"error": f"Es können höchstens {MAX_BACKTEST_ISINS} ISINs getestet werden."}
+
+    horizons_raw = payload.get("horizons")
+    horizons = DEFAULT_HORIZONS
+    if isinstance(horizons_raw, list):
+        parsed = [_horizon_years(value) for value in horizons_raw]
+        if not parsed or None in parsed:
+            return {"error": "Die Anlagezeiträume müssen ganze Jahre sein."}
+        horizons = sorted(set(parsed))
+
+    available_wealth = json_float(payload, "available_wealth", 0.0)
+    yearly_savings = json_float(payload, "yearly_savings", 0.0)
+    if not (math.isfinite(available_wealth) and math.isfinite(yearly_savings)):
+        return {"error": "Vermögen und Sparrate müssen endliche Zahlen sein."}
+
+    results = {}
+    for isin in isins:
+        try:
+            months, prices = store.monthly(isin)
+        except KeyError:
+            return {"error": f"Keine Kursdaten für {isin} vorhanden."}
+        except ValueError:
+            return {"error": f"Die Kursdatei für {isin} ist fehlerhaft."}
+        summary = backtest_savings_plan(months, prices, available_wealth, yearly_savings, horizons)
+        results[isin] = {
+            "first_month": str(months[0]) if len(months) else None,
+            "last_month": str(months[-1]) if len(months) else None,
+            "horizons": {str(years): outcome for years, outcome in summary.items()},
+        }
+
+    return {"available_wealth": available_wealth, "yearly_savings": yearly_savings, "results": results}
@@ -1,4 +1,8 @@
-from typing import Any, Mapping, Optional
+import math
+from dataclasses import asdict
+from typing import Any, Iterator, Mapping, Optional
+
+import numpy as np
 
 from capital_market import (
     ADDITIONAL_COST_RATE,
@@ -8,7 +12,12 @@ from capital_market import (
     build_property_payload,
     collect_average_price,
 )
-from controllers.controller_utils import parse_float_arg, parse_int_arg
+from capital_market.rent_vs_buy import crossover_year, rent_vs_buy_columns
+from controllers.controller_utils import json_float, json_int, parse_float_arg, parse_int_arg
+from real_estate.models import LoanParams, PropertyParams, SelfUsedPropertyInvestment
+from real_estate.monthly_loan import MonthlyLoanOptions
+
+MAX_PROJECTION_YEARS = 100
 
 
 def list_properties(args: Mapping[str, Any], rng: Optional[Any] = None) -> list[dict]:
@@ -41,6 +50,27 @@ def list_properties(args: Mapping[str, Any], rng: Optional[Any] = None) -> list[
         available_assets,
         additional_cost_rate,
         rng=rng,
+        loan_options=_monthly_loan_options(args),
+        sort_by_distance=str(args.get("sort", "")).lower() == "distance",
+        include_schedule=str(args.get("schedule", "")).lower() in ("1", "true", "yes"),
+    )
+
+
+def _monthly_loan_options(args: Mapping[str, Any]) -> Optional[MonthlyLoanOptions]:
+    """Monthly loan engine options, enabled by ``monthly=1`` or any of its contract parameters."""
+
+    keys = ("fixed_rate_years", "follow_up_interest_rate", "special_repayment_rate")
+    if str(args.get("monthly", "")).lower() not in ("1", "true", "yes") and all(
+        args.get(key) in ("", None) for key in keys
+    ):
+        return None
+
+    fixed_rate_years = parse_int_arg(args, "fixed_rate_years", 0)
+    follow_up_interest_rate = parse_float_arg(args, "follow_up_interest_rate", -1.0)
+    return MonthlyLoanOptions(
+        fixed_rate_years=fixed_rate_years if fixed_rate_years > 0 else None,
+        follow_up_interest_rate=follow_up_interest_rate if follow_up_interest_rate >= 0 else None,
+        special_repayment_rate=max(parse_float_arg(args, "special_repayment_rate", 0.0), 0.0),
     )
 
 
@@ -101,3 +131,109 @@ def average_rent(args: Mapping[str, Any], rng: Optional[Any] = None) -> dict:
         "radius_km": radius,
         "average_rent_per_sqm": average_value,
     }
+
+
+def _self_used_investment(payload: Mapping[str, Any], holding_years: int) -> SelfUsedPropertyInvestment:
+    purchase_price = max(json_float(payload, "purchase_price", 400_000.0), 0.0)
+    annuity = json_float(payload, "loan_annuity", 0.0)
+    return SelfUsedPropertyInvestment(
+        property_params=PropertyParams(
+            purchase_price=purchase_price,
+            transaction_cost_factor=max(
+                json_float(payload, "transaction_cost_factor", ADDITIONAL_COST_RATE), 0.0
+            ),
+            value_growth_rate=json_float(payload, "value_growth_rate", 0.02),
+            depreciation_basis=0.0,
+            depreciation_rate=0.0,
+        ),
+        loan_params=LoanParams(
+            principal=max(json_float(payload, "loan_principal", purchase_price * 0.8), 0.0),
+            interest_rate=max(json_float(payload, "loan_interest_rate", DEFAULT_INTEREST_RATE), 0.0),
+            years=max(json_int(payload, "loan_years", 30), 1),
+            annuity=annuity if annuity > 0 else None,
+        ),
+        imputed_rent_savings=max(json_float(payload, "imputed_rent_savings", 0.0), 0.0),
+        maintenance_reserve_pct=max(json_float(payload, "maintenance_reserve_pct", 0.01), 0.0),
+        opportunity_cost_rate=json_float(payload, "opportunity_cost_rate", 0.0),
+        holding_years=holding_years,
+    )
+
+
+def _inputs(investment: SelfUsedPropertyInvestment) -> dict:
+    return {
+        "property": asdict(investment.property_params),
+        "loan": asdict(investment.loan_params),
+        "imputed_rent_savings": investment.imputed_rent_savings,
+        "maintenance_reserve_pct": investment.maintenance_reserve_pct,
+        "opportunity_cost_rate": investment.opportunity_cost_rate,
+        "holding_years": investment.holding_years,
+    }
+
+
+def _flat_values(values: Mapping[str, Any]) -> Iterator[Any]:
+    for value in values.values():
+        if isinstance(value, Mapping):
+            yield from _flat_values(value)
+        else:
+            yield value
+
+
+def _finite_inputs(investment: SelfUsedPropertyInvestment, *extra: float) -> bool:
+    """Whether every float input of ``investment`` and every ``extra`` value is finite."""
+
+    numbers = [value for value in _flat_values(_inputs(investment)) if isinstance(value, float)]
+    return all(math.isfinite(value) for value in numbers + list(extra))
+
+
+def run_projection(payload: Mapping[str, Any]) -> dict:
+    """Year-by-year equity and cost projection of an owner-occupied home."""
+
+    holding_years = json_int(payload, "holding_years", 30)
+    if not 0 <= holding_years <= MAX_PROJECTION_YEARS:
+        return {"error": f"Der Betrachtungszeitraum muss zwischen 0 und {MAX_PROJECTION_YEARS} Jahren liegen."}
+
+    investment = _self_used_investment(payload, holding_years)
+    if not _finite_inputs(investment):
+        return {"error": "Alle Eingaben müssen endliche Zahlen sein."}
+    series = investment.projection_series()
+    return {
+        "inputs": _inputs(investment),
+        "summary": {
+            "projected_equity": series["equity"][-1],
+            "total_cost_of_ownership": series["cost_of_ownership"][-1],
+            "remaining_balance": series["remaining_balance"][-1],
+            "total_interest": series["cumulative_interest"][-1],
+        },
+        "series": series,
+    }
+
+
+def run_rent_vs_buy(payload: Mapping[str, Any]) -> dict:
+    """Wealth of buying the home versus renting it and investing the difference in an ETF.
+
+    The rent is ``imputed_rent_savings`` (per month) growing by
+    ``rent_increase_rate``; ``etf_return`` defaults to ``opportunity_cost_rate``.
+    """
+
+    holding_years = json_int(payload, "holding_years", 30)
+    if not 1 <= holding_years <= MAX_PROJECTION_YEARS:
+        return {"error": f"Der Betrachtungszeitraum muss zwischen 1 und {MAX_PROJECTION_YEARS} Jahren liegen."}
+
+    investment = _self_used_investment(payload, holding_years)
+    rent_increase_rate = json_float(payload, "rent_increase_rate", 0.02)
+    etf_return = json_float(payload, "etf_return", investment.opportunity_cost_rate)
+    if not _finite_inputs(investment, rent_increase_rate, etf_return):
+        return {"error": "Alle Eingaben müssen endliche Zahlen sein."}
+    if etf_return <= -1 or rent_increase_rate <= -1:
+        return {"error": "ETF-Rendite und Mietsteigerung müssen größer als -100 % sein."}
+    columns = rent_vs_buy_columns(investment, rent_increase_rate=rent_increase_rate, etf_return=etf_return)
+
+    return {
+        "inputs": {**_inputs(investment), "rent_increase_rate": rent_increase_rate, "etf_return": etf_return},
+        "summary": {
+            "buyer_wealth_final": round(columns["buyer_wealth"][-1].item(), 2),
+            "renter_wealth_final": round(columns["renter_wealth"][-1].item(), 2),
+            "crossover_year": crossover_year(columns),
+        },
+        "series": {name: np.round(values, 2).tolist() for name, values in columns.items()},
+    }
@@ -1,9 +1,30 @@
+import math
 from dataclasses import asdict
-from typing import List
+from typing import Any, Mapping, Optional
+
+import numpy as np
 
 from capital_market import ADDITIONAL_COST_RATE, DEFAULT_INTEREST_RATE
 from controllers.controller_utils import json_float, json_int
-from real_estate import LoanParams, PropertyParams, RentParams, SimulationParams, simulate
+from real_estate import (
+    INPUT_FIELDS,
+    INTEGER_INPUTS,
+    LoanParams,
+    PropertyParams,
+    RentParams,
+    SimulationParams,
+    columns_to_records,
+    simulate_columns,
+    simulate_sweep,
+    summarize_columns,
+)
+from real_estate.incremental import simulate_columns_incremental
+from real_estate.monte_carlo import Distribution, MonteCarloParams, simulate_monte_carlo
+from real_estate.solver import SOLVER_METRICS, SOLVER_VARIABLES, solve
+
+MAX_SWEEP_COMBINATIONS = 100_000
+MAX_SWEEP_AXIS_POINTS = 1_000
+MAX_MONTE_CARLO_PATHS = 100_000
 
 
 def _build_simulation_params(payload: dict) -> SimulationParams:
@@ -27,11 +48,22 @@ def _build_simulation_params(payload: dict) -> SimulationParams:
     annuity_raw = json_float(payload, "loan_annuity", 0.0)
     annuity = annuity_raw if annuity_raw > 0 else None
 
+    fixed_rate_years = json_int(payload, "loan_fixed_rate_years", 0)
+    follow_up_raw = payload.get("loan_follow_up_interest_rate")
+
     loan_params = LoanParams(
         principal=loan_principal,
         interest_rate=loan_interest_rate,
         years=loan_years,
         annuity=annuity,
+        monthly=bool(payload.get("loan_monthly")),
+        fixed_rate_years=fixed_rate_years if fixed_rate_years > 0 else None,
+        follow_up_interest_rate=(
+            max(json_float(payload, "loan_follow_up_interest_rate", 0.0), 0.0)
+            if follow_up_raw not in ("", None)
+            else None
+        ),
+        special_repayment=max(json_float(payload, "loan_special_repayment", 0.0), 0.0),
     )
 
     rent_params = RentParams(
@@ -56,36 +88,23 @@ def _build_simulation_params(payload: dict) -> SimulationParams:
     )
 
 
-def _summarize_simulation(records: List[dict]):
-    if not records:
-        return {}
-
-    first_row = records[0]
-    last_row = records[-1]
-
-    def _sum(field: str) -> float:
-        return sum(float(r.get(field, 0) or 0) for r in records)
-
-    return {
-        "cashflow_year1": first_row.get("cashflow_operating", 0.0),
-        "cashflow_after_tax_year1": first_row.get("cashflow_after_tax", 0.0),
-        "warm_rent_year1": first_row.get("warm_rent_year", 0.0),
-        "taxes_year1": first_row.get("taxes", 0.0),
-        "equity_final": last_row.get("equity_end", 0.0),
-        "property_value_final": last_row.get("property_value_end", 0.0),
-        "loan_rest_final": last_row.get("loan_rest_end", 0.0),
-        "total_taxes": _sum("taxes"),
-        "total_operating_cashflow": _sum("cashflow_operating"),
-        "total_cashflow_after_tax": _sum("cashflow_after_tax"),
-    }
+def run_simulation(payload: dict) -> dict:
+    """Simulate the buy-to-let scenario in ``payload``.
 
+    With ``"incremental": true`` stage results are cached across requests and
+    only the stages whose inputs changed are recomputed; the response then
+    lists them under ``recomputed_stages``.
+    """
 
-def run_simulation(payload: dict) -> dict:
     params = _build_simulation_params(payload)
-    records = simulate(params)
-    summary = _summarize_simulation(records)
+    recomputed = None
+    if payload.get("incremental"):
+        columns, recomputed = simulate_columns_incremental(params)
+    else:
+        columns = simulate_columns(params)
+    summary = {key: value.item() for key, value in summarize_columns(columns).items()}
 
-    return {
+    result = {
         "inputs": {
             "property": asdict(params.property_params),
             "loan": asdict(params.loan_params),
@@ -95,12 +114,193 @@ def run_simulation(payload: dict) -> dict:
             "n_years": params.n_years,
         },
         "summary": summary,
-        "records": [
-            {key: round(value, 2) if isinstance(value, (int, float)) else value for key, value in record.items()}
-            for record in records
-        ],
+        "records": columns_to_records({key: np.round(column, 2) for key, column in columns.items()}),
         "total_investment_cost": round(
             params.property_params.purchase_price * (1 + params.property_params.transaction_cost_factor),
             2,
         ),
     }
+    if recomputed is not None:
+        result["recomputed_stages"] = recomputed
+    return result
+
+
+def _sweep_axis(name: str, spec: Any) -> np.ndarray:
+    if isinstance(spec, Mapping):
+        start = json_float(spec, "start", 0.0)
+        stop = json_float(spec, "stop", start)
+        step = json_float(spec, "step", 0.0)
+        if step > 0 and stop >= start:
+            points = min(int(round((stop - start) / step, 9)) + 1, MAX_SWEEP_AXIS_POINTS)
+            values = start + np.arange(points) * step
+        else:
+            values = np.linspace(start, stop, min(max(json_int(spec, "points", 1), 1), MAX_SWEEP_AXIS_POINTS))
+    elif isinstance(spec, (list, tuple)):
+        values = np.array([float(value) for value in spec[:MAX_SWEEP_AXIS_POINTS]], dtype=float)
+    else:
+        values = np.array([float(spec)])
+
+    if name in INTEGER_INPUTS:
+        values = np.maximum(np.floor(values), 1)
+    elif name == "tax_rate":
+        values = np.maximum(values, 0.0)
+    return values
+
+
+def run_sweep(payload: dict) -> dict:
+    """Simulate all combinations of the ``sweep`` ranges on top of the base payload.
+
+    ``sweep`` maps input names (see ``INPUT_FIELDS``) to a value list or to
+    ``{"start", "stop", "step"}`` / ``{"start", "stop", "points"}``. Summary
+    metrics are returned as flat lists in row-major order of ``axes``.
+    """
+
+    params = _build_simulation_params(payload)
+    sweep_spec = payload.get("sweep") if isinstance(payload, Mapping) else None
+    if not isinstance(sweep_spec, Mapping) or not sweep_spec:
+        return {"error": "Keine Sweep-Parameter angegeben."}
+
+    unknown = sorted(set(sweep_spec) - set(INPUT_FIELDS))
+    if unknown:
+        return {"error": f"Unbekannte Sweep-Parameter: {', '.join(unknown)}"}
+
+    try:
+        ranges = {name: _sweep_axis(name, spec) for name, spec in sweep_spec.items()}
+    except (TypeError, ValueError):
+        return {"error": "Ungültige Sweep-Parameter."}
+
+    combinations = int(np.prod([len(values) for values in ranges.values()]))
+    if combinations > MAX_SWEEP_COMBINATIONS:
+        return {"error": f"Zu viele Kombinationen ({combinations}, maximal {MAX_SWEEP_COMBINATIONS})."}
+
+    axes, summary = simulate_sweep(params, ranges)
+
+    return {
+        "axes": {name: values.tolist() for name, values in axes.items()},
+        "shape": [len(values) for values in axes.values()],
+        "combinations": combinations,
+        "summary": {metric: np.round(values, 2).ravel().tolist() for metric, values in summary.items()},
+    }
+
+
+def _distribution(name: str, spec: Any, default_mean: float) -> Distribution:
+    """Distribution of ``name`` from its request ``spec``; raises ``ValueError`` for unusable parameters."""
+
+    if not isinstance(spec, Mapping):
+        distribution = Distribution("fixed", mean=default_mean)
+    else:
+        kind = str(spec.get("distribution") or "normal").lower()
+        if kind not in ("fixed", "normal", "lognormal", "uniform"):
+            kind = "normal"
+        mean = json_float(spec, "mean", default_mean)
+        std = max(json_float(spec, "std", 0.0), 0.0)
+        low = json_float(spec, "low", mean - std)
+        high = max(json_float(spec, "high", mean + std), low)
+        distribution = Distribution(kind, mean=mean, std=std, low=low, high=high)
+
+    values = (distribution.mean, distribution.std, distribution.low, distribution.high)
+    if not all(math.isfinite(value) for value in values):
+        raise ValueError(f"Die Verteilung von {name} braucht endliche Parameter.")
+    if distribution.kind == "lognormal" and distribution.mean <= -1:
+        raise ValueError(f"Der Mittelwert der Lognormalverteilung von {name} muss größer als -1 sein.")
+    return distribution
+
+
+def run_monte_carlo(payload: dict) -> dict:
+    """Percentile bands of equity, cash flow and loan balance over stochastic paths.
+
+    ``monte_carlo`` holds ``n_paths``, ``seed`` and distributions for
+    ``value_growth_rate``, ``rent_increase_rate`` and ``loan_interest_rate``
+    (``{"distribution", "mean", "std"}`` or ``{"distribution": "uniform", "low", "high"}``);
+    means default to the deterministic inputs.
+    """
+
+    params = _build_simulation_params(payload)
+    spec = payload.get("monte_carlo") if isinstance(payload, Mapping) else None
+    spec = spec if isinstance(spec, Mapping) else {}
+
+    defaults = {
+        "value_growth_rate": params.property_params.value_growth_rate,
+        "rent_increase_rate": params.rent_params.rent_increase_rate,
+        "loan_interest_rate": params.loan_params.interest_rate,
+    }
+    try:
+        distributions = {name: _distribution(name, spec.get(name), mean) for name, mean in defaults.items()}
+    except ValueError as error:
+        return {"error": str(error)}
+
+    seed_raw = spec.get("seed")
+    mc = MonteCarloParams(
+        **distributions,
+        n_paths=min(max(json_int(spec, "n_paths", 10_000), 1), MAX_MONTE_CARLO_PATHS),
+        seed=json_int(spec, "seed", 0) if seed_raw not in ("", None) else None,
+    )
+    result = simulate_monte_carlo(params, mc)
+
+    return {
+        "inputs": {
+            "value_growth_rate": asdict(mc.value_growth_rate),
+            "rent_increase_rate": asdict(mc.rent_increase_rate),
+            "loan_interest_rate": asdict(mc.loan_interest_rate),
+            "n_paths": mc.n_paths,
+            "seed": mc.seed,
+        },
+        "years": result["years"].tolist(),
+        "percentiles": result["percentiles"],
+        "bands": {
+            metric: {name: np.round(values, 2).tolist() for name, values in bands.items()}
+            for metric, bands in result["bands"].items()
+        },
+    }
+
+
+def _optional_float(spec: Mapping[str, Any], key: str) -> Optional[float]:
+    """``spec[key]`` as a finite float, ``None`` if unset; raises ``ValueError`` otherwise."""
+
+    raw_value = spec.get(key)
+    if raw_value in ("", None):
+        return None
+    try:
+        value = float(raw_value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} muss eine Zahl sein.") from None
+    if not math.isfinite(value):
+        raise ValueError(f"{key} muss eine endliche Zahl sein.")
+    return value
+
+
+def run_solve(payload: dict) -> dict:
+    """Goal-seek one input so that a summary metric reaches a target.
+
+    ``solve`` holds ``variable`` (an input name from ``INPUT_FIELDS`` or
+    ``equity``), ``metric`` (a summary metric, default
+    ``cashflow_after_tax_year1``), ``target`` (default 0) and optional
+    ``lower``/``upper`` bounds of the search interval.
+    """
+
+    params = _build_simulation_params(payload)
+    spec = payload.get("solve") if isinstance(payload, Mapping) else None
+    if not isinstance(spec, Mapping) or not spec.get("variable"):
+        return {"error": "Keine Zielgröße angegeben."}
+
+    variable = str(spec.get("variable"))
+    metric = str(spec.get("metric") or "cashflow_after_tax_year1")
+    if variable not in SOLVER_VARIABLES:
+        return {"error": f"Unbekannte Zielgröße: {variable}"}
+    if metric not in SOLVER_METRICS:
+        return {"error": f"Unbekannte Kennzahl: {metric}"}
+
+    try:
+        bounds = {key: _optional_float(spec, key) for key in ("lower", "upper")}
+    except ValueError as error:
+        return {"error": str(error)}
+
+    try:
+        result = solve(params, variable, metric=metric, target=json_float(spec, "target", 0.0), **bounds)
+    except ValueError:
+        return {"error": "Ungültiges Suchintervall."}
+
+    return {
+        key: None if isinstance(value, float) and not math.isfinite(value) else value
+        for key, value in asdict(result).items()
+    }
@@ -0,0 +1,298 @@
+import codecs
+import hashlib
+import json
+import math
+from functools import lru_cache
+from itertools import islice
+from typing import IO, Any, Iterable, Iterator, List, Mapping, Tuple
+
+import numpy as np
+
+from controllers.controller_utils import json_float, json_int
+from tax_calculations import (
+    curve_max_income,
+    splitting_surface as _splitting_surface,
+    tax_curve_piecewise,
+    tax_curve_points,
+    tax_rates_married,
+    tax_rates_married_array,
+    tax_rates_single,
+    tax_rates_single_array,
+)
+
+CURVE_CACHE_SIZE = 64
+RESPONSE_CACHE_SIZE = 1024
+BULK_CHUNK_SIZE = 4096
+BULK_READ_SIZE = 64 * 1024
+BULK_MAX_RECORD_SIZE = 1024 * 1024
+MAX_SURFACE_AXIS_POINTS = 501
+
+
+def _normalize_filing_status(payload: Mapping[str, Any]) -> str:
+    return (payload.get("filing_status") or "single").lower()
+
+
+def _normalize_curve_format(payload: Mapping[str, Any]) -> str:
+    curve_format = (payload.get("curve_format") or "points").lower()
+    return curve_format if curve_format == "piecewise" else "points"
+
+
+@lru_cache(maxsize=CURVE_CACHE_SIZE)
+def _tax_curve(filing_status: str, capped_income: float, curve_format: str):
+    """Curve for normalized inputs; the cached object is shared, treat it as read-only."""
+
+    if curve_format == "piecewise":
+        return tax_curve_piecewise(filing_status, max_income=capped_income)
+    return tax_curve_points(filing_status, max_income=capped_income)
+
+
+def _calculate(filing_status: str, primary_zve: float, partner_zve: float, curve_format: str) -> dict:
+    if filing_status == "married":
+        est, avg_rate, marginal_rate = tax_rates_married(primary_zve, partner_zve)
+        total_zve = primary_zve + partner_zve
+    else:
+        est, avg_rate, marginal_rate = tax_rates_single(primary_zve)
+        total_zve = primary_zve
+
+    curve_status = "married" if filing_status == "married" else "single"
+    curve = _tax_curve(curve_status, curve_max_income(total_zve), curve_format)
+
+    return {
+        "zve": total_zve,
+        "est": round(est, 2),
+        "avg_rate": round(avg_rate, 2),
+        "marginal_rate": round(marginal_rate, 2),
+        "curve": curve,
+        "curve_format": curve_format,
+        "filing_status": filing_status,
+        "partner_zve": partner_zve if filing_status == "married" else 0.0,
+    }
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _calculate_response(
+    filing_status: str, primary_zve: float, partner_zve: float, curve_format: str
+) -> Tuple[bytes, str]:
+    result = _calculate(filing_status, primary_zve, partner_zve, curve_format)
+    body = json.dumps(result, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+
+NON_FINITE_INCOME_ERROR = "zve und partner_zve müssen endliche Zahlen sein."
+
+
+def _incomes(payload: Mapping[str, Any], filing_status: str) -> Tuple[float, float]:
+    primary_zve = max(json_float(payload, "zve", 0.0), 0.0)
+    partner_zve = max(json_float(payload, "partner_zve", 0.0), 0.0) if filing_status == "married" else 0.0
+    if not (math.isfinite(primary_zve) and math.isfinite(partner_zve)):
+        raise ValueError(NON_FINITE_INCOME_ERROR)
+    return primary_zve, partner_zve
+
+
+def _normalize_inputs(payload: Mapping[str, Any]) -> Tuple[str, float, float, str]:
+    """Normalized cache key; raises ``ValueError`` for non-finite incomes."""
+
+    filing_status = _normalize_filing_status(payload)
+    primary_zve, partner_zve = _incomes(payload, filing_status)
+    return filing_status, primary_zve, partner_zve, _normalize_curve_format(payload)
+
+
+def calculate(payload: Mapping[str, Any]) -> dict:
+    return _calculate(*_normalize_inputs(payload))
+
+
+def calculate_response(payload: Mapping[str, Any]) -> Tuple[bytes, str]:
+    """Return the serialized JSON body and its ETag, cached on the normalized inputs."""
+
+    return _calculate_response(*_normalize_inputs(payload))
+
+
+# ---------- BULK ----------
+
+
+def iter_households(stream: IO[bytes], read_size: int = BULK_READ_SIZE) -> Iterator[Any]:
+    """Incrementally decode households from a JSON array or an NDJSON stream.
+
+    Only ``read_size`` bytes plus the current record are buffered, so memory
+    stays flat regardless of the upload size. Malformed input ends the stream
+    with a ``ValueError`` item.
+    """
+
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    pos = 0
+    eof = False
+    in_array = None
+    expect_separator = False
+
+    def _fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = stream.read(read_size)
+        eof = not chunk
+        buffer = buffer[pos:] + text_decoder.decode(chunk or b"", final=eof)
+        pos = 0
+        return True
+
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos >= len(buffer):
+            if _fill():
+                continue
+            if in_array:
+                yield ValueError("Unterminated JSON array.")
+            return
+
+        char = buffer[pos]
+        if in_array is None:
+            in_array = char == "["
+            if in_array:
+                pos += 1
+            continue
+
+        if in_array and char == "]":
+            return
+        if in_array and expect_separator:
+            if char != ",":
+                yield ValueError(f"Expected ',' at offset {pos}.")
+                return
+            pos += 1
+            expect_separator = False
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as error:
+            if len(buffer) - pos <= BULK_MAX_RECORD_SIZE and _fill():
+                continue
+            yield ValueError(f"Invalid JSON: {error.msg}.")
+            return
+
+        if end == len(buffer) and not eof:
+            # A number at the end of the buffer may continue in the next chunk.
+            _fill()
+            continue
+
+        pos = end
+        expect_separator = True
+        yield value
+
+
+def _bulk_chunk(start_index: int, households: List[Any]) -> str:
+    valid = []
+    incomes = []
+    invalid = {}
+    for index, household in enumerate(households, start=start_index):
+        if not isinstance(household, Mapping):
+            continue
+        try:
+            incomes.append(_incomes(household, _normalize_filing_status(household)))
+        except ValueError as error:
+            invalid[index] = str(error)
+            continue
+        valid.append((index, household))
+    primary = np.array([primary_zve for primary_zve, _ in incomes], dtype=float)
+    partner = np.array([partner_zve for _, partner_zve in incomes], dtype=float)
+    married = np.array([_normalize_filing_status(h) == "married" for _, h in valid], dtype=bool)
+
+    est, avg_rate, marginal_rate = tax_rates_single_array(primary)
+    if married.any():
+        est_m, avg_m, marginal_m = tax_rates_married_array(primary[married], partner[married])
+        est[married], avg_rate[married], marginal_rate[married] = est_m, avg_m, marginal_m
+    partner = np.where(married, partner, 0.0)
+
+    results = {}
+    for row, (index, household) in enumerate(valid):
+        result = {
+            "index": index,
+            "filing_status": "married" if married[row] else "single",
+            "zve": primary[row].item(),
+            "partner_zve": partner[row].item(),
+            "est": round(est[row].item(), 2),
+            "avg_rate": round(avg_rate[row].item(), 2),
+            "marginal_rate": round(marginal_rate[row].item(), 2),
+        }
+        if "id" in household:
+            result["id"] = household["id"]
+        results[index] = result
+
+    lines = []
+    for index, household in enumerate(households, start=start_index):
+        if index in results:
+            lines.append(json.dumps(results[index]))
+        elif index in invalid:
+            lines.append(json.dumps({"index": index, "error": invalid[index]}))
+        elif isinstance(household, ValueError):
+            lines.append(json.dumps({"index": index, "error": str(household)}))
+        else:
+            lines.append(json.dumps({"index": index, "error": "Household must be a JSON object."}))
+    return "\n".join(lines) + "\n"
+
+
+def bulk_calculate(households: Iterable[Any], chunk_size: int = BULK_CHUNK_SIZE) -> Iterator[str]:
+    """Compute single/splitting tax for households and yield NDJSON lines per chunk.
+
+    Households are evaluated ``chunk_size`` at a time through the array tax
+    functions; no curve is computed.
+    """
+
+    households = iter(households)
+    start_index = 0
+    while True:
+        chunk = list(islice(households, chunk_size))
+        if not chunk:
+            return
+        yield _bulk_chunk(start_index, chunk)
+        start_index += len(chunk)
+
+
+# ---------- SPLITTING SURFACE ----------
+
+
+NON_FINITE_AXIS_ERROR = "Die Grenzen und Schrittweiten der Einkommensachsen müssen endliche Zahlen sein."
+
+
+def _income_axis(payload: Mapping[str, Any], prefix: str) -> np.ndarray:
+    """Income axis from ``*_min``/``*_max`` and ``*_step`` or ``*_points``; raises ``ValueError`` if non-finite."""
+
+    lower = json_float(payload, f"{prefix}_min", 0.0)
+    upper = json_float(payload, f"{prefix}_max", 150_000.0)
+    step = json_float(payload, f"{prefix}_step", 0.0)
+    if not (math.isfinite(lower) and math.isfinite(upper) and math.isfinite(step)):
+        raise ValueError(NON_FINITE_AXIS_ERROR)
+    lower = max(lower, 0.0)
+    upper = max(upper, lower)
+    if step <= 0:
+        points = min(max(json_int(payload, f"{prefix}_points", 61), 1), MAX_SURFACE_AXIS_POINTS)
+        return np.linspace(lower, upper, points)
+
+    points = min(int((upper - lower) // step) + 1, MAX_SURFACE_AXIS_POINTS)
+    return lower + np.arange(points) * step
+
+
+def splitting_surface(payload: Mapping[str, Any]) -> dict:
+    """Splittingvorteil heatmap over ranges of both partner incomes.
+
+    Axes are given as ``zve_min``/``zve_max`` and ``partner_zve_min``/``partner_zve_max``
+    plus either ``*_step`` or ``*_points`` (at most ``MAX_SURFACE_AXIS_POINTS``).
+    Rows of the matrices follow ``zve``, columns follow ``partner_zve``.
+    Raises ``ValueError`` for non-finite axis bounds or steps.
+    """
+
+    zve_axis = _income_axis(payload, "zve")
+    partner_axis = _income_axis(payload, "partner_zve")
+    married_est, separate_est, advantage = _splitting_surface(zve_axis, partner_axis)
+
+    result = {
+        "zve": zve_axis.round(2).tolist(),
+        "partner_zve": partner_axis.round(2).tolist(),
+        "advantage": advantage.round(2).tolist(),
+        "max_advantage": round(float(advantage.max()), 2),
+    }
+    if payload.get("include_components"):
+        result["married_est"] = married_est.round(2).tolist()
+        result["separate_est"] = separate_est.round(2).tolist()
+    return result
@@ -0,0 +1,106 @@
+"""Cached registry of the JSON files in ``data_files/``.
+
+Every file is parsed once and handed out as an immutable object (dicts become
+:class:`FrozenDict`, lists become tuples), so callers can share it without
+copying. A file is re-checked at most every ``check_interval`` seconds: an
+unchanged ``mtime``/size costs one ``stat``; a changed one re-reads the bytes,
+and the file is only re-parsed when their SHA-256 differs. Lookups between
+checks do no filesystem I/O, and edited data files take effect without a
+restart.
+"""
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+DEFAULT_CHECK_INTERVAL = 2.0
+
+
+class FrozenDict(dict):
+    """``dict`` that rejects mutation; ``copy()`` returns a plain, mutable ``dict``."""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("Parsed data files are immutable; use copy() to modify them.")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert parsed JSON into immutable containers."""
+
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+@dataclass
+class _Entry:
+    mtime_ns: int
+    size: int
+    digest: str
+    value: Any
+    checked_at: float
+
+
+class DataFileRegistry:
+    """Parsed data files of ``directory``, looked up by file name."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+        loader: Callable[[bytes], Any] = json.loads,
+    ):
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self.loader = loader
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def _due(self, checked_at: Optional[float], now: float) -> bool:
+        return checked_at is None or now - checked_at >= self.check_interval
+
+    def _refresh(self, name: str, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(name)
+        if entry is not None and not self._due(entry.checked_at, now):
+            return entry
+
+        path = self.directory / name
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._entries.pop(name, None)
+            return None
+        if entry is not None and (stat.st_mtime_ns, stat.st_size) == (entry.mtime_ns, entry.size):
+            entry.checked_at = now
+            return entry
+
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry is not None and digest == entry.digest:
+            value = entry.value
+        else:
+            try:
+                value = freeze(self.loader(raw))
+            except ValueError:
+                # Keep serving the last good version of a file caught mid-edit.
+                if entry is None:
+                    raise
+                entry.checked_at = now
+                return entry
+        entry = _Entry(stat.st_mtime_ns, stat.st_size, digest, value, now)
+        self._entries[name] = entry
+        return entry
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Parsed content of ``name``, or ``default`` if the file does not exist."""
+
+        with self._lock:
+            entry = self._refresh(name, time.monotonic())
+        return default if entry is None else entry.value
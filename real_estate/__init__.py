@@ -5,10 +5,22 @@ from .finance import (
     amortization_step,
     calc_annuity,
     mortgage_schedule,
+    mortgage_summary,
+    scaled_mortgage_schedule,
 )
 from .models import LoanParams, Property, PropertyParams, RentParams, SimulationParams
 from .rent import rent_for_year
-from .simulation import simulate
+from .simulation import (
+    INPUT_FIELDS,
+    INTEGER_INPUTS,
+    RECORD_FIELDS,
+    columns_to_records,
+    simulate,
+    simulate_batch,
+    simulate_columns,
+    simulate_sweep,
+    summarize_columns,
+)
 
 __all__ = [
     "Property",
@@ -17,10 +29,20 @@ __all__ = [
     "RentParams",
     "SimulationParams",
     "simulate",
+    "simulate_columns",
+    "simulate_batch",
+    "simulate_sweep",
+    "INPUT_FIELDS",
+    "INTEGER_INPUTS",
+    "summarize_columns",
+    "columns_to_records",
+    "RECORD_FIELDS",
     "rent_for_year",
     "calc_annuity",
     "amortization_step",
     "mortgage_schedule",
+    "mortgage_summary",
+    "scaled_mortgage_schedule",
     "YearRecord",
     "MAX_AMORTIZATION_YEARS",
 ]
@@ -1,8 +1,11 @@
 """Financial helper utilities for real estate calculations."""
+import math
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Tuple
 
 MAX_AMORTIZATION_YEARS = 100
+UNIT_SCHEDULE_CACHE_SIZE = 256
 
 
 @dataclass
@@ -86,3 +89,149 @@ def mortgage_schedule(
         year += 1
 
     return schedule, total_interest, total_paid
+
+
+@lru_cache(maxsize=UNIT_SCHEDULE_CACHE_SIZE)
+def _unit_balances(interest_rate: float, initial_tilgung_rate: float, max_years: int) -> Tuple[float, ...]:
+    """Per-euro balances ``b_0 = 1, b_1, ...`` of an annuity loan without the cent snap.
+
+    The sequence stops at the first non-positive balance or after ``max_years``
+    years. Every principal shares it; the principal-dependent cent snap is
+    applied when scaling in :func:`scaled_mortgage_schedule`.
+    """
+
+    annuity = interest_rate + initial_tilgung_rate
+    balances = [1.0]
+    balance = 1.0
+    while balance > 0 and len(balances) <= max_years:
+        balance, _, _ = amortization_step(balance, interest_rate, annuity)
+        balances.append(balance)
+    return tuple(balances)
+
+
+def scaled_mortgage_schedule(
+    principal: float,
+    interest_rate: float,
+    initial_tilgung_rate: float,
+    max_years: int = MAX_AMORTIZATION_YEARS,
+) -> Tuple[List[YearRecord], float, float]:
+    """``mortgage_schedule`` scaled from a cached per-euro schedule.
+
+    The schedule is linear in the principal, so loans with the same terms share
+    one cached amortization run; only the scaling and the one-cent payoff check
+    depend on ``principal``. Amounts agree with ``mortgage_schedule`` up to
+    floating-point rounding.
+    """
+
+    if interest_rate < 0 or initial_tilgung_rate <= 0:
+        raise ValueError("Interest must be >= 0 and initial tilgung > 0.")
+
+    annuity = principal * (interest_rate + initial_tilgung_rate)
+    if annuity <= principal * interest_rate:
+        raise ValueError("Annuität is not high enough to reduce the principal. Increase Tilgung.")
+
+    unit = _unit_balances(interest_rate, initial_tilgung_rate, max_years)
+    schedule: List[YearRecord] = []
+    total_interest = 0.0
+    total_paid = 0.0
+
+    for year in range(1, len(unit)):
+        balance = principal * unit[year - 1]
+        interest = balance * interest_rate
+        principal_payment = annuity - interest
+
+        if principal_payment > balance:
+            principal_payment = balance
+            payment_this_year = interest + principal_payment
+            new_balance = 0.0
+        else:
+            payment_this_year = annuity
+            new_balance = principal * unit[year]
+
+        total_interest += interest
+        total_paid += payment_this_year
+
+        if abs(new_balance) < 0.01:
+            new_balance = 0.0
+
+        schedule.append(
+            YearRecord(
+                year=year,
+                interest_paid=interest,
+                principal_paid=principal_payment,
+                remaining_principal=new_balance,
+            )
+        )
+
+        if new_balance <= 0:
+            break
+
+    return schedule, total_interest, total_paid
+
+
+def _balance_after(principal: float, interest_rate: float, annuity: float, years: int) -> float:
+    """Closed-form annuity balance after ``years`` full payments."""
+
+    if interest_rate == 0:
+        return principal - years * annuity
+    growth = (1 + interest_rate) ** years
+    return principal * growth - annuity * (growth - 1) / interest_rate
+
+
+def mortgage_summary(
+    principal: float,
+    interest_rate: float,
+    initial_tilgung_rate: float,
+    max_years: int = MAX_AMORTIZATION_YEARS,
+) -> Tuple[int, float, float]:
+    """Return ``(years, total_interest, total_paid)`` of ``mortgage_schedule`` without the year loop.
+
+    The balance after ``k`` years follows the annuity geometric series
+    ``B(k) = P*q**k - A*(q**k - 1)/i``. The loan ends in the first year whose
+    balance drops below one cent; if it would drop below zero, the last
+    payment only covers interest plus the remaining balance.
+    """
+
+    if interest_rate < 0 or initial_tilgung_rate <= 0:
+        raise ValueError("Interest must be >= 0 and initial tilgung > 0.")
+
+    annuity = principal * (interest_rate + initial_tilgung_rate)
+    if annuity <= principal * interest_rate:
+        raise ValueError("Annuität is not high enough to reduce the principal. Increase Tilgung.")
+
+    # First k with B(k) < 0.01, estimated from the series and corrected below.
+    threshold = 0.01
+    if interest_rate == 0:
+        estimate = (principal - threshold) / annuity
+    else:
+        ratio = (annuity - threshold * interest_rate) / (principal * initial_tilgung_rate)
+        estimate = math.log(ratio) / math.log1p(interest_rate)
+    years = max(math.floor(estimate) + 1, 1)
+    while years > 1 and _balance_after(principal, interest_rate, annuity, years - 1) < threshold:
+        years -= 1
+    while _balance_after(principal, interest_rate, annuity, years) >= threshold and years <= max_years:
+        years += 1
+
+    # A balance within rounding noise of the threshold may fall on either side in the
+    # year loop; let the loop decide so the year count always agrees with it.
+    boundary = _balance_after(principal, interest_rate, annuity, min(years, max_years + 1) - 1)
+    if abs(boundary - threshold) < 1e-9 * max(principal, 1.0):
+        schedule, total_interest, total_paid = mortgage_schedule(
+            principal, interest_rate, initial_tilgung_rate, max_years
+        )
+        return len(schedule), total_interest, total_paid
+
+    if years > max_years:
+        remaining = _balance_after(principal, interest_rate, annuity, max_years)
+        total_paid = max_years * annuity
+        return max_years, total_paid - (principal - remaining), total_paid
+
+    remaining = _balance_after(principal, interest_rate, annuity, years)
+    if remaining < 0:
+        # Final partial year: pay interest on the last balance plus the balance itself.
+        last_balance = _balance_after(principal, interest_rate, annuity, years - 1)
+        total_paid = (years - 1) * annuity + last_balance * (1 + interest_rate)
+        return years, total_paid - principal, total_paid
+
+    total_paid = years * annuity
+    return years, total_paid - (principal - remaining), total_paid
@@ -0,0 +1,149 @@
+"""Incremental re-simulation for scenarios that differ in a few inputs.
+
+The columnar engine in ``real_estate.simulation`` is split into stages with
+disjoint inputs (property value, loan, rent, depreciation) and a final
+tax/cash flow stage that combines them. :class:`IncrementalSimulator` caches
+every stage's output keyed on exactly the inputs that stage reads, so changing
+``tax_rate`` only re-runs the cash flow stage, and changing the management
+costs re-runs the rent and cash flow stages.
+"""
+import math
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Callable, Dict, Hashable, List, Tuple
+
+import numpy as np
+
+from .models import SimulationParams
+from .monthly_loan import monthly_loan_stage
+from .simulation import (
+    Columns,
+    _assemble_columns,
+    cashflow_stage,
+    depreciation_stage,
+    loan_stage,
+    rent_stage,
+    simulation_inputs,
+    value_stage,
+)
+
+STAGE_CACHE_SIZE = 256
+
+# Inputs read by each independent stage, in the order the stage function takes them.
+STAGE_INPUTS = {
+    "value": ("purchase_price", "value_growth_rate"),
+    "loan": ("loan_principal", "loan_interest_rate", "loan_years", "loan_annuity"),
+    "rent": (
+        "net_cold_rent_month",
+        "operating_costs_month",
+        "mgmt_costs_annual",
+        "rent_increase_rate",
+        "rent_increase_interval_years",
+    ),
+    "depreciation": ("depreciation_basis", "depreciation_rate"),
+}
+STAGE_FUNCTIONS: Dict[str, Callable[..., Columns]] = {
+    "value": value_stage,
+    "loan": loan_stage,
+    "rent": rent_stage,
+    "depreciation": depreciation_stage,
+}
+STAGES = tuple(STAGE_INPUTS) + ("cashflow",)
+
+
+def _key_value(value: float) -> Hashable:
+    # NaN never compares equal, so an unset annuity would never hit the cache.
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+def _freeze(columns: Columns) -> Columns:
+    """Mark cached arrays read-only; they are shared between callers."""
+
+    for column in columns.values():
+        if column.flags.writeable:
+            column.flags.writeable = False
+    return columns
+
+
+class IncrementalSimulator:
+    """Stage-level LRU caches around the columnar rental simulation.
+
+    Results are identical to ``simulate_columns``; the returned arrays are
+    read-only views into the caches. The simulator is safe to share between
+    request threads.
+    """
+
+    def __init__(self, max_entries: int = STAGE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._caches: Dict[str, OrderedDict] = {stage: OrderedDict() for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            for cache in self._caches.values():
+                cache.clear()
+
+    def _stage(self, stage: str, key: Hashable, compute: Callable[[], Columns]) -> Tuple[Columns, bool]:
+        cache = self._caches[stage]
+        with self._lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key], False
+
+        columns = _freeze(compute())
+        with self._lock:
+            cache[key] = columns
+            cache.move_to_end(key)
+            while len(cache) > self.max_entries:
+                cache.popitem(last=False)
+        return columns, True
+
+    def simulate_columns(self, params: SimulationParams) -> Tuple[Columns, List[str]]:
+        """Simulate ``params`` reusing cached stages.
+
+        Returns ``(columns, recomputed)`` where ``recomputed`` lists the stages
+        that had to be evaluated for this call, in ``STAGES`` order.
+        """
+
+        inputs = simulation_inputs(params)
+        n_years = params.n_years
+        outputs: Dict[str, Columns] = {}
+        keys = {}
+        recomputed: List[str] = []
+
+        for stage, fields in STAGE_INPUTS.items():
+            args = [np.asarray(inputs[name], dtype=float)[..., None] for name in fields]
+            keys[stage] = (n_years,) + tuple(_key_value(inputs[name]) for name in fields)
+            compute = partial(STAGE_FUNCTIONS[stage], *args, n_years)
+            if stage == "loan" and params.loan_params.monthly:
+                lp = params.loan_params
+                keys[stage] += ("monthly", lp.fixed_rate_years, lp.follow_up_interest_rate, lp.special_repayment)
+                compute = partial(monthly_loan_stage, lp, n_years)
+            outputs[stage], computed = self._stage(stage, keys[stage], compute)
+            if computed:
+                recomputed.append(stage)
+
+        tax_rate = np.asarray(inputs["tax_rate"], dtype=float)[..., None]
+        cashflow_key = tuple(keys[stage] for stage in STAGE_INPUTS) + (_key_value(inputs["tax_rate"]),)
+        outputs["cashflow"], computed = self._stage(
+            "cashflow",
+            cashflow_key,
+            lambda: cashflow_stage(
+                outputs["value"], outputs["loan"], outputs["rent"], outputs["depreciation"], tax_rate
+            ),
+        )
+        if computed:
+            recomputed.append("cashflow")
+
+        columns = _assemble_columns(params.start_year, n_years, *(outputs[stage] for stage in STAGES))
+        return columns, recomputed
+
+
+default_simulator = IncrementalSimulator()
+
+
+def simulate_columns_incremental(params: SimulationParams) -> Tuple[Columns, List[str]]:
+    """``IncrementalSimulator.simulate_columns`` on the process-wide simulator."""
+
+    return default_simulator.simulate_columns(params)
@@ -0,0 +1,176 @@
+"""Columnar in-memory store of property listings.
+
+Listings are kept as parallel NumPy columns instead of ``Property`` objects.
+Price, living space and rooms each get a sorted index (``argsort`` plus the
+sorted values), so a range filter is two binary searches. Combined filters
+start from the narrowest index range and check the remaining ranges on those
+candidates only. Results come back in a precomputed order, and ``Property``
+objects are only built for the rows that are returned.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import Property
+from .spatial import GridIndex
+
+INDEXED_FIELDS = ("price_eur", "living_space_sqm", "rooms")
+NUMERIC_FIELDS = INDEXED_FIELDS + ("latitude", "longitude", "rent_price_eur")
+TEXT_FIELDS = ("identifier", "address", "property_type")
+# Results larger than ``1 / SORT_SELECT_RATIO`` of the store are ordered by a
+# pass over the presorted rows rather than by sorting them.
+SORT_SELECT_RATIO = 16
+
+
+class ListingStore:
+    """Listings as columns with sorted indexes on ``INDEXED_FIELDS``.
+
+    ``rent_price_eur`` is ``NaN`` for listings without a rent. The store is
+    read-only after construction and safe to share between request threads.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        lengths = {len(columns[name]) for name in NUMERIC_FIELDS + TEXT_FIELDS}
+        if len(lengths) != 1:
+            raise ValueError("All listing columns must have the same length.")
+        self.columns = {
+            name: np.asarray(columns[name], dtype=np.int64 if name in ("price_eur", "rooms") else float)
+            for name in NUMERIC_FIELDS
+        }
+        self.columns.update({name: np.asarray(columns[name], dtype=object) for name in TEXT_FIELDS})
+        for column in self.columns.values():
+            column.flags.writeable = False
+
+        self._indexes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for name in INDEXED_FIELDS:
+            order = np.argsort(self.columns[name], kind="stable")
+            self._indexes[name] = (order, self.columns[name][order])
+        self._orders: Dict[Tuple[str, bool], Tuple[np.ndarray, np.ndarray]] = {}
+        self._spatial: Optional[GridIndex] = None
+
+    @classmethod
+    def from_properties(cls, properties: Iterable[Property]) -> "ListingStore":
+        properties = list(properties)
+        columns = {
+            name: [getattr(prop, name) for prop in properties] for name in NUMERIC_FIELDS + TEXT_FIELDS
+        }
+        columns["rent_price_eur"] = [np.nan if rent is None else rent for rent in columns["rent_price_eur"]]
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["price_eur"])
+
+    @property
+    def spatial(self) -> GridIndex:
+        """Grid index over the coordinates, built on first use."""
+
+        if self._spatial is None:
+            self._spatial = GridIndex(self.columns["latitude"], self.columns["longitude"])
+        return self._spatial
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Row positions and haversine distances of listings within ``radius_km``, nearest first."""
+
+        return self.spatial.within(latitude, longitude, radius_km)
+
+    def nearest(self, latitude: float, longitude: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Row positions and distances of the ``k`` nearest listings, nearest first."""
+
+        return self.spatial.nearest(latitude, longitude, k)
+
+    def _range(self, name: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        """Row positions with ``low <= value <= high``, as a slice of the sorted index."""
+
+        order, values = self._indexes[name]
+        start = 0 if low is None else np.searchsorted(values, low, side="left")
+        stop = len(values) if high is None else np.searchsorted(values, high, side="right")
+        return order[start:max(start, stop)]
+
+    def _order(self, name: str, descending: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Stable sort order of ``name`` and the position of every row in it."""
+
+        key = (name, descending)
+        if key not in self._orders:
+            values = self.columns[name]
+            order = np.argsort(-values if descending else values, kind="stable")
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            self._orders[key] = (order, rank)
+        return self._orders[key]
+
+    def query(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_size: Optional[float] = None,
+        max_size: Optional[float] = None,
+        min_rooms: Optional[int] = None,
+        max_rooms: Optional[int] = None,
+        sort_by: str = "price_eur",
+        descending: bool = True,
+        candidates: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Row positions matching all ranges (bounds inclusive), sorted by ``sort_by``.
+
+        Ties keep insertion order. ``candidates`` restricts the query to the
+        given row positions (e.g. from a spatial lookup).
+        """
+
+        bounds = {
+            "price_eur": (min_price, max_price),
+            "living_space_sqm": (min_size, max_size),
+            "rooms": (min_rooms, max_rooms),
+        }
+        active = {name: bound for name, bound in bounds.items() if bound != (None, None)}
+
+        if candidates is not None:
+            rows = np.asarray(candidates, dtype=np.int64)
+        else:
+            ranges = {name: self._range(name, *bound) for name, bound in active.items()}
+            # A range that spans the whole store constrains nothing.
+            active = {name: bound for name, bound in active.items() if len(ranges[name]) < len(self)}
+            if active:
+                driver = min(active, key=lambda name: len(ranges[name]))
+                rows = ranges[driver]
+                active.pop(driver)
+            else:
+                rows = np.arange(len(self), dtype=np.int64)
+
+        for name, (low, high) in active.items():
+            values = self.columns[name][rows]
+            keep = np.ones(len(rows), dtype=bool)
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            rows = rows[keep]
+
+        order, rank = self._order(sort_by, descending)
+        if len(rows) * SORT_SELECT_RATIO < len(self):
+            return rows[np.argsort(rank[rows], kind="stable")]
+        # Large results: walk the presorted order once instead of sorting.
+        selected = np.zeros(len(self), dtype=bool)
+        selected[rows] = True
+        return order[selected[order]]
+
+    def properties(self, rows: Sequence[int]) -> List[Property]:
+        """Materialize ``Property`` objects for the given row positions."""
+
+        columns = self.columns
+        result = []
+        for row in np.asarray(rows, dtype=np.int64).tolist():
+            rent = columns["rent_price_eur"][row]
+            result.append(
+                Property(
+                    identifier=columns["identifier"][row],
+                    price_eur=int(columns["price_eur"][row]),
+                    living_space_sqm=float(columns["living_space_sqm"][row]),
+                    rooms=int(columns["rooms"][row]),
+                    latitude=float(columns["latitude"][row]),
+                    longitude=float(columns["longitude"][row]),
+                    address=columns["address"][row],
+                    property_type=columns["property_type"][row],
+                    rent_price_eur=None if np.isnan(rent) else int(rent),
+                )
+            )
+        return result
@@ -1,4 +1,74 @@
-class RealEstateObject:
+import copy
+from functools import lru_cache
+
+import numpy as np
+
+from tax_calculations import _marginal_rate, est_2026, est_2026_array, marginal_rate_array
+
+from .models_legacy import (
+    LoanParams,
+    Property,
+    PropertyParams,
+    RentalInvestment,
+    RentParams,
+    SelfUsedPropertyInvestment,
+    SimulationParams,
+)
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls: type) -> tuple:
+    """Slots declared by ``cls`` and all its bases, base classes first."""
+
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return tuple(names)
+
+
+class _SlottedState:
+    """Snapshot/restore/fork for year-stepping objects whose whole state lives in ``__slots__``.
+
+    A snapshot is a plain tuple of the slot values; all state is scalar, so
+    restoring or forking never copies more than a few dozen references.
+    """
+
+    __slots__ = ()
+
+    def snapshot(self) -> tuple:
+        return tuple(getattr(self, name) for name in _slot_names(type(self)))
+
+    def restore(self, state: tuple) -> None:
+        for name, value in zip(_slot_names(type(self)), state):
+            setattr(self, name, value)
+
+    def fork(self):
+        """Independent copy that continues from the current year."""
+        clone = object.__new__(type(self))
+        clone.restore(self.snapshot())
+        return clone
+
+
+class RealEstateObject(_SlottedState):
+    __slots__ = (
+        "total_price",
+        "initial_building_value",
+        "building_book_value",
+        "building_market_value",
+        "initial_land_value",
+        "land_value",
+        "initial_total_value",
+        "total_value",
+        "value_increase_rate",
+        "depreciation_rate",
+        "fully_depreciated",
+        "initial_maintenance_cost_per_year",
+        "maintenance_cost_per_year",
+        "maintenance_cost_increase_per_year",
+        "current_year",
+    )
+
     def __init__(self, property_price, purchase_fees, building_portion, value_increase_per_year, depreciation_per_year, maintenance_cost_per_year, maintenance_cost_increase_per_year):
 
         self.total_price = property_price + purchase_fees
@@ -52,7 +122,18 @@ class RealEstateObject:
         
         
         
-class AnnuityLoan:
+class AnnuityLoan(_SlottedState):
+    __slots__ = (
+        "principal_amount",
+        "interest_per_year",
+        "initial_repayment_per_year",
+        "rate_per_year",
+        "annuity",
+        "current_year",
+        "remaining_principal_amount",
+        "paid_off",
+    )
+
     def __init__(self, principal_amount, interest_per_year, initial_repayment_per_year):
         self.principal_amount = principal_amount
         self.interest_per_year = interest_per_year # Zins
@@ -87,7 +168,15 @@ class AnnuityLoan:
 
 
 
-class Tenant:
+class Tenant(_SlottedState):
+    __slots__ = (
+        "net_rent_per_year",
+        "net_rent_increase_per_year",
+        "maintenance_cost_per_year",
+        "maintenance_cost_increase_per_year",
+        "current_year",
+    )
+
     def __init__(self, net_rent_per_year, net_rent_increase_per_year, maintenance_cost_per_year, maintenance_cost_increase_per_year):
         self.net_rent_per_year = net_rent_per_year
         self.net_rent_increase_per_year = net_rent_increase_per_year
@@ -107,7 +196,15 @@ class Tenant:
 
 
 
-class Landlord:
+class Landlord(_SlottedState):
+    __slots__ = (
+        "initial_taxable_income_per_year",
+        "taxable_income_per_year",
+        "taxable_income_increase_per_year",
+        "marital_status",
+        "current_year",
+    )
+
     def __init__(self, initial_taxable_income_per_year, taxable_income_increase_per_year, marital_status):
         self.initial_taxable_income_per_year = initial_taxable_income_per_year
         self.taxable_income_per_year = self.initial_taxable_income_per_year
@@ -144,8 +241,37 @@ class RealEstateInvestment:
         self.current_wealth = self.initial_wealth
         
         self.invested_capital = real_estate_object.total_price
-    
-    
+
+    def snapshot(self) -> tuple:
+        return (
+            self.real_estate_object.snapshot(),
+            self.annuity_loan.snapshot(),
+            self.tenant.snapshot(),
+            self.landlord.snapshot(),
+            self.current_year,
+            self.current_wealth,
+        )
+
+    def restore(self, state: tuple) -> None:
+        object_state, loan_state, tenant_state, landlord_state, self.current_year, self.current_wealth = state
+        self.real_estate_object.restore(object_state)
+        self.annuity_loan.restore(loan_state)
+        self.tenant.restore(tenant_state)
+        self.landlord.restore(landlord_state)
+
+    def fork(self) -> "RealEstateInvestment":
+        """
+        Independent copy continuing from the current year, e.g. to branch a
+        refinance or sale scenario. The tax interface is shared; components
+        may be replaced on the fork without affecting the original.
+        """
+        clone = copy.copy(self)
+        clone.real_estate_object = self.real_estate_object.fork()
+        clone.annuity_loan = self.annuity_loan.fork()
+        clone.tenant = self.tenant.fork()
+        clone.landlord = self.landlord.fork()
+        return clone
+
     def simulate_year(self):
         property_value, value_increase, depreciated_amount, maintenance_cost_landlord, current_year, is_fully_depreciated = self.real_estate_object.simulate_year()
         remaining_principal_amount, loan_repayment, interest_payment, current_year, is_paid_off = self.annuity_loan.simulate_year()
@@ -175,6 +301,14 @@ class RealEstateInvestment:
         
 
 
+@lru_cache(maxsize=None)
+def _normalize_marital_status(marital_status: str) -> str:
+    status = marital_status.strip().lower()
+    if status not in ("single", "married"):
+        raise ValueError(f"Invalid marital status: {marital_status!r}")
+    return status
+
+
 class TaxInterface:
     """
     German income tax approximation with 2026 as base law.
@@ -188,6 +322,41 @@ class TaxInterface:
         self.base_year = base_year
         self.bracket_shift_rate_per_year = bracket_shift_rate_per_year
 
+        # factor_table[k] = (1 + bracket_shift_rate_per_year) ** k, grown on demand
+        self._factor_table = np.ones(1)
+        self._factor_table_rate = bracket_shift_rate_per_year
+
+    # ---------- INDEXATION ----------
+
+    def indexation_factors(self, years) -> np.ndarray:
+        """
+        Indexation factors (1 + bracket_shift_rate_per_year) ** (year - base_year)
+        for an array of tax years, read from a precomputed per-year table.
+        """
+        offsets = np.asarray(years, dtype=np.int64) - self.base_year
+        if offsets.size and offsets.min() < 0:
+            raise ValueError(f"Unsupported tax year: {int(offsets.min()) + self.base_year} (must be >= {self.base_year})")
+
+        table = self._factor_table
+        max_offset = int(offsets.max()) if offsets.size else 0
+        if self._factor_table_rate != self.bracket_shift_rate_per_year or max_offset >= len(table):
+            table = self._build_factor_table(max(max_offset + 1, 2 * len(table)))
+        return table[offsets]
+
+    def _indexation_factor(self, year) -> float:
+        offset = year - self.base_year
+        table = self._factor_table
+        if type(offset) is int and offset < len(table) and self._factor_table_rate == self.bracket_shift_rate_per_year:
+            return table.item(offset)
+        return (1.0 + self.bracket_shift_rate_per_year) ** offset
+
+    def _build_factor_table(self, size: int) -> np.ndarray:
+        # Python's float power keeps the table bit-identical to the per-call formula.
+        base = 1.0 + self.bracket_shift_rate_per_year
+        self._factor_table = np.array([base ** offset for offset in range(size)])
+        self._factor_table_rate = self.bracket_shift_rate_per_year
+        return self._factor_table
+
     # ---------- PUBLIC API ----------
 
     def calculate_tax(self, marital_status: str, taxable_income: float, year: int):
@@ -204,12 +373,10 @@ class TaxInterface:
         if income <= 0:
             return 0.0, 0.0, 0.0
 
-        status = marital_status.strip().lower()
-        if status not in ("single", "married"):
-            raise ValueError(f"Invalid marital status: {marital_status!r}")
+        status = _normalize_marital_status(marital_status)
 
         # --- Indexation: convert nominal income into base-year real income ---
-        factor = (1.0 + self.bracket_shift_rate_per_year) ** (year - self.base_year)
+        factor = self._indexation_factor(year)
         income_real = income / factor  # income in base_year euros
 
         # Apply base-year tax law on real income
@@ -229,6 +396,53 @@ class TaxInterface:
 
         return tax_nominal, avg_rate, marginal_rate
 
+    def calculate_tax_batch(self, marital_status: str, taxable_incomes, years):
+        """
+        Vectorized calculate_tax for arrays of incomes and tax years.
+
+        :param marital_status: "single" or "married" (shared by all entries)
+        :param taxable_incomes: array of taxable incomes (zvE), nominal €
+        :param years: array of tax years (each >= base_year), broadcast against incomes
+        :return: arrays (tax_amount, average_rate_percent, marginal_rate_percent)
+        """
+        status = _normalize_marital_status(marital_status)
+        factor = self.indexation_factors(years)
+        income = np.maximum(np.asarray(taxable_incomes, dtype=float), 0.0)
+        income, factor = np.broadcast_arrays(income, factor)
+
+        income_real = income / factor
+        if status == "single":
+            tax_real = est_2026_array(income_real)
+            marginal = marginal_rate_array(income_real)
+        else:
+            half = income_real / 2.0
+            tax_real = 2.0 * est_2026_array(half)
+            marginal = marginal_rate_array(half)
+
+        positive = income > 0
+        tax_nominal = np.where(positive, tax_real * factor, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_rate = np.where(positive, tax_nominal / income * 100.0, 0.0)
+        return tax_nominal, avg_rate, np.where(positive, marginal, 0.0)
+
+    def calculate_tax_horizon(self, marital_status: str, taxable_incomes, additional_incomes, years):
+        """
+        Tax without and with an additional income (e.g. real-estate result) over a horizon.
+
+        All three arrays are broadcast against each other and evaluated in a
+        single calculate_tax_batch pass.
+        :return: (tax_without_additional, tax_with_additional)
+        """
+        base, additional, years = np.broadcast_arrays(
+            np.asarray(taxable_incomes, dtype=float),
+            np.asarray(additional_incomes, dtype=float),
+            np.asarray(years, dtype=np.int64),
+        )
+        tax, _, _ = self.calculate_tax_batch(
+            marital_status, np.stack([base, base + additional]), np.stack([years, years])
+        )
+        return tax[0], tax[1]
+
     # ---------- BASE-YEAR (2026) LAW ----------
 
     def _single_base(self, zve_real: float):
@@ -261,54 +475,21 @@ class TaxInterface:
         marginal = self._marginal_2026(half)
         return tax, avg, marginal
 
-    # ---------- 2026 ESTIMATE + MARGINAL CURVE (unchanged) ----------
+    # ---------- 2026 ESTIMATE + MARGINAL CURVE ----------
 
     @staticmethod
     def _est_2026(zve: float) -> float:
         """
         Base-year (2026) tax function in base-year euros.
-        """
-        x = int(zve)
-
-        if x <= 12_348:
-            return 0.0
-
-        if x <= 17_799:
-            y = (x - 12_348) / 10_000
-            return (914.51 * y + 1_400.0) * y
-
-        if x <= 69_878:
-            z = (x - 17_799) / 10_000
-            return (173.1 * z + 2_397.0) * z + 1_034.87
 
-        if x <= 277_825:
-            return 0.42 * x - 11_135.63
-
-        return 0.45 * x - 19_470.38
+        Delegates to ``tax_calculations.est_2026`` so an enabled lookup table
+        (``tax_calculations.lookup``) is used here as well.
+        """
+        return est_2026(zve)
 
     @staticmethod
     def _marginal_2026(zve: float) -> float:
         """
         Base-year marginal rate in percent, as function of base-year zvE.
         """
-        x = int(zve)
-
-        if x <= 12_348:
-            return 0.0
-
-        if x <= 17_799:
-            y = (x - 12_348) / 10_000
-            # derivative of (914.51*y + 1400)*y w.r.t. x, scaled to %
-            return (2 * 914.51 * y + 1_400.0) / 10_000 * 100.0
-
-        if x <= 69_878:
-            z = (x - 17_799) / 10_000
-            # derivative of (173.1*z + 2397)*z + 1034.87
-            return (2 * 173.1 * z + 2_397.0) / 10_000 * 100.0
-
-        if x <= 277_825:
-            return 42.0
-
-        return 45.0
-
-
+        return _marginal_rate(zve)
@@ -1,6 +1,19 @@
 """Domain models for real estate simulations."""
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, List, Optional
+
+# Series returned by ``SelfUsedPropertyInvestment.projection_series``.
+PROJECTION_FIELDS = (
+    "year",
+    "property_value",
+    "remaining_balance",
+    "cumulative_interest",
+    "equity",
+    "maintenance",
+    "imputed_rent_savings",
+    "opportunity_cost",
+    "cost_of_ownership",
+)
 
 
 @dataclass
@@ -45,6 +58,11 @@ class LoanParams:
     interest_rate: float
     years: int
     annuity: Optional[float] = None
+    # Monthly engine (``real_estate.monthly_loan``) and its contract features.
+    monthly: bool = False
+    fixed_rate_years: Optional[int] = None
+    follow_up_interest_rate: Optional[float] = None
+    special_repayment: float = 0.0
 
 
 @dataclass
@@ -91,7 +109,7 @@ class RentalInvestment:
             net_cold_rent_month=self.rent_params.net_cold_rent_month * vacancy_multiplier,
             operating_costs_month=self.rent_params.operating_costs_month,
             mgmt_costs_annual=self.rent_params.mgmt_costs_annual + maintenance_reserve,
-            rent_increase_rate=self.rent_params.rent_increase_raD:\Projects\Finanzresilienz\finanzresilienzte,
+            rent_increase_rate=self.rent_params.rent_increase_rate,
             rent_increase_interval_years=self.rent_params.rent_increase_interval_years,
         )
 
@@ -136,45 +154,67 @@ class SelfUsedPropertyInvestment:
             self.loan_params.principal, self.loan_params.interest_rate, self.loan_params.years
         )
 
-    def _mortgage_projection(self, years: int) -> tuple[float, float]:
-        """Return remaining balance and cumulative interest after ``years``."""
+    def projection_series(self, years: Optional[int] = None) -> Dict[str, List[float]]:
+        """Year-by-year projection over ``years`` (default ``holding_years``) in one pass.
+
+        Every list has ``years + 1`` entries; index ``k`` is the state after
+        ``k`` years (index 0 is the purchase). ``equity`` and
+        ``cost_of_ownership`` equal ``projected_equity(k)`` and
+        ``total_cost_of_ownership(k)``.
+        """
 
         from .finance import amortization_step
 
+        target_years = years if years is not None else self.holding_years
+        if target_years < 0:
+            raise ValueError("Projection years must be >= 0.")
+
+        purchase_price = self.property_params.purchase_price
+        growth = 1 + self.property_params.value_growth_rate
+        interest_rate = self.loan_params.interest_rate
+        annuity = self._annuity()
+
+        transaction_costs = purchase_price * self.property_params.transaction_cost_factor
+        equity_contribution = max(purchase_price + transaction_costs - self.loan_params.principal, 0.0)
+
+        series: Dict[str, List[float]] = {name: [] for name in PROJECTION_FIELDS}
         balance = self.loan_params.principal
         interest_paid = 0.0
-        annuity = self._annuity()
-        for _ in range(years):
-            balance, interest, repayment = amortization_step(balance, self.loan_params.interest_rate, annuity)
-            interest_paid += interest
-            if balance <= 0:
-                balance = 0.0
-                break
-        return balance, interest_paid
+        paid_off = False
+
+        for year in range(target_years + 1):
+            if year > 0 and not paid_off:
+                balance, interest, _ = amortization_step(balance, interest_rate, annuity)
+                interest_paid += interest
+                if balance <= 0:
+                    balance = 0.0
+                    paid_off = True
+
+            value = purchase_price * growth ** year
+            maintenance = purchase_price * self.maintenance_reserve_pct * year
+            imputed_savings = self.imputed_rent_savings * 12 * year
+            opportunity_cost = equity_contribution * ((1 + self.opportunity_cost_rate) ** year - 1)
+
+            series["year"].append(year)
+            series["property_value"].append(value)
+            series["remaining_balance"].append(balance)
+            series["cumulative_interest"].append(interest_paid)
+            series["equity"].append(value - balance)
+            series["maintenance"].append(maintenance)
+            series["imputed_rent_savings"].append(imputed_savings)
+            series["opportunity_cost"].append(opportunity_cost)
+            series["cost_of_ownership"].append(
+                transaction_costs + maintenance + interest_paid + opportunity_cost - imputed_savings
+            )
+
+        return series
 
     def projected_equity(self, years: Optional[int] = None) -> float:
         """Estimate equity after property appreciation and amortization."""
 
-        target_years = years if years is not None else self.holding_years
-        value = self.property_params.purchase_price * (1 + self.property_params.value_growth_rate) ** target_years
-        remaining_balance, _ = self._mortgage_projection(target_years)
-        return value - remaining_balance
+        return self.projection_series(years)["equity"][-1]
 
     def total_cost_of_ownership(self, years: Optional[int] = None) -> float:
         """Approximate cumulative ownership cost net of imputed rent savings."""
 
-        target_years = years if years is not None else self.holding_years
-        _, interest_paid = self._mortgage_projection(target_years)
-
-        transaction_costs = self.property_params.purchase_price * self.property_params.transaction_cost_factor
-        maintenance = self.property_params.purchase_price * self.maintenance_reserve_pct * target_years
-        imputed_savings = self.imputed_rent_savings * 12 * target_years
-
-        equity_contribution = max(
-            self.property_params.purchase_price + transaction_costs - self.loan_params.principal, 0.0
-        )
-        opportunity_cost = equity_contribution * ((1 + self.opportunity_cost_rate) ** target_years - 1)
-
-        return transaction_costs + maintenance + interest_paid + opportunity_cost - imputed_savings
-
-
+        return self.projection_series(years)["cost_of_ownership"][-1]
@@ -0,0 +1,252 @@
+"""Monte Carlo mode for the rental property simulation.
+
+Stochastic paths are drawn for the value growth rate (per year), the rent
+increase rate (per year, applied at the rent increase steps) and the loan
+interest rate (per path, i.e. fixed for the whole horizon). Paths are
+simulated in vectorized batches through the columnar stages of
+``real_estate.simulation`` and folded into per-year histograms, so memory does
+not grow with the number of paths.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import SimulationParams
+from .monthly_loan import monthly_loan_stage
+from .simulation import (
+    cashflow_stage,
+    depreciation_stage,
+    loan_stage,
+    rent_stage,
+    simulation_inputs,
+    value_stage,
+)
+
+MONTE_CARLO_METRICS = ("equity_end", "cashflow_after_tax", "loan_rest_end")
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class Distribution:
+    """Distribution of a rate parameter.
+
+    ``kind`` is one of ``"fixed"``, ``"normal"``, ``"lognormal"`` (``1 + rate``
+    is lognormal with the given mean and standard deviation of the rate) or
+    ``"uniform"`` (between ``low`` and ``high``).
+    """
+
+    kind: str = "fixed"
+    mean: float = 0.0
+    std: float = 0.0
+    low: float = 0.0
+    high: float = 0.0
+
+    def sample(self, rng: np.random.Generator, size) -> np.ndarray:
+        if self.kind == "fixed" or (self.kind in ("normal", "lognormal") and self.std <= 0):
+            return np.full(size, self.mean, dtype=float)
+        if self.kind == "normal":
+            return rng.normal(self.mean, self.std, size)
+        if self.kind == "lognormal":
+            sigma2 = np.log1p((self.std / (1 + self.mean)) ** 2)
+            mu = np.log1p(self.mean) - sigma2 / 2
+            return np.expm1(rng.normal(mu, np.sqrt(sigma2), size))
+        if self.kind == "uniform":
+            return rng.uniform(self.low, self.high, size)
+        raise ValueError(f"Unknown distribution: {self.kind!r}")
+
+
+@dataclass
+class MonteCarloParams:
+    """Configuration of a Monte Carlo run on top of ``SimulationParams``."""
+
+    value_growth_rate: Distribution = field(default_factory=Distribution)
+    rent_increase_rate: Distribution = field(default_factory=Distribution)
+    loan_interest_rate: Distribution = field(default_factory=Distribution)
+    n_paths: int = 10_000
+    batch_size: int = 2_000
+    seed: Optional[int] = None
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    bins: int = 512
+
+
+class PercentileAggregator:
+    """Streaming per-year histograms with approximate percentiles.
+
+    Bin edges are fixed per year (``lower``/``upper`` arrays of length
+    ``n_years``); values outside fall into under/overflow bins whose edges are
+    the exact running minimum and maximum. Percentiles are interpolated
+    linearly within a bin, so their resolution is ``(upper - lower) / bins``.
+    """
+
+    def __init__(self, lower: np.ndarray, upper: np.ndarray, bins: int = 512):
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.maximum(np.asarray(upper, dtype=float), self.lower + 1e-9)
+        self.bins = bins
+        n_years = len(self.lower)
+        self.counts = np.zeros((n_years, bins + 2), dtype=np.int64)
+        self.total = np.zeros(n_years)
+        self.minimum = np.full(n_years, np.inf)
+        self.maximum = np.full(n_years, -np.inf)
+        self.n = 0
+
+    @classmethod
+    def from_sample(cls, values: np.ndarray, bins: int = 512, margin: float = 0.5) -> "PercentileAggregator":
+        """Choose per-year bin ranges from a pilot sample, widened by ``margin`` of its span."""
+
+        low = values.min(axis=0)
+        high = values.max(axis=0)
+        span = np.maximum(high - low, 1e-6 * np.maximum(np.abs(high), 1.0))
+        return cls(low - margin * span, high + margin * span, bins)
+
+    def add(self, values: np.ndarray) -> None:
+        """Fold a ``(paths, n_years)`` block into the histograms."""
+
+        n_years = len(self.lower)
+        width = (self.upper - self.lower) / self.bins
+        index = np.clip(np.floor((values - self.lower) / width), -1, self.bins).astype(np.int64) + 1
+        flat = index + np.arange(n_years) * (self.bins + 2)
+        self.counts += np.bincount(flat.ravel(), minlength=n_years * (self.bins + 2)).reshape(n_years, -1)
+        self.total += values.sum(axis=0)
+        self.minimum = np.minimum(self.minimum, values.min(axis=0))
+        self.maximum = np.maximum(self.maximum, values.max(axis=0))
+        self.n += values.shape[0]
+
+    def merge(self, other: "PercentileAggregator") -> None:
+        self.counts += other.counts
+        self.total += other.total
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+        self.n += other.n
+
+    def mean(self) -> np.ndarray:
+        return self.total / max(self.n, 1)
+
+    def percentiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Approximate percentiles per year, shape ``(len(qs), n_years)``."""
+
+        width = (self.upper - self.lower) / self.bins
+        inner = self.lower[:, None] + width[:, None] * np.arange(self.bins + 1)
+        edges = np.concatenate(
+            [
+                np.minimum(self.minimum, self.lower)[:, None],
+                inner,
+                np.maximum(self.maximum, self.upper)[:, None],
+            ],
+            axis=1,
+        )
+        cumulative = np.cumsum(self.counts, axis=1)
+
+        result = np.empty((len(qs), len(self.lower)))
+        for row, q in enumerate(qs):
+            target = q / 100 * self.n
+            for year in range(len(self.lower)):
+                bin_index = min(np.searchsorted(cumulative[year], target), self.bins + 1)
+                before = cumulative[year, bin_index - 1] if bin_index > 0 else 0
+                count = self.counts[year, bin_index]
+                fraction = (target - before) / count if count else 0.0
+                left, right = edges[year, bin_index], edges[year, bin_index + 1]
+                result[row, year] = left + fraction * (right - left)
+        return np.clip(result, self.minimum, self.maximum)
+
+
+def _simulate_paths(
+    params: SimulationParams, mc: MonteCarloParams, rng: np.random.Generator, n_paths: int
+) -> Dict[str, np.ndarray]:
+    """Simulate ``n_paths`` stochastic paths; returns ``(n_paths, n_years)`` metric arrays."""
+
+    n_years = params.n_years
+    x = simulation_inputs(params)
+
+    value_growth = mc.value_growth_rate.sample(rng, (n_paths, n_years))
+    rent_increase = mc.rent_increase_rate.sample(rng, (n_paths, n_years))
+    loan_rate = mc.loan_interest_rate.sample(rng, (n_paths, 1))
+
+    value = value_stage(x["purchase_price"], value_growth, n_years)
+    if params.loan_params.monthly:
+        loan = monthly_loan_stage(params.loan_params, n_years, interest_rate=loan_rate[..., 0])
+    else:
+        loan = loan_stage(x["loan_principal"], loan_rate, x["loan_years"], x["loan_annuity"], n_years)
+    rent = rent_stage(
+        x["net_cold_rent_month"],
+        x["operating_costs_month"],
+        x["mgmt_costs_annual"],
+        rent_increase,
+        x["rent_increase_interval_years"],
+        n_years,
+    )
+    depreciation = depreciation_stage(x["depreciation_basis"], x["depreciation_rate"], n_years)
+    cashflow = cashflow_stage(value, loan, rent, depreciation, x["tax_rate"])
+
+    columns = {**loan, **cashflow}
+    return {metric: columns[metric] for metric in MONTE_CARLO_METRICS}
+
+
+def _run_batch(
+    params: SimulationParams,
+    mc: MonteCarloParams,
+    seed: np.random.SeedSequence,
+    n_paths: int,
+    ranges: Dict[str, Tuple[np.ndarray, np.ndarray]],
+) -> Dict[str, PercentileAggregator]:
+    paths = _simulate_paths(params, mc, np.random.default_rng(seed), n_paths)
+    aggregators = {}
+    for metric, values in paths.items():
+        lower, upper = ranges[metric]
+        aggregators[metric] = PercentileAggregator(lower, upper, mc.bins)
+        aggregators[metric].add(values)
+    return aggregators
+
+
+def simulate_monte_carlo(
+    params: SimulationParams, mc: MonteCarloParams, workers: int = 1
+) -> Dict[str, object]:
+    """Run ``mc.n_paths`` stochastic paths and return per-year percentile bands.
+
+    Every batch draws from its own child of ``SeedSequence(mc.seed)``, so the
+    result for a given seed does not depend on ``workers``. The first batch
+    fixes the histogram ranges; the remaining batches run in a process pool
+    when ``workers > 1``.
+    """
+
+    n_paths = max(int(mc.n_paths), 1)
+    batch_size = max(min(int(mc.batch_size), n_paths), 1)
+    sizes = [batch_size] * (n_paths // batch_size)
+    if n_paths % batch_size:
+        sizes.append(n_paths % batch_size)
+    seeds = np.random.SeedSequence(mc.seed).spawn(len(sizes))
+
+    pilot = _simulate_paths(params, mc, np.random.default_rng(seeds[0]), sizes[0])
+    aggregators = {
+        metric: PercentileAggregator.from_sample(values, mc.bins) for metric, values in pilot.items()
+    }
+    for metric, values in pilot.items():
+        aggregators[metric].add(values)
+    ranges = {metric: (agg.lower, agg.upper) for metric, agg in aggregators.items()}
+
+    jobs = list(zip(seeds[1:], sizes[1:]))
+    if workers > 1 and jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_batch, params, mc, seed, size, ranges) for seed, size in jobs]
+            for future in futures:
+                for metric, aggregator in future.result().items():
+                    aggregators[metric].merge(aggregator)
+    else:
+        for seed, size in jobs:
+            for metric, aggregator in _run_batch(params, mc, seed, size, ranges).items():
+                aggregators[metric].merge(aggregator)
+
+    percentiles = list(mc.percentiles)
+    bands = {}
+    for metric, aggregator in aggregators.items():
+        values = aggregator.percentiles(percentiles)
+        bands[metric] = {f"p{q:g}": values[row] for row, q in enumerate(percentiles)}
+        bands[metric]["mean"] = aggregator.mean()
+
+    return {
+        "years": params.start_year + np.arange(params.n_years),
+        "n_paths": n_paths,
+        "percentiles": percentiles,
+        "bands": bands,
+    }
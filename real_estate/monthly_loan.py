@@ -0,0 +1,273 @@
+"""Monthly-resolution annuity loan engine.
+
+German mortgages are repaid in monthly installments ``M`` (annual Annuität /
+12) at a monthly rate ``r = i / 12``. They often come with a Zinsbindung
+(fixed-rate period) followed by a loan at a new rate, and with annual
+Sondertilgungen (special repayments).
+
+Within one year at a fixed rate the balance after ``m`` installments is
+
+    B_m = B_0 * q**m - M * (q**m - 1) / r,    q = 1 + r
+
+so every loan year is evaluated as a closed-form block of twelve months for
+all loans at once. Rate resets and special repayments happen between blocks,
+so the Python loop runs over years, never over months or loans.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from .models import LoanParams
+
+Columns = Dict[str, np.ndarray]
+
+MONTHS_PER_YEAR = 12
+
+# Yearly columns returned by ``monthly_loan_columns``. The first five match
+# ``simulation.loan_stage`` so the monthly engine can replace it.
+LOAN_FIELDS = (
+    "loan_rest_start",
+    "loan_rest_end",
+    "annuity_annual",
+    "interest_paid",
+    "principal_paid",
+    "special_repayment",
+    "interest_rate",
+    "months_paid",
+)
+
+
+@dataclass
+class MonthlyLoanOptions:
+    """Contract features of the monthly engine beyond a plain annuity loan.
+
+    ``fixed_rate_years`` is the Zinsbindung (``None``: the rate never changes).
+    After it the loan continues at ``follow_up_interest_rate`` (default: the
+    initial rate) with the installment kept unless it no longer covers the
+    interest (see ``monthly_loan_columns``). The Sondertilgung
+    ``special_repayment + special_repayment_rate * principal`` is paid at the
+    end of every loan year.
+    """
+
+    fixed_rate_years: Optional[int] = None
+    follow_up_interest_rate: Optional[float] = None
+    special_repayment: float = 0.0
+    special_repayment_rate: float = 0.0
+
+    def columns(self, principal, interest_rate, installment, n_years: int, term_years=np.inf) -> Columns:
+        """``monthly_loan_columns`` for loans sharing these contract features."""
+
+        principal = np.asarray(principal, dtype=float)
+        return monthly_loan_columns(
+            principal,
+            interest_rate,
+            installment,
+            n_years,
+            fixed_rate_years=_or(self.fixed_rate_years, np.inf),
+            follow_up_interest_rate=_or(self.follow_up_interest_rate, np.nan),
+            special_repayment=self.special_repayment + self.special_repayment_rate * principal,
+            term_years=term_years,
+        )
+
+
+def monthly_installment(principal, interest_rate, initial_tilgung_rate) -> np.ndarray:
+    """Installment ``P * (i + t) / 12`` of a loan with initial Tilgung ``t``."""
+
+    return np.asarray(principal, dtype=float) * (np.asarray(interest_rate) + initial_tilgung_rate) / MONTHS_PER_YEAR
+
+
+def monthly_installment_for_term(principal, interest_rate, years) -> np.ndarray:
+    """Installment that repays ``principal`` in ``years`` years of monthly payments."""
+
+    principal = np.asarray(principal, dtype=float)
+    rate = np.asarray(interest_rate, dtype=float) / MONTHS_PER_YEAR
+    months = np.asarray(years, dtype=float) * MONTHS_PER_YEAR
+    safe_rate = np.where(rate == 0, 1.0, rate)
+    return np.where(rate == 0, principal / months, principal * safe_rate / (1 - (1 + safe_rate) ** (-months)))
+
+
+def _year_factors(monthly_rate, months=MONTHS_PER_YEAR):
+    """``(q**m, (q**m - 1) / r)`` so that ``B_m = B_0 * q**m - M * (q**m - 1) / r``."""
+
+    growth = (1 + monthly_rate) ** months
+    safe_rate = np.where(monthly_rate == 0, 1.0, monthly_rate)
+    return growth, np.where(monthly_rate == 0, months, (growth - 1) / safe_rate)
+
+
+def _balance_after(balance, monthly_rate, installment, months):
+    growth, growth_sum = _year_factors(monthly_rate, months)
+    return balance * growth - installment * growth_sum
+
+
+def _payoff_month(balance, monthly_rate, installment, pays_off):
+    """First month (1..12) whose installment covers the remaining balance."""
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exact = np.where(
+            monthly_rate == 0,
+            balance / installment,
+            np.log(installment / (installment - monthly_rate * balance)) / np.log1p(monthly_rate),
+        )
+    months = np.clip(np.ceil(np.where(pays_off, exact, MONTHS_PER_YEAR)), 1, MONTHS_PER_YEAR)
+
+    # Guard the logarithm's rounding with the closed form on both sides.
+    months = np.where(
+        pays_off & (months > 1) & (_balance_after(balance, monthly_rate, installment, months - 1) <= 0),
+        months - 1,
+        months,
+    )
+    months = np.where(
+        pays_off & (months < MONTHS_PER_YEAR) & (_balance_after(balance, monthly_rate, installment, months) > 0),
+        months + 1,
+        months,
+    )
+    return months
+
+
+def monthly_loan_columns(
+    principal,
+    interest_rate,
+    installment,
+    n_years: int,
+    fixed_rate_years=np.inf,
+    follow_up_interest_rate=np.nan,
+    special_repayment=0.0,
+    term_years=np.inf,
+) -> Columns:
+    """Yearly totals of monthly annuity loans.
+
+    All arguments broadcast to a common batch shape ``S``; every column has
+    shape ``S + (n_years,)``. A ``NaN`` follow-up rate and ``inf`` year limits
+    mean "not set" (see :class:`MonthlyLoanOptions`). The final installment
+    only covers the remaining balance, and paid-off loans have no payments.
+    A kept installment that no longer covers the interest after a rate reset
+    would grow the balance; it is re-derived to repay the balance by the end
+    of ``term_years`` (at least one more year) when the term is finite.
+    """
+
+    balance, rate, installment, fixed_years, follow_rate, special, term = (
+        np.array(value, dtype=float)
+        for value in np.broadcast_arrays(
+            principal,
+            interest_rate,
+            installment,
+            fixed_rate_years,
+            follow_up_interest_rate,
+            special_repayment,
+            term_years,
+        )
+    )
+    follow_rate = np.where(np.isnan(follow_rate), rate, follow_rate)
+
+    columns = {name: np.zeros(balance.shape + (n_years,)) for name in LOAN_FIELDS}
+    years_index = np.arange(n_years, dtype=float)
+    columns["interest_rate"] = np.where(years_index >= fixed_years[..., None], follow_rate[..., None], rate[..., None])
+
+    # Paid-off loans keep a zero balance and a zero installment, so the
+    # closed form yields zero payments for them without extra masking.
+    balance = np.maximum(balance, 0.0)
+    installment = np.where(balance > 0, installment, 0.0)
+    special = np.maximum(special, 0.0)
+    has_special = bool(special.any())
+    block = None
+
+    for year in range(n_years):
+        active = balance > 0
+        if not active.any():
+            break
+
+        reset = year == fixed_years
+        if block is None or reset.any():
+            rate = columns["interest_rate"][..., year]
+            monthly_rate = rate / MONTHS_PER_YEAR
+            underpaid = reset & active & np.isfinite(term)
+            underpaid &= installment <= balance * monthly_rate
+            if underpaid.any():
+                remaining_years = np.maximum(np.where(np.isfinite(term), term, 0.0) - year, 1.0)
+                rederived = monthly_installment_for_term(balance, rate, remaining_years)
+                installment = np.where(underpaid, rederived, installment)
+            block = _year_factors(monthly_rate)
+        growth, growth_sum = block
+
+        end = balance * growth - installment * growth_sum
+        pays_off = active & (end <= 0)
+        if pays_off.any():
+            months = _payoff_month(balance, monthly_rate, installment, pays_off)
+            last_balance = _balance_after(balance, monthly_rate, installment, months - 1)
+            paid = np.where(
+                pays_off, (months - 1) * installment + last_balance * (1 + monthly_rate), MONTHS_PER_YEAR * installment
+            )
+            principal_paid = np.where(pays_off, balance, balance - end)
+            end = np.where(pays_off, 0.0, end)
+            months_paid = np.where(pays_off, months, np.where(active, MONTHS_PER_YEAR, 0.0))
+        else:
+            paid = MONTHS_PER_YEAR * installment
+            principal_paid = balance - end
+            months_paid = np.where(active, MONTHS_PER_YEAR, 0.0)
+
+        if has_special:
+            extra = np.minimum(special, end)
+            rest = end - extra
+        else:
+            extra = 0.0
+            rest = end
+        rest = np.where(rest < 0.01, 0.0, rest)
+
+        columns["loan_rest_start"][..., year] = balance
+        columns["loan_rest_end"][..., year] = rest
+        columns["annuity_annual"][..., year] = paid
+        columns["interest_paid"][..., year] = paid - principal_paid
+        columns["principal_paid"][..., year] = principal_paid + extra
+        columns["special_repayment"][..., year] = extra
+        columns["months_paid"][..., year] = months_paid
+
+        balance = rest
+        if pays_off.any() or has_special:
+            installment = np.where(rest > 0, installment, 0.0)
+
+    return columns
+
+
+def monthly_loan_summary(columns: Columns) -> Dict[str, np.ndarray]:
+    """Months until payoff, totals and the remaining balance per loan."""
+
+    return {
+        "months": columns["months_paid"].sum(axis=-1),
+        "total_interest": columns["interest_paid"].sum(axis=-1),
+        "total_paid": (columns["annuity_annual"] + columns["special_repayment"]).sum(axis=-1),
+        "total_special_repayment": columns["special_repayment"].sum(axis=-1),
+        "remaining": columns["loan_rest_end"][..., -1],
+    }
+
+
+def monthly_loan_stage(
+    loan_params: LoanParams, n_years: int, principal=None, interest_rate=None, years=None, annuity=None
+) -> Columns:
+    """``simulation.loan_stage`` replacement for ``LoanParams`` with ``monthly=True``.
+
+    The installment is ``annuity / 12`` if an annuity is given, otherwise the
+    monthly annuity that repays the loan in ``years``. Batches pass arrays for
+    ``principal``, ``interest_rate``, ``years`` and ``annuity`` (``NaN``: not
+    set) in place of the ``loan_params`` fields; the columns then have shape
+    ``S + (n_years,)``. ``years`` is also the term used after a rate reset.
+    """
+
+    principal = np.asarray(_or(principal, loan_params.principal), dtype=float)
+    interest_rate = np.asarray(_or(interest_rate, loan_params.interest_rate), dtype=float)
+    years = np.asarray(_or(years, loan_params.years), dtype=float)
+    annuity = np.asarray(_or(annuity, _or(loan_params.annuity, np.nan)), dtype=float)
+    installment = np.where(
+        np.isnan(annuity), monthly_installment_for_term(principal, interest_rate, years), annuity / MONTHS_PER_YEAR
+    )
+
+    options = MonthlyLoanOptions(
+        fixed_rate_years=loan_params.fixed_rate_years,
+        follow_up_interest_rate=loan_params.follow_up_interest_rate,
+        special_repayment=loan_params.special_repayment,
+    )
+    return options.columns(principal, interest_rate, installment, n_years, term_years=years)
+
+
+def _or(value, default):
+    return default if value is None else value
@@ -0,0 +1,194 @@
+"""Lock-step batch engine for portfolios of ``RealEstateInvestment`` objects.
+
+:class:`InvestmentBatch` holds the year-stepping state of many investments
+(property values, book values, loan balances, rents, landlord incomes) as
+NumPy arrays and advances all of them one year per vectorized step. The
+arithmetic mirrors ``RealEstateInvestment.simulate_year`` and its components
+operation by operation, so results match the object model exactly; taxes for
+all investments sharing a ``TaxInterface`` and marital status are computed in
+one ``calculate_tax_horizon`` call.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .models import RealEstateInvestment, TaxInterface, _normalize_marital_status
+
+Columns = Dict[str, np.ndarray]
+
+# Per-year outputs of ``InvestmentBatch.simulate_year``.
+STEP_FIELDS = (
+    "year",
+    "property_value",
+    "value_increase",
+    "depreciation",
+    "maintenance_cost",
+    "remaining_principal",
+    "loan_repayment",
+    "interest_payment",
+    "rent",
+    "taxable_income",
+    "additional_tax",
+    "cashflow_after_tax",
+    "wealth",
+    "return_on_equity",
+    "return_on_equity_wo_value_increase",
+)
+
+
+def _array(values) -> np.ndarray:
+    return np.array(values, dtype=float)
+
+
+class InvestmentBatch:
+    """Array-backed state of N investments advanced in lock-step.
+
+    Build it with :meth:`from_investments`; the source objects are read once
+    and not modified. The tenant's own maintenance cost does not enter any
+    investment result and is not tracked.
+    """
+
+    def __init__(self, investments: Sequence[RealEstateInvestment]):
+        if not investments:
+            raise ValueError("At least one investment is required.")
+
+        objects = [investment.real_estate_object for investment in investments]
+        loans = [investment.annuity_loan for investment in investments]
+        tenants = [investment.tenant for investment in investments]
+        landlords = [investment.landlord for investment in investments]
+
+        # Property
+        self.value_increase_rate = _array([o.value_increase_rate for o in objects])
+        self.depreciation_rate = _array([o.depreciation_rate for o in objects])
+        self.initial_building_value = _array([o.initial_building_value for o in objects])
+        self.building_book_value = _array([o.building_book_value for o in objects])
+        self.building_market_value = _array([o.building_market_value for o in objects])
+        self.land_value = _array([o.land_value for o in objects])
+        self.fully_depreciated = np.array([o.fully_depreciated for o in objects], dtype=bool)
+        self.maintenance_cost_per_year = _array([o.maintenance_cost_per_year for o in objects])
+        self.maintenance_cost_increase_per_year = _array([o.maintenance_cost_increase_per_year for o in objects])
+
+        # Loan
+        self.interest_per_year = _array([loan.interest_per_year for loan in loans])
+        self.annuity = _array([loan.annuity for loan in loans])
+        self.remaining_principal_amount = _array([loan.remaining_principal_amount for loan in loans])
+        self.paid_off = np.array([loan.paid_off for loan in loans], dtype=bool)
+
+        # Tenant and landlord
+        self.net_rent_per_year = _array([tenant.net_rent_per_year for tenant in tenants])
+        self.net_rent_increase_per_year = _array([tenant.net_rent_increase_per_year for tenant in tenants])
+        self.taxable_income_per_year = _array([landlord.taxable_income_per_year for landlord in landlords])
+        self.taxable_income_increase_per_year = _array(
+            [landlord.taxable_income_increase_per_year for landlord in landlords]
+        )
+
+        # Investment
+        self.current_year = np.array([investment.current_year for investment in investments], dtype=np.int64)
+        self.current_wealth = _array([investment.current_wealth for investment in investments])
+        self.invested_capital = _array([investment.invested_capital for investment in investments])
+
+        self._tax_groups = self._group_taxes(investments)
+
+    def __len__(self) -> int:
+        return len(self.current_wealth)
+
+    @classmethod
+    def from_investments(cls, investments: Sequence[RealEstateInvestment]) -> "InvestmentBatch":
+        return cls(list(investments))
+
+    @staticmethod
+    def _group_taxes(investments: Sequence[RealEstateInvestment]) -> List[Tuple[TaxInterface, str, np.ndarray]]:
+        groups: Dict[Tuple[int, str], Tuple[TaxInterface, List[int]]] = {}
+        for index, investment in enumerate(investments):
+            status = _normalize_marital_status(investment.landlord.marital_status)
+            key = (id(investment.tax_interface), status)
+            groups.setdefault(key, (investment.tax_interface, []))[1].append(index)
+        return [
+            (interface, status, np.array(indices, dtype=np.int64))
+            for (_, status), (interface, indices) in groups.items()
+        ]
+
+    # ---------- STEPPING ----------
+
+    def simulate_year(self) -> Columns:
+        """Advance every investment by one year; returns one array per ``STEP_FIELDS`` entry."""
+
+        year = self.current_year.copy()
+
+        # RealEstateObject.simulate_year
+        building_market_value_increase = self.building_market_value * self.value_increase_rate
+        land_value_increase = self.land_value * self.value_increase_rate
+        value_increase = land_value_increase + building_market_value_increase
+        self.land_value = self.land_value + land_value_increase
+        self.building_market_value = self.building_market_value + building_market_value_increase
+        property_value = self.land_value + self.building_market_value
+
+        depreciation_amount = self.initial_building_value * self.depreciation_rate
+        depreciable_amount = np.minimum(depreciation_amount, self.building_book_value)
+        book_value = np.maximum(self.building_book_value - depreciable_amount, 0.0)
+        exhausted = book_value <= 1e-6
+        self.building_book_value = np.where(exhausted, 0.0, book_value)
+        self.fully_depreciated = self.fully_depreciated | exhausted
+        self.maintenance_cost_per_year = self.maintenance_cost_per_year * (1 + self.maintenance_cost_increase_per_year)
+        maintenance_cost = self.maintenance_cost_per_year
+
+        # AnnuityLoan.simulate_year
+        active = ~self.paid_off
+        interest_payment = np.where(active, self.remaining_principal_amount * self.interest_per_year, 0.0)
+        loan_repayment = np.where(active, self.annuity - interest_payment, 0.0)
+        finishing = active & (self.remaining_principal_amount - loan_repayment <= 0)
+        loan_repayment = np.where(finishing, self.remaining_principal_amount, loan_repayment)
+        self.paid_off = self.paid_off | finishing
+        self.remaining_principal_amount = self.remaining_principal_amount - loan_repayment
+        remaining_principal = np.where(active, self.remaining_principal_amount, 0.0)
+
+        # Tenant and Landlord
+        self.net_rent_per_year = self.net_rent_per_year * (1 + self.net_rent_increase_per_year)
+        rent = self.net_rent_per_year
+        self.taxable_income_per_year = self.taxable_income_per_year * (1 + self.taxable_income_increase_per_year)
+        taxable_income = self.taxable_income_per_year
+
+        # RealEstateInvestment.simulate_year
+        cashflow_before_tax = rent - loan_repayment - interest_payment - maintenance_cost
+        taxable_income_increase = rent - depreciable_amount - interest_payment - maintenance_cost
+
+        additional_tax = np.empty(len(self))
+        for interface, status, indices in self._tax_groups:
+            tax_without, tax_with = interface.calculate_tax_horizon(
+                status, taxable_income[indices], taxable_income_increase[indices], year[indices]
+            )
+            additional_tax[indices] = tax_with - tax_without
+
+        wealth_increase = value_increase + rent - interest_payment - maintenance_cost - additional_tax
+        self.current_wealth = self.current_wealth + wealth_increase
+        self.current_year = year + 1
+
+        return {
+            "year": year,
+            "property_value": property_value,
+            "value_increase": value_increase,
+            "depreciation": depreciable_amount,
+            "maintenance_cost": maintenance_cost,
+            "remaining_principal": remaining_principal,
+            "loan_repayment": loan_repayment,
+            "interest_payment": interest_payment,
+            "rent": rent,
+            "taxable_income": taxable_income,
+            "additional_tax": additional_tax,
+            "cashflow_after_tax": cashflow_before_tax - additional_tax,
+            "wealth": self.current_wealth,
+            "return_on_equity": wealth_increase / self.invested_capital,
+            "return_on_equity_wo_value_increase": (wealth_increase - value_increase) / self.invested_capital,
+        }
+
+    def simulate(self, n_years: int) -> Columns:
+        """Advance ``n_years`` years; every returned array has shape ``(n_years, N)``."""
+
+        steps = [self.simulate_year() for _ in range(n_years)]
+        return {name: np.stack([step[name] for step in steps]) for name in STEP_FIELDS}
+
+
+def simulate_portfolio(investments: Sequence[RealEstateInvestment], n_years: int) -> Columns:
+    """Simulate copies of ``investments`` for ``n_years``; the objects themselves are left unchanged."""
+
+    return InvestmentBatch.from_investments(investments).simulate(n_years)
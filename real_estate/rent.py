@@ -6,8 +6,10 @@ def rent_for_year(params: RentParams, year_index: int) -> tuple[float, float, fl
     """Calculate rent progression for a given year index.
 
     Args:
-        params: Rent configuration.
-        year_index: Zero-based index for the simulation year (0 = start year).
+        params: Rent configuration (NumPy array fields broadcast against
+            ``year_index``).
+        year_index: Zero-based index for the simulation year (0 = start year),
+            or an array of them.
 
     Returns:
         Tuple of (net_cold_month, warm_month, warm_year).
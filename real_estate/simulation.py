@@ -1,129 +1,388 @@
-"""Simulation logic for buy-to-let scenarios."""
-from typing import List
+"""Simulation logic for buy-to-let scenarios.
+
+The engine is columnar: every stage returns NumPy arrays whose trailing axis
+is the simulation year. Stage inputs broadcast against each other, so the same
+code evaluates a single scenario (arrays of shape ``(n_years,)``) or a batch of
+scenarios (shape ``(..., n_years)``).
+"""
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
-from .finance import amortization_step, calc_annuity
 from .models import LoanParams, PropertyParams, RentParams, SimulationParams
+from .monthly_loan import monthly_loan_stage
 from .rent import rent_for_year
 
+Columns = Dict[str, np.ndarray]
 
-def simulate(params: SimulationParams) -> List[dict]:
-    """Run the rental property simulation and return yearly records."""
+SWEEP_CHUNK_SIZE = 4096
+
+# Column order of the per-year records returned by ``simulate``.
+RECORD_FIELDS = (
+    "year",
+    "property_value_start",
+    "property_value_end",
+    "equity_start",
+    "equity_end",
+    "loan_rest_start",
+    "loan_rest_end",
+    "annuity_annual",
+    "interest_paid",
+    "principal_paid",
+    "net_cold_rent_month",
+    "warm_rent_month",
+    "warm_rent_year",
+    "mgmt_costs_annual",
+    "depreciation_annual",
+    "depreciation_cum",
+    "taxable_income",
+    "taxes",
+    "cashflow_operating",
+    "cashflow_after_tax",
+)
+
+# Flat scalar inputs of a simulation, named like the JSON payload fields.
+INPUT_FIELDS = (
+    "purchase_price",
+    "transaction_cost_factor",
+    "value_growth_rate",
+    "depreciation_basis",
+    "depreciation_rate",
+    "loan_principal",
+    "loan_interest_rate",
+    "loan_years",
+    "loan_annuity",
+    "net_cold_rent_month",
+    "operating_costs_month",
+    "mgmt_costs_annual",
+    "rent_increase_rate",
+    "rent_increase_interval_years",
+    "tax_rate",
+)
+
+# Inputs that only take whole numbers.
+INTEGER_INPUTS = ("loan_years", "rent_increase_interval_years")
+
+
+def simulation_inputs(params: SimulationParams) -> Dict[str, float]:
+    """Flatten ``SimulationParams`` into ``INPUT_FIELDS`` (``loan_annuity`` is NaN if unset)."""
 
     pp: PropertyParams = params.property_params
     lp: LoanParams = params.loan_params
     rp: RentParams = params.rent_params
 
-    if lp.annuity is None:
-        annuity = calc_annuity(lp.principal, lp.interest_rate, lp.years)
+    return {
+        "purchase_price": pp.purchase_price,
+        "transaction_cost_factor": pp.transaction_cost_factor,
+        "value_growth_rate": pp.value_growth_rate,
+        "depreciation_basis": pp.depreciation_basis,
+        "depreciation_rate": pp.depreciation_rate,
+        "loan_principal": lp.principal,
+        "loan_interest_rate": lp.interest_rate,
+        "loan_years": lp.years,
+        "loan_annuity": np.nan if lp.annuity is None else lp.annuity,
+        "net_cold_rent_month": rp.net_cold_rent_month,
+        "operating_costs_month": rp.operating_costs_month,
+        "mgmt_costs_annual": rp.mgmt_costs_annual,
+        "rent_increase_rate": rp.rent_increase_rate,
+        "rent_increase_interval_years": rp.rent_increase_interval_years,
+        "tax_rate": params.tax_rate,
+    }
+
+
+def input_overrides(params: SimulationParams, values: Mapping[str, object]) -> Dict[str, object]:
+    """``simulate_batch`` overrides that set the ``INPUT_FIELDS`` in ``values``.
+
+    Changing ``purchase_price`` keeps the buyer's equity and the ratio of
+    depreciation basis to price, so the loan absorbs the price difference.
+    Explicit ``depreciation_basis`` or ``loan_principal`` values take precedence.
+    """
+
+    overrides = dict(values)
+    if "purchase_price" in overrides:
+        inputs = simulation_inputs(params)
+        price = np.asarray(overrides["purchase_price"], dtype=float)
+        cost_factor = 1 + inputs["transaction_cost_factor"]
+        equity = inputs["purchase_price"] * cost_factor - inputs["loan_principal"]
+        basis_ratio = inputs["depreciation_basis"] / inputs["purchase_price"] if inputs["purchase_price"] else 0.0
+        overrides.setdefault("depreciation_basis", price * basis_ratio)
+        overrides.setdefault("loan_principal", price * cost_factor - equity)
+    return overrides
+
+
+# ---------- STAGES ----------
+#
+# Stage arguments broadcast against ``(..., n_years)``: per-scenario values need
+# a trailing length-1 axis, per-year values (e.g. stochastic growth rates) the
+# full year axis.
+
+
+def value_stage(purchase_price, value_growth_rate, n_years: int) -> Columns:
+    """Property value at the start and end of every year."""
+
+    growth = np.broadcast_to(1 + np.asarray(value_growth_rate, dtype=float), _year_shape(value_growth_rate, n_years))
+    value_end = np.asarray(purchase_price, dtype=float) * np.cumprod(growth, axis=-1)
+    value_start = np.concatenate(
+        [np.broadcast_to(purchase_price, value_end.shape[:-1] + (1,)), value_end[..., :-1]], axis=-1
+    )
+    return {"property_value_start": value_start, "property_value_end": value_end}
+
+
+def annuity_for(principal, interest_rate, years, annuity=np.nan) -> np.ndarray:
+    """Vectorized ``calc_annuity``; a non-NaN ``annuity`` overrides the computed value."""
+
+    principal = np.asarray(principal, dtype=float)
+    rate = np.asarray(interest_rate, dtype=float)
+    years = np.asarray(years, dtype=float)
+    safe_rate = np.where(rate == 0, 1.0, rate)
+    computed = np.where(rate == 0, principal / years, principal * (safe_rate / (1 - (1 + safe_rate) ** (-years))))
+    return np.where(np.isnan(annuity), computed, annuity)
+
+
+def loan_stage(loan_principal, loan_interest_rate, loan_years, loan_annuity, n_years: int) -> Columns:
+    """Annuity loan balance, interest and repayment per year in closed form.
+
+    The balance after ``k`` years is ``P*q**k - A*(q**k - 1)/r`` with ``q = 1 + r``.
+    Like the year loop it replaces, the balance is not clamped at zero.
+    """
+
+    principal = np.asarray(loan_principal, dtype=float)
+    rate = np.asarray(loan_interest_rate, dtype=float)
+    annuity = annuity_for(principal, rate, loan_years, loan_annuity)
+
+    k = np.arange(n_years, dtype=float)
+    growth = (1 + rate) ** k
+    safe_rate = np.where(rate == 0, 1.0, rate)
+    growth_sum = np.where(rate == 0, k, (growth - 1) / safe_rate)
+
+    rest_start = principal * growth - annuity * growth_sum
+    interest = rest_start * rate
+    repayment = annuity - interest
+    rest_end = rest_start - repayment
+
+    return {
+        "loan_rest_start": rest_start,
+        "loan_rest_end": rest_end,
+        "annuity_annual": np.broadcast_to(annuity, rest_start.shape),
+        "interest_paid": interest,
+        "principal_paid": repayment,
+    }
+
+
+def rent_stage(
+    net_cold_rent_month,
+    operating_costs_month,
+    mgmt_costs_annual,
+    rent_increase_rate,
+    rent_increase_interval_years,
+    n_years: int,
+) -> Columns:
+    """Rent progression for every simulation year.
+
+    Per-scenario increase rates go through ``rent_for_year``; per-year rates
+    (e.g. stochastic paths) compound the rate of every increase year.
+    """
+
+    year_index = np.arange(n_years)
+    interval = np.asarray(rent_increase_interval_years).astype(np.int64)
+    rate = np.asarray(rent_increase_rate, dtype=float)
+    if n_years > 1 and rate.shape and rate.shape[-1] == n_years:
+        increase_year = (year_index > 0) & (year_index % interval == 0)
+        factor = np.cumprod(np.where(increase_year, 1 + rate, 1.0), axis=-1)
+        net_cold_month = np.asarray(net_cold_rent_month, dtype=float) * factor
+        warm_month = net_cold_month + operating_costs_month
+        warm_year = warm_month * 12
     else:
-        annuity = lp.annuity
-
-    years = []
-    prop_value_start = []
-    prop_value_end = []
-    equity_start = []
-    equity_end = []
-
-    loan_rest_start = []
-    loan_rest_end = []
-    interest_paid = []
-    principal_paid = []
-    annuity_annual = []
-
-    net_cold_month_list = []
-    warm_month_list = []
-    warm_year_list = []
-    mgmt_costs_annual_list = []
-
-    depreciation_annual = []
-    depreciation_cum = []
-    taxable_income = []
-    taxes = []
-    cf_operating = []
-    cf_after_tax = []
-
-    value_start = pp.purchase_price
-    rest = lp.principal
-    cum_depr = 0.0
-
-    for i in range(params.n_years):
-        year = params.start_year + i
-
-        growth = value_start * pp.value_growth_rate
-        value_end = value_start + growth
-
-        equity0 = value_start - rest
-
-        new_rest, interest, repayment = amortization_step(rest, lp.interest_rate, annuity)
-
-        net_cold_month, warm_month, warm_year = rent_for_year(rp, i)
-        mgmt_costs = rp.mgmt_costs_annual
-
-        cf_op = warm_year - mgmt_costs - interest - repayment
-
-        depr_year = pp.depreciation_basis * pp.depreciation_rate
-        cum_depr += depr_year
-
-        taxable = warm_year - mgmt_costs - interest - depr_year
-        tax = max(taxable, 0) * params.tax_rate
-
-        cf_net = cf_op - tax
-
-        equity1 = value_end - new_rest
-
-        years.append(year)
-
-        prop_value_start.append(value_start)
-        prop_value_end.append(value_end)
-        equity_start.append(equity0)
-        equity_end.append(equity1)
-
-        loan_rest_start.append(rest)
-        loan_rest_end.append(new_rest)
-        interest_paid.append(interest)
-        principal_paid.append(repayment)
-        annuity_annual.append(annuity)
-
-        net_cold_month_list.append(net_cold_month)
-        warm_month_list.append(warm_month)
-        warm_year_list.append(warm_year)
-        mgmt_costs_annual_list.append(mgmt_costs)
-
-        depreciation_annual.append(depr_year)
-        depreciation_cum.append(cum_depr)
-        taxable_income.append(taxable)
-        taxes.append(tax)
-        cf_operating.append(cf_op)
-        cf_after_tax.append(cf_net)
-
-        value_start = value_end
-        rest = new_rest
-
-    records = []
-    for idx in range(len(years)):
-        records.append(
-            {
-                "year": years[idx],
-                "property_value_start": prop_value_start[idx],
-                "property_value_end": prop_value_end[idx],
-                "equity_start": equity_start[idx],
-                "equity_end": equity_end[idx],
-                "loan_rest_start": loan_rest_start[idx],
-                "loan_rest_end": loan_rest_end[idx],
-                "annuity_annual": annuity_annual[idx],
-                "interest_paid": interest_paid[idx],
-                "principal_paid": principal_paid[idx],
-                "net_cold_rent_month": net_cold_month_list[idx],
-                "warm_rent_month": warm_month_list[idx],
-                "warm_rent_year": warm_year_list[idx],
-                "mgmt_costs_annual": mgmt_costs_annual_list[idx],
-                "depreciation_annual": depreciation_annual[idx],
-                "depreciation_cum": depreciation_cum[idx],
-                "taxable_income": taxable_income[idx],
-                "taxes": taxes[idx],
-                "cashflow_operating": cf_operating[idx],
-                "cashflow_after_tax": cf_after_tax[idx],
-            }
+        params = RentParams(
+            net_cold_rent_month=np.asarray(net_cold_rent_month, dtype=float),
+            operating_costs_month=np.asarray(operating_costs_month, dtype=float),
+            mgmt_costs_annual=np.asarray(mgmt_costs_annual, dtype=float),
+            rent_increase_rate=rate,
+            rent_increase_interval_years=interval,
         )
+        net_cold_month, warm_month, warm_year = rent_for_year(params, year_index)
+
+    return {
+        "net_cold_rent_month": net_cold_month,
+        "warm_rent_month": warm_month,
+        "warm_rent_year": warm_year,
+        "mgmt_costs_annual": np.broadcast_to(np.asarray(mgmt_costs_annual, dtype=float), net_cold_month.shape),
+    }
+
+
+def depreciation_stage(depreciation_basis, depreciation_rate, n_years: int) -> Columns:
+    """Linear depreciation (AfA) per year and cumulated."""
+
+    annual = np.asarray(depreciation_basis, dtype=float) * depreciation_rate
+    annual = np.broadcast_to(annual, _year_shape(annual, n_years))
+    return {"depreciation_annual": annual, "depreciation_cum": np.cumsum(annual, axis=-1)}
+
+
+def cashflow_stage(value: Columns, loan: Columns, rent: Columns, depreciation: Columns, tax_rate) -> Columns:
+    """Equity, taxes and cash flows from the other stages' columns."""
+
+    warm_year = rent["warm_rent_year"]
+    mgmt_costs = rent["mgmt_costs_annual"]
+    interest = loan["interest_paid"]
+
+    cf_op = warm_year - mgmt_costs - interest - loan["principal_paid"]
+    taxable = warm_year - mgmt_costs - interest - depreciation["depreciation_annual"]
+    tax = np.maximum(taxable, 0) * tax_rate
+
+    return {
+        "equity_start": value["property_value_start"] - loan["loan_rest_start"],
+        "equity_end": value["property_value_end"] - loan["loan_rest_end"],
+        "taxable_income": taxable,
+        "taxes": tax,
+        "cashflow_operating": cf_op,
+        "cashflow_after_tax": cf_op - tax,
+    }
+
+
+def _year_shape(value, n_years: int) -> tuple:
+    shape = np.shape(value)
+    if shape and shape[-1] == n_years:
+        return shape
+    return shape[:-1] + (n_years,) if shape else (n_years,)
+
+
+# ---------- ENGINE ----------
+
+
+def simulate_inputs(
+    inputs: Mapping[str, object], start_year: int, n_years: int, loan: Optional[Columns] = None
+) -> Columns:
+    """Run all stages for flat ``INPUT_FIELDS`` values.
+
+    Inputs may be scalars or arrays of a common batch shape ``S``; every
+    returned column (except ``year``) then has shape ``S + (n_years,)``.
+    Precomputed ``loan`` columns (e.g. from the monthly loan engine) replace
+    the yearly loan stage.
+    """
+
+    x = {name: np.asarray(inputs[name], dtype=float)[..., None] for name in INPUT_FIELDS}
+
+    value = value_stage(x["purchase_price"], x["value_growth_rate"], n_years)
+    if loan is None:
+        loan = loan_stage(x["loan_principal"], x["loan_interest_rate"], x["loan_years"], x["loan_annuity"], n_years)
+    rent = rent_stage(
+        x["net_cold_rent_month"],
+        x["operating_costs_month"],
+        x["mgmt_costs_annual"],
+        x["rent_increase_rate"],
+        x["rent_increase_interval_years"],
+        n_years,
+    )
+    depreciation = depreciation_stage(x["depreciation_basis"], x["depreciation_rate"], n_years)
+    cashflow = cashflow_stage(value, loan, rent, depreciation, x["tax_rate"])
+
+    return _assemble_columns(start_year, n_years, value, loan, rent, depreciation, cashflow)
+
+
+def _assemble_columns(start_year: int, n_years: int, *stages: Columns) -> Columns:
+    merged: Columns = {"year": start_year + np.arange(n_years)}
+    for stage in stages:
+        merged.update(stage)
+    shape = np.broadcast_shapes(*(column.shape for column in merged.values()))
+    return {
+        name: merged[name] if name == "year" else np.broadcast_to(merged[name], shape)
+        for name in RECORD_FIELDS
+    }
+
+
+def simulate_columns(params: SimulationParams) -> Columns:
+    """Run the rental property simulation and return one array per record field.
+
+    Loans with ``LoanParams.monthly`` set go through ``monthly_loan_stage``.
+    """
+
+    loan = monthly_loan_stage(params.loan_params, params.n_years) if params.loan_params.monthly else None
+    return simulate_inputs(simulation_inputs(params), params.start_year, params.n_years, loan=loan)
+
+
+def simulate_batch(params: SimulationParams, **overrides) -> Columns:
+    """Simulate a batch of scenarios derived from ``params``.
+
+    Each keyword names an ``INPUT_FIELDS`` entry and gives an array of values;
+    all overrides broadcast to a common batch shape ``S`` and every column
+    has shape ``S + (n_years,)``. Loans with ``LoanParams.monthly`` set go
+    through ``monthly_loan_stage`` with the overridden loan inputs.
+    """
+
+    unknown = set(overrides) - set(INPUT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown simulation inputs: {sorted(unknown)}")
+
+    inputs = simulation_inputs(params)
+    inputs.update(overrides)
+    loan = None
+    if params.loan_params.monthly:
+        loan = monthly_loan_stage(
+            params.loan_params,
+            params.n_years,
+            principal=inputs["loan_principal"],
+            interest_rate=inputs["loan_interest_rate"],
+            years=inputs["loan_years"],
+            annuity=inputs["loan_annuity"],
+        )
+    return simulate_inputs(inputs, params.start_year, params.n_years, loan=loan)
+
+
+def simulate_sweep(
+    params: SimulationParams, ranges: Mapping[str, Sequence[float]], chunk_size: int = SWEEP_CHUNK_SIZE
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """Simulate every combination of the given parameter values.
+
+    ``ranges`` maps ``INPUT_FIELDS`` names to the values to sweep. Returns
+    ``(axes, summary)``: the value axes in the order given and one
+    ``summarize_columns`` metric array per field with shape
+    ``tuple(len(axis) for axis in axes)``. Combinations are simulated
+    ``chunk_size`` at a time to bound memory. Inputs are set through
+    ``input_overrides``, so a swept purchase price keeps the buyer's equity.
+    """
+
+    axes = {name: np.asarray(values, dtype=float).ravel() for name, values in ranges.items()}
+    shape = tuple(len(axis) for axis in axes.values())
+    grids = [grid.ravel() for grid in np.meshgrid(*axes.values(), indexing="ij")]
+    total = int(np.prod(shape))
+
+    summary: Dict[str, np.ndarray] = {}
+    for start in range(0, total, chunk_size):
+        chunk = slice(start, min(start + chunk_size, total))
+        values = {name: grid[chunk] for name, grid in zip(axes, grids)}
+        columns = simulate_batch(params, **input_overrides(params, values))
+        for metric, values in summarize_columns(columns).items():
+            summary.setdefault(metric, np.empty(total))[chunk] = values
+
+    return axes, {metric: values.reshape(shape) for metric, values in summary.items()}
+
+
+def columns_to_records(columns: Columns) -> List[dict]:
+    """Convert single-scenario columns into the list-of-dicts record format."""
+
+    fields = [name for name in RECORD_FIELDS if name in columns]
+    values = [columns[name].tolist() for name in fields]
+    return [dict(zip(fields, row)) for row in zip(*values)]
+
+
+def simulate(params: SimulationParams) -> List[dict]:
+    """Run the rental property simulation and return yearly records."""
+
+    return columns_to_records(simulate_columns(params))
+
+
+def summarize_columns(columns: Columns) -> Dict[str, np.ndarray]:
+    """Summary metrics per scenario (reduced over the trailing year axis)."""
 
-    return records
+    return {
+        "cashflow_year1": columns["cashflow_operating"][..., 0],
+        "cashflow_after_tax_year1": columns["cashflow_after_tax"][..., 0],
+        "warm_rent_year1": columns["warm_rent_year"][..., 0],
+        "taxes_year1": columns["taxes"][..., 0],
+        "equity_final": columns["equity_end"][..., -1],
+        "property_value_final": columns["property_value_end"][..., -1],
+        "loan_rest_final": columns["loan_rest_end"][..., -1],
+        "total_taxes": columns["taxes"].sum(axis=-1),
+        "total_operating_cashflow": columns["cashflow_operating"].sum(axis=-1),
+        "total_cashflow_after_tax": columns["cashflow_after_tax"].sum(axis=-1),
+    }
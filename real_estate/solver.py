@@ -0,0 +1,205 @@
+"""Goal-seek solver on top of the columnar rental simulation.
+
+Answers questions like "which cold rent makes the year-1 after-tax cash flow
+zero?" by finding the value of one input for which a ``summarize_columns``
+metric hits a target. A vectorized grid evaluation brackets the first sign
+change; safeguarded Newton iterations then refine it, each iteration being a
+single ``simulate_batch`` call for the point and its finite-difference partner.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .models import SimulationParams
+from .simulation import (
+    INPUT_FIELDS,
+    INTEGER_INPUTS,
+    annuity_for,
+    input_overrides,
+    simulate_batch,
+    simulation_inputs,
+    summarize_columns,
+)
+
+SOLVER_GRID_POINTS = 33
+SOLVER_MAX_ITERATIONS = 50
+SOLVER_TOLERANCE = 0.005
+
+# Derived variable: the buyer's own funds, total cost minus loan principal.
+EQUITY = "equity"
+
+# Whole-number inputs cannot be solved for continuously.
+SOLVER_VARIABLES = tuple(name for name in INPUT_FIELDS if name not in INTEGER_INPUTS) + (EQUITY,)
+SOLVER_METRICS = (
+    "cashflow_year1",
+    "cashflow_after_tax_year1",
+    "warm_rent_year1",
+    "taxes_year1",
+    "equity_final",
+    "property_value_final",
+    "loan_rest_final",
+    "total_taxes",
+    "total_operating_cashflow",
+    "total_cashflow_after_tax",
+)
+
+
+@dataclass
+class SolveResult:
+    """Outcome and convergence diagnostics of a goal-seek run.
+
+    ``evaluations`` counts batched engine calls, ``scenarios`` the simulated
+    scenarios across them. ``bracket`` is the final interval known to contain
+    the solution (or the search interval if none was found).
+    """
+
+    variable: str
+    metric: str
+    target: float
+    value: float
+    metric_value: float
+    converged: bool
+    iterations: int
+    evaluations: int
+    scenarios: int
+    bracket: Tuple[float, float]
+    message: str
+
+
+def base_value(params: SimulationParams, variable: str) -> float:
+    """Current value of ``variable`` in ``params``."""
+
+    inputs = simulation_inputs(params)
+    if variable == EQUITY:
+        return _total_cost(inputs) - inputs["loan_principal"]
+    if variable == "loan_annuity" and np.isnan(inputs["loan_annuity"]):
+        return float(annuity_for(inputs["loan_principal"], inputs["loan_interest_rate"], inputs["loan_years"]))
+    return float(inputs[variable])
+
+
+def default_bounds(params: SimulationParams, variable: str) -> Tuple[float, float]:
+    """Search interval used when the caller gives none."""
+
+    if variable == EQUITY:
+        return 0.0, _total_cost(simulation_inputs(params))
+    base = base_value(params, variable)
+    if variable.endswith("_rate") or variable == "transaction_cost_factor":
+        return min(base, 0.0), max(1.0, base)
+    return min(base, 0.0), max(4 * abs(base), 1.0)
+
+
+def _total_cost(inputs: Dict[str, float]) -> float:
+    return inputs["purchase_price"] * (1 + inputs["transaction_cost_factor"])
+
+
+def variable_overrides(params: SimulationParams, variable: str, values: np.ndarray) -> Dict[str, np.ndarray]:
+    """``simulate_batch`` overrides that set ``variable`` to each of ``values``.
+
+    Inputs go through ``input_overrides``; ``equity`` changes the loan
+    principal at a fixed total cost.
+    """
+
+    if variable == EQUITY:
+        return {"loan_principal": _total_cost(simulation_inputs(params)) - values}
+    return input_overrides(params, {variable: values})
+
+
+def solve(
+    params: SimulationParams,
+    variable: str,
+    metric: str = "cashflow_after_tax_year1",
+    target: float = 0.0,
+    lower: Optional[float] = None,
+    upper: Optional[float] = None,
+    tolerance: float = SOLVER_TOLERANCE,
+    max_iterations: int = SOLVER_MAX_ITERATIONS,
+    grid_points: int = SOLVER_GRID_POINTS,
+) -> SolveResult:
+    """Find the value of ``variable`` for which ``metric`` equals ``target``.
+
+    The interval ``[lower, upper]`` is scanned on a grid of ``grid_points``
+    values and the first sign change of ``metric - target`` is refined until
+    the metric is within ``tolerance`` of the target. Metrics are linear or
+    piecewise linear in most inputs, so Newton usually needs one or two steps.
+    """
+
+    if variable not in SOLVER_VARIABLES:
+        raise ValueError(f"Cannot solve for {variable!r}.")
+    if metric not in SOLVER_METRICS:
+        raise ValueError(f"Unknown metric {metric!r}.")
+
+    default_lower, default_upper = default_bounds(params, variable)
+    lower = default_lower if lower is None else float(lower)
+    upper = default_upper if upper is None else float(upper)
+    if not lower < upper:
+        raise ValueError("Lower bound must be below the upper bound.")
+
+    calls = {"evaluations": 0, "scenarios": 0}
+
+    def residual(values) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        calls["evaluations"] += 1
+        calls["scenarios"] += values.size
+        columns = simulate_batch(params, **variable_overrides(params, variable, values))
+        return summarize_columns(columns)[metric] - target
+
+    def result(value, value_residual, converged, iterations, bracket, message) -> SolveResult:
+        return SolveResult(
+            variable=variable,
+            metric=metric,
+            target=target,
+            value=float(value),
+            metric_value=float(value_residual + target),
+            converged=converged,
+            iterations=iterations,
+            evaluations=calls["evaluations"],
+            scenarios=calls["scenarios"],
+            bracket=(float(bracket[0]), float(bracket[1])),
+            message=message,
+        )
+
+    grid = np.linspace(lower, upper, max(grid_points, 2))
+    grid_residual = residual(grid)
+    finite = np.isfinite(grid_residual)
+    close = np.flatnonzero(finite & (np.abs(grid_residual) <= tolerance))
+    crossings = np.flatnonzero(
+        finite[:-1] & finite[1:] & (np.signbit(grid_residual[:-1]) != np.signbit(grid_residual[1:]))
+    )
+
+    if close.size and (not crossings.size or close[0] <= crossings[0]):
+        index = close[0]
+        return result(grid[index], grid_residual[index], True, 0, (grid[index], grid[index]), "Solved on the grid.")
+    if not crossings.size:
+        if not finite.any():
+            return result(np.nan, np.nan, False, 0, (lower, upper), "Metric is not finite in the search interval.")
+        index = int(np.nanargmin(np.abs(np.where(finite, grid_residual, np.nan))))
+        return result(
+            grid[index], grid_residual[index], False, 0, (lower, upper), "No sign change in the search interval."
+        )
+
+    index = crossings[0]
+    a, b = grid[index], grid[index + 1]
+    fa, fb = grid_residual[index], grid_residual[index + 1]
+    x = a - fa * (b - a) / (fb - fa)
+    x_tolerance = 1e-12 * max(abs(lower), abs(upper), 1.0)
+
+    for iteration in range(1, max_iterations + 1):
+        step = 1e-6 * max(abs(x), 1.0)
+        fx, fx_step = residual([x, x + step])
+        if abs(fx) <= tolerance:
+            return result(x, fx, True, iteration, (a, b), "Converged.")
+
+        if np.signbit(fx) == np.signbit(fa):
+            a, fa = x, fx
+        else:
+            b, fb = x, fx
+        if b - a <= x_tolerance:
+            return result(x, fx, False, iteration, (a, b), "Bracket collapsed above the tolerance (discontinuity).")
+
+        slope = (fx_step - fx) / step
+        newton = x - fx / slope if slope and np.isfinite(slope) else np.nan
+        x = newton if a < newton < b else (a + b) / 2
+
+    fx = residual([x])[0]
+    return result(x, fx, abs(fx) <= tolerance, max_iterations, (a, b), "Iteration limit reached.")
@@ -0,0 +1,136 @@
+"""Grid index for radius and nearest-neighbour queries on coordinates.
+
+Points are bucketed into cells of roughly ``cell_km`` by ``cell_km`` at the
+equator and sorted by cell key. A radius query turns the circle's bounding
+box into one contiguous key range per cell row (two where it wraps around
+the antimeridian). It looks up all ranges with a single vectorized
+``searchsorted`` and keeps the candidates whose haversine distance is within
+the radius. The cost depends on the number of points near the query, not on
+the size of the index.
+"""
+import math
+from typing import Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+DEFAULT_CELL_KM = 2.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in km; arguments in degrees, broadcast against each other."""
+
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=float)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def destination_point(latitude, longitude, distance_km, bearing_deg) -> Tuple[np.ndarray, np.ndarray]:
+    """Point reached from ``latitude``/``longitude`` along a great circle (bearing 0 = north)."""
+
+    lat1, lon1, bearing = (np.radians(np.asarray(value, dtype=float)) for value in (latitude, longitude, bearing_deg))
+    angle = np.asarray(distance_km, dtype=float) / EARTH_RADIUS_KM
+    lat2 = np.arcsin(np.sin(lat1) * np.cos(angle) + np.cos(lat1) * np.sin(angle) * np.cos(bearing))
+    lon2 = lon1 + np.arctan2(
+        np.sin(bearing) * np.sin(angle) * np.cos(lat1), np.cos(angle) - np.sin(lat1) * np.sin(lat2)
+    )
+    return np.degrees(lat2), (np.degrees(lon2) + 540) % 360 - 180
+
+
+def _gather(order: np.ndarray, starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Concatenate ``order[start:stop]`` for all ranges without a Python loop."""
+
+    lengths = np.maximum(stops - starts, 0)
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=order.dtype)
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return order[offsets + np.arange(total)]
+
+
+class GridIndex:
+    """Static spatial index over ``latitude``/``longitude`` arrays in degrees."""
+
+    def __init__(self, latitude, longitude, cell_km: float = DEFAULT_CELL_KM):
+        self.latitude = np.asarray(latitude, dtype=float)
+        self.longitude = np.asarray(longitude, dtype=float)
+        self.cell_km = cell_km
+        self.cell_lat = cell_km / KM_PER_DEGREE
+        self.n_rows = int(math.floor(180 / self.cell_lat)) + 1
+        # Whole number of columns so that wrapped longitudes map onto the same cells.
+        self.n_cols = int(math.ceil(360 / self.cell_lat))
+        self.cell_lon = 360 / self.n_cols
+
+        keys = self._row(self.latitude) * self.n_cols + self._col(self.longitude) % self.n_cols
+        self._order = np.argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+
+    def __len__(self) -> int:
+        return len(self.latitude)
+
+    def _row(self, latitude) -> np.ndarray:
+        rows = np.floor((np.asarray(latitude, dtype=float) + 90) / self.cell_lat).astype(np.int64)
+        return np.clip(rows, 0, self.n_rows - 1)
+
+    def _col(self, longitude) -> np.ndarray:
+        """Unwrapped column index; reduce modulo ``n_cols`` for the cell."""
+
+        return np.floor((np.asarray(longitude, dtype=float) + 180) / self.cell_lon).astype(np.int64)
+
+    def _candidates(self, latitude: float, longitude: float, radius_km: float) -> np.ndarray:
+        """Positions of all points in cells overlapping the circle's bounding box."""
+
+        radius_deg = radius_km / KM_PER_DEGREE
+        rows = np.arange(self._row(latitude - radius_deg) - 1, self._row(latitude + radius_deg) + 2)
+        rows = rows[(rows >= 0) & (rows < self.n_rows)]
+
+        # Largest longitude offset of any point of the spherical cap.
+        sin_ratio = math.sin(math.radians(min(radius_deg, 180.0))) / max(math.cos(math.radians(latitude)), 1e-12)
+        if abs(latitude) + radius_deg >= 90 or radius_deg >= 90 or sin_ratio >= 1:
+            first, last = 0, self.n_cols - 1
+        else:
+            half_width = math.degrees(math.asin(sin_ratio))
+            first = int(self._col(longitude - half_width)) - 1
+            last = int(self._col(longitude + half_width)) + 1
+            if last - first + 1 >= self.n_cols:
+                first, last = 0, self.n_cols - 1
+
+        if first < 0:
+            spans = [(0, last), (first + self.n_cols, self.n_cols - 1)]
+        elif last >= self.n_cols:
+            spans = [(first, self.n_cols - 1), (0, last - self.n_cols)]
+        else:
+            spans = [(first, last)]
+
+        base = rows * self.n_cols
+        starts = np.concatenate([np.searchsorted(self._keys, base + low, side="left") for low, _ in spans])
+        stops = np.concatenate([np.searchsorted(self._keys, base + high, side="right") for _, high in spans])
+        return _gather(self._order, starts, stops)
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions and distances of all points within ``radius_km``, nearest first.
+
+        Ties in distance keep index order.
+        """
+
+        candidates = self._candidates(latitude, longitude, max(radius_km, 0.0))
+        distances = haversine_km(latitude, longitude, self.latitude[candidates], self.longitude[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.lexsort((candidates, distances))
+        return candidates[order], distances[order]
+
+    def nearest(self, latitude: float, longitude: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions and distances of the ``k`` nearest points, nearest first."""
+
+        k = min(max(int(k), 0), len(self))
+        # Half the circumference reaches every point and still maps to valid cell rows.
+        max_radius_km = math.pi * EARTH_RADIUS_KM
+        radius_km = self.cell_km
+        while True:
+            radius_km = min(radius_km, max_radius_km)
+            rows, distances = self.within(latitude, longitude, radius_km)
+            if len(rows) >= k or radius_km >= max_radius_km:
+                return rows[:k], distances[:k]
+            radius_km *= 2
@@ -20,6 +20,49 @@
     return `${value.toFixed(2)} %`;
   }
 
+  const CURVE_STEP = 1000;
+
+  function findSegment(segments, x) {
+    return segments.find((segment) => x >= segment.lower && (segment.upper === null || x <= segment.upper));
+  }
+
+  function evaluateCurve(curve, zve) {
+    const factor = curve.splitting_factor || 1;
+    const x = Math.floor(zve / factor);
+    const segment = findSegment(curve.segments, x);
+    if (!segment || zve <= 0) {
+      return { zve, avg_rate: 0, marginal_rate: 0 };
+    }
+
+    const [c0, c1, c2] = segment.coefficients;
+    const t = (x - segment.origin) / segment.scale;
+    const est = factor * ((c2 * t + c1) * t + c0);
+    const marginal = ((2 * c2 * t + c1) / segment.scale) * 100;
+    return { zve, avg_rate: (est / zve) * 100, marginal_rate: marginal };
+  }
+
+  // Expand the piecewise curve from /api/tax into chart points; knots are
+  // included so the bends of the tariff are drawn exactly.
+  function sampleCurve(curve) {
+    if (Array.isArray(curve)) return curve;
+    if (!curve || !Array.isArray(curve.segments)) return [];
+
+    const factor = curve.splitting_factor || 1;
+    const incomes = new Set();
+    for (let income = 0; income <= curve.max_zve; income += CURVE_STEP) {
+      incomes.add(income);
+    }
+    incomes.add(curve.max_zve);
+    curve.segments.forEach((segment) => {
+      const knot = segment.lower * factor;
+      if (knot <= curve.max_zve) incomes.add(knot);
+    });
+
+    return Array.from(incomes)
+      .sort((a, b) => a - b)
+      .map((income) => evaluateCurve(curve, income));
+  }
+
   function buildChart(curve = [], currentZve = 0, avgRate = 0, marginalRate = 0) {
     if (!chartCanvas || typeof Chart === 'undefined') return;
 
@@ -166,13 +209,14 @@
     }
 
     try {
-      const response = await fetch('/api/tax', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ zve, filing_status: filingStatus, partner_zve: 0 }),
+      // GET lets the browser revalidate repeated calculations via ETag (304).
+      const params = new URLSearchParams({
+        zve: String(zve),
+        filing_status: filingStatus,
+        partner_zve: '0',
+        curve_format: 'piecewise',
       });
+      const response = await fetch(`/api/tax?${params.toString()}`);
 
       if (!response.ok) {
         throw new Error('Fehler bei der Berechnung.');
@@ -183,7 +227,7 @@
       avgRateEl.textContent = formatPercentage(data.avg_rate);
       marginalRateEl.textContent = formatPercentage(data.marginal_rate);
 
-      buildChart(data.curve, data.zve, data.avg_rate, data.marginal_rate);
+      buildChart(sampleCurve(data.curve), data.zve, data.avg_rate, data.marginal_rate);
       window.userDataStore?.save?.({
         zve,
         filing_status: filingStatus,
@@ -5,6 +5,40 @@ Flask views and tested in isolation.
 """
 from typing import Tuple
 
+import numpy as np
+
+# Obere Grenzen der Tarifzonen nach § 32a Abs. 1 EStG 2026 (volle Euro).
+ZONE_LIMITS_2026 = (12_348, 17_799, 69_878, 277_825)
+
+# Koeffizienten der Tarifzonen:
+#   Zone 2: (a*y + b)*y,       y = (zvE - 12.348)/10.000
+#   Zone 3: (a*z + b)*z + c,   z = (zvE - 17.799)/10.000
+#   Zone 4/5: rate*zvE - offset
+ZONE2_COEFFS_2026 = (914.51, 1_400.0)
+ZONE3_COEFFS_2026 = (173.1, 2_397.0, 1_034.87)
+ZONE4_COEFFS_2026 = (0.42, 11_135.63)
+ZONE5_COEFFS_2026 = (0.45, 19_470.38)
+ZONE_SCALE_2026 = 10_000
+
+_LIMIT1, _LIMIT2, _LIMIT3, _LIMIT4 = ZONE_LIMITS_2026
+
+# Optional whole-euro lookup table (see ``tax_calculations.lookup``). When set,
+# est_2026 and _marginal_rate read rows ``[est, marginal_rate]`` from it for
+# zvE values within ``0..ceiling``.
+_lookup_table = None
+
+
+def set_lookup_table(table):
+    """Route the scalar helpers through ``table``; ``None`` restores the formula.
+
+    Returns the previously active table.
+    """
+
+    global _lookup_table
+    previous = _lookup_table
+    _lookup_table = table
+    return previous
+
 
 def est_2026(zve: float) -> float:
     """
@@ -18,34 +52,47 @@ def est_2026(zve: float) -> float:
     """
     x = int(zve)  # auf volle Euro abrunden
 
-    if x <= 12_348:
+    table = _lookup_table
+    if table is not None and 0 <= x <= table.ceiling:
+        return table.values.item(x, 0)
+
+    if x <= _LIMIT1:
         return 0.0
 
-    if x <= 17_799:
-        y = (x - 12_348) / 10_000
-        return (914.51 * y + 1_400.0) * y
+    if x <= _LIMIT2:
+        a, b = ZONE2_COEFFS_2026
+        y = (x - _LIMIT1) / ZONE_SCALE_2026
+        return (a * y + b) * y
 
-    if x <= 69_878:
-        z = (x - 17_799) / 10_000
-        return (173.1 * z + 2_397.0) * z + 1_034.87
+    if x <= _LIMIT3:
+        a, b, c = ZONE3_COEFFS_2026
+        z = (x - _LIMIT2) / ZONE_SCALE_2026
+        return (a * z + b) * z + c
 
-    if x <= 277_825:
-        return 0.42 * x - 11_135.63
+    if x <= _LIMIT4:
+        rate, offset = ZONE4_COEFFS_2026
+        return rate * x - offset
 
-    return 0.45 * x - 19_470.38
+    rate, offset = ZONE5_COEFFS_2026
+    return rate * x - offset
 
 
 def _marginal_rate(zve: float) -> float:
     x = int(zve)
-    if x <= 12_348:
+    table = _lookup_table
+    if table is not None and 0 <= x <= table.ceiling:
+        return table.values.item(x, 1)
+    if x <= _LIMIT1:
         return 0.0
-    if x <= 17_799:
-        y = (x - 12_348) / 10_000
-        return (2 * 914.51 * y + 1_400.0) / 10_000 * 100
-    if x <= 69_878:
-        z = (x - 17_799) / 10_000
-        return (2 * 173.1 * z + 2_397.0) / 10_000 * 100
-    if x <= 277_825:
+    if x <= _LIMIT2:
+        a, b = ZONE2_COEFFS_2026
+        y = (x - _LIMIT1) / ZONE_SCALE_2026
+        return (2 * a * y + b) / ZONE_SCALE_2026 * 100
+    if x <= _LIMIT3:
+        a, b, _ = ZONE3_COEFFS_2026
+        z = (x - _LIMIT2) / ZONE_SCALE_2026
+        return (2 * a * z + b) / ZONE_SCALE_2026 * 100
+    if x <= _LIMIT4:
         return 42.0
     return 45.0
 
@@ -89,3 +136,211 @@ def tax_rates_married(zve1: float, zve2: float) -> Tuple[float, float, float]:
     avg_rate = est / total_income * 100
     marginal = _marginal_rate(total_income / 2.0)
     return est, avg_rate, marginal
+
+
+# ---------- ARRAY API ----------
+#
+# The functions below mirror the scalar helpers above for NumPy arrays. They
+# evaluate every bracket with the same operations in the same order, so each
+# element is bit-identical to the corresponding scalar result.
+
+
+def _whole_euros(zve) -> np.ndarray:
+    """Truncate zvE values towards zero like ``int(zve)``."""
+
+    return np.trunc(np.asarray(zve, dtype=float))
+
+
+def est_2026_array(zve) -> np.ndarray:
+    """Vectorized :func:`est_2026` for an array of zvE values."""
+
+    x = _whole_euros(zve)
+
+    a2, b2 = ZONE2_COEFFS_2026
+    y = (x - _LIMIT1) / ZONE_SCALE_2026
+    zone2 = (a2 * y + b2) * y
+
+    a3, b3, c3 = ZONE3_COEFFS_2026
+    z = (x - _LIMIT2) / ZONE_SCALE_2026
+    zone3 = (a3 * z + b3) * z + c3
+
+    rate4, offset4 = ZONE4_COEFFS_2026
+    rate5, offset5 = ZONE5_COEFFS_2026
+
+    return np.select(
+        [x <= _LIMIT1, x <= _LIMIT2, x <= _LIMIT3, x <= _LIMIT4],
+        [0.0, zone2, zone3, rate4 * x - offset4],
+        default=rate5 * x - offset5,
+    )
+
+
+def marginal_rate_array(zve) -> np.ndarray:
+    """Vectorized :func:`_marginal_rate` (in %) for an array of zvE values."""
+
+    x = _whole_euros(zve)
+
+    a2, b2 = ZONE2_COEFFS_2026
+    y = (x - _LIMIT1) / ZONE_SCALE_2026
+    zone2 = (2 * a2 * y + b2) / ZONE_SCALE_2026 * 100
+
+    a3, b3, _ = ZONE3_COEFFS_2026
+    z = (x - _LIMIT2) / ZONE_SCALE_2026
+    zone3 = (2 * a3 * z + b3) / ZONE_SCALE_2026 * 100
+
+    return np.select(
+        [x <= _LIMIT1, x <= _LIMIT2, x <= _LIMIT3, x <= _LIMIT4],
+        [0.0, zone2, zone3, 42.0],
+        default=45.0,
+    )
+
+
+def est_2026_married_array(zve1, zve2) -> np.ndarray:
+    """Vectorized :func:`est_2026_married` for arrays of partner incomes."""
+
+    total = np.asarray(zve1, dtype=float) + np.asarray(zve2, dtype=float)
+    return 2.0 * est_2026_array(total / 2.0)
+
+
+def tax_rates_single_array(zve) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized :func:`tax_rates_single`.
+
+    Returns arrays of (est, avg_rate, marginal_rate) with the shape of ``zve``.
+    """
+
+    x = _whole_euros(zve)
+    est = est_2026_array(x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_rate = np.where(x > 0, est / x * 100, 0.0)
+    marginal = marginal_rate_array(x)
+    return est, avg_rate, marginal
+
+
+def tax_rates_married_array(zve1, zve2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized :func:`tax_rates_married` (Splittingtarif).
+
+    ``zve1`` and ``zve2`` are broadcast against each other.
+    """
+
+    zve1 = np.asarray(zve1, dtype=float)
+    zve2 = np.asarray(zve2, dtype=float)
+    total_income = np.maximum(zve1 + zve2, 0.0)
+    positive = total_income > 0
+
+    est = np.where(positive, est_2026_married_array(zve1, zve2), 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_rate = np.where(positive, est / total_income * 100, 0.0)
+    marginal = np.where(positive, marginal_rate_array(total_income / 2.0), 0.0)
+    return est, avg_rate, marginal
+
+
+def splitting_surface(zve_values, partner_zve_values) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Splitting tax versus two single assessments over a grid of both incomes.
+
+    Returns ``(married_est, separate_est, advantage)`` as matrices of shape
+    ``(len(zve_values), len(partner_zve_values))``. ``separate_est`` is the
+    sum of ``tax_rates_single`` for each partner and ``advantage`` is
+    ``separate_est - married_est`` (the Splittingvorteil).
+    """
+
+    zve_values = np.asarray(zve_values, dtype=float)
+    partner_zve_values = np.asarray(partner_zve_values, dtype=float)
+
+    married_est, _, _ = tax_rates_married_array(zve_values[:, None], partner_zve_values[None, :])
+    single_est, _, _ = tax_rates_single_array(zve_values)
+    partner_single_est, _, _ = tax_rates_single_array(partner_zve_values)
+    separate_est = single_est[:, None] + partner_single_est[None, :]
+    return married_est, separate_est, separate_est - married_est
+
+
+# ---------- TAX CURVE PAYLOADS ----------
+
+DEFAULT_CURVE_MAX_INCOME = 300_000
+DEFAULT_CURVE_STEP = 1_000.0
+
+
+def tariff_segments_2026() -> list[dict]:
+    """Describe the Grundtarif as polynomial segments over whole-euro zvE.
+
+    Each segment covers ``lower <= x <= upper`` (``upper`` is ``None`` for the
+    last zone) and evaluates ``t = (x - origin) / scale`` and
+    ``est = (c2 * t + c1) * t + c0`` with ``coefficients = [c0, c1, c2]``.
+    The marginal rate in percent is ``(2 * c2 * t + c1) / scale * 100``.
+    """
+
+    a2, b2 = ZONE2_COEFFS_2026
+    a3, b3, c3 = ZONE3_COEFFS_2026
+    rate4, offset4 = ZONE4_COEFFS_2026
+    rate5, offset5 = ZONE5_COEFFS_2026
+
+    return [
+        {"lower": 0, "upper": _LIMIT1, "origin": 0, "scale": 1, "coefficients": [0.0, 0.0, 0.0]},
+        {
+            "lower": _LIMIT1 + 1,
+            "upper": _LIMIT2,
+            "origin": _LIMIT1,
+            "scale": ZONE_SCALE_2026,
+            "coefficients": [0.0, b2, a2],
+        },
+        {
+            "lower": _LIMIT2 + 1,
+            "upper": _LIMIT3,
+            "origin": _LIMIT2,
+            "scale": ZONE_SCALE_2026,
+            "coefficients": [c3, b3, a3],
+        },
+        {"lower": _LIMIT3 + 1, "upper": _LIMIT4, "origin": 0, "scale": 1, "coefficients": [-offset4, rate4, 0.0]},
+        {"lower": _LIMIT4 + 1, "upper": None, "origin": 0, "scale": 1, "coefficients": [-offset5, rate5, 0.0]},
+    ]
+
+
+def curve_max_income(max_income: float) -> float:
+    """Upper bound of the plotted curve: the income, but at least 300.000 €."""
+
+    return max(max_income, DEFAULT_CURVE_MAX_INCOME)
+
+
+def tax_curve_piecewise(filing_status: str, max_income: float) -> dict:
+    """Return the tax curve as bracket knots plus polynomial coefficients.
+
+    For ``"married"`` the Splittingtarif applies: evaluate the segments at
+    ``x = floor(zve / splitting_factor)`` and multiply the est by
+    ``splitting_factor``.
+    """
+
+    return {
+        "format": "piecewise",
+        "max_zve": curve_max_income(max_income),
+        "splitting_factor": 2 if filing_status == "married" else 1,
+        "segments": tariff_segments_2026(),
+    }
+
+
+def tax_curve_points(filing_status: str, max_income: float, step: float = DEFAULT_CURVE_STEP) -> list[dict]:
+    """Sample the tax curve into ``{zve, est, avg_rate, marginal_rate}`` points.
+
+    Points are spaced ``step`` apart from 0 up to :func:`curve_max_income`;
+    the upper bound is appended when it is not a multiple of ``step``.
+    """
+
+    capped_income = curve_max_income(max_income)
+    incomes = np.arange(int(capped_income // step) + 1) * step
+    if capped_income % step != 0:
+        # Ensure the upper bound is included for consistent chart lines
+        incomes = np.append(incomes, capped_income)
+
+    if filing_status == "married":
+        est, avg_rate, marginal_rate = tax_rates_married_array(incomes, 0.0)
+    else:
+        est, avg_rate, marginal_rate = tax_rates_single_array(incomes)
+
+    return [
+        {
+            "zve": round(income, 2),
+            "est": round(est_point, 2),
+            "avg_rate": round(avg_point, 2),
+            "marginal_rate": round(marginal_point, 2),
+        }
+        for income, est_point, avg_point, marginal_point in zip(
+            incomes.tolist(), est.tolist(), avg_rate.tolist(), marginal_rate.tolist()
+        )
+    ]
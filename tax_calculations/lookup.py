@@ -0,0 +1,145 @@
+"""Precomputed whole-euro lookup table for the 2026 income tax.
+
+``est_2026`` truncates the zvE to full euros, so the tariff has a finite
+domain at euro resolution. :class:`TaxLookupTable` stores est and marginal
+rate for every euro from 0 up to a ceiling in a ``.npy`` file that is opened
+memory-mapped, so all worker processes share the same pages. Incomes above the
+ceiling fall back to the closed-form formula.
+
+Typical use at process start::
+
+    from tax_calculations.lookup import enable_lookup_table
+    enable_lookup_table("/var/cache/finanzresilienz/est_2026.npy")
+"""
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from tax_calculations import (
+    ZONE_LIMITS_2026,
+    _marginal_rate,
+    est_2026,
+    est_2026_array,
+    marginal_rate_array,
+    set_lookup_table,
+)
+
+DEFAULT_CEILING = 500_000
+
+PathLike = Union[str, os.PathLike]
+
+
+class TaxLookupTable:
+    """Whole-euro table of (est, marginal_rate) rows for zvE 0..ceiling."""
+
+    def __init__(self, values: np.ndarray):
+        if values.ndim != 2 or values.shape[1] != 2 or values.dtype != np.float64:
+            raise ValueError("Lookup table must be a float64 array of shape (n, 2).")
+        self.values = values
+        self.ceiling = len(values) - 1
+
+    @classmethod
+    def build(cls, ceiling: int = DEFAULT_CEILING) -> "TaxLookupTable":
+        """Compute the table in memory for zvE 0..ceiling."""
+
+        if ceiling < 0:
+            raise ValueError("Ceiling must be >= 0.")
+        incomes = np.arange(ceiling + 1, dtype=float)
+        values = np.empty((ceiling + 1, 2), dtype=np.float64)
+        values[:, 0] = est_2026_array(incomes)
+        values[:, 1] = marginal_rate_array(incomes)
+        return cls(values)
+
+    @classmethod
+    def load(cls, path: PathLike) -> "TaxLookupTable":
+        """Open a previously saved table read-only and memory-mapped."""
+
+        # A plain ndarray view over the mapping avoids np.memmap's per-index overhead.
+        return cls(np.asarray(np.load(path, mmap_mode="r")))
+
+    @classmethod
+    def open(cls, path: PathLike, ceiling: int = DEFAULT_CEILING) -> "TaxLookupTable":
+        """Load the table at ``path``, (re)building it if missing or stale."""
+
+        try:
+            table = cls.load(path)
+        except (OSError, ValueError):
+            table = None
+
+        if table is None or table.ceiling != ceiling or not table._matches_formula():
+            cls.build(ceiling).save(path)
+            table = cls.load(path)
+        return table
+
+    def save(self, path: PathLike) -> None:
+        """Write the table atomically so concurrent readers never see a partial file."""
+
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                np.save(tmp_file, np.ascontiguousarray(self.values))
+            os.replace(tmp_name, target)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    def _matches_formula(self) -> bool:
+        """Spot-check the zone boundaries against the closed-form tariff."""
+
+        probes = np.array(
+            [x + offset for x in ZONE_LIMITS_2026 for offset in (0, 1)] + [self.ceiling],
+            dtype=float,
+        )
+        probes = probes[probes <= self.ceiling]
+        rows = self.values[probes.astype(np.int64)]
+        return bool(
+            np.array_equal(rows[:, 0], est_2026_array(probes))
+            and np.array_equal(rows[:, 1], marginal_rate_array(probes))
+        )
+
+    # ---------- LOOKUPS ----------
+
+    def est(self, zve: float) -> float:
+        x = int(zve)
+        if 0 <= x <= self.ceiling:
+            return self.values.item(x, 0)
+        return est_2026(x)
+
+    def marginal_rate(self, zve: float) -> float:
+        x = int(zve)
+        if 0 <= x <= self.ceiling:
+            return self.values.item(x, 1)
+        return _marginal_rate(x)
+
+    def est_array(self, zve) -> np.ndarray:
+        return self._lookup_array(zve, 0, est_2026_array)
+
+    def marginal_rate_array(self, zve) -> np.ndarray:
+        return self._lookup_array(zve, 1, marginal_rate_array)
+
+    def _lookup_array(self, zve, column: int, formula) -> np.ndarray:
+        x = np.trunc(np.asarray(zve, dtype=float))
+        in_range = (x >= 0) & (x <= self.ceiling)
+        result = np.empty(x.shape, dtype=float)
+        result[in_range] = self.values[x[in_range].astype(np.int64), column]
+        result[~in_range] = formula(x[~in_range])
+        return result
+
+
+def enable_lookup_table(path: PathLike, ceiling: int = DEFAULT_CEILING) -> TaxLookupTable:
+    """Open (or build) the table at ``path`` and route the scalar tax helpers through it."""
+
+    table = TaxLookupTable.open(path, ceiling)
+    set_lookup_table(table)
+    return table
+
+
+def disable_lookup_table() -> Optional[TaxLookupTable]:
+    """Switch the scalar tax helpers back to the closed-form formula."""
+
+    return set_lookup_table(None)
@@ -0,0 +1,123 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app import app  # noqa: E402
+from tax_calculations import tax_rates_married, tax_rates_single  # noqa: E402
+
+
+def test_tax_endpoint_supports_conditional_get():
+    client = app.test_client()
+
+    first = client.get("/api/tax?zve=55555&filing_status=single&curve_format=piecewise")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    second = client.get(
+        "/api/tax?zve=55555&filing_status=single&curve_format=piecewise",
+        headers={"If-None-Match": etag},
+    )
+    assert second.status_code == 304
+
+    posted = client.post("/api/tax", json={"zve": 55555, "curve_format": "piecewise"})
+    assert posted.headers["ETag"] == etag
+    assert posted.get_json() == first.get_json()
+
+
+def test_tax_endpoint_rejects_non_finite_income():
+    client = app.test_client()
+
+    for query in ("zve=inf", "zve=nan", "zve=1000&partner_zve=inf&filing_status=married"):
+        response = client.get(f"/api/tax?{query}")
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+
+def test_tax_bulk_endpoint_streams_ndjson_results():
+    client = app.test_client()
+    body = "\n".join(
+        [
+            '{"id": "a", "zve": 55555}',
+            '{"id": "b", "zve": 40000, "partner_zve": 30000, "filing_status": "married"}',
+            "42",
+        ]
+    )
+
+    response = client.post("/api/tax/bulk", data=body, content_type="application/x-ndjson")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert lines[0]["id"] == "a" and lines[0]["est"] == round(tax_rates_single(55555)[0], 2)
+    assert lines[1]["est"] == round(tax_rates_married(40000, 30000)[0], 2)
+    assert "error" in lines[2]
+
+    as_array = client.post("/api/tax/bulk", json=[{"zve": 55555}])
+    assert json.loads(as_array.get_data(as_text=True))["est"] == lines[0]["est"]
+
+
+def test_tax_bulk_endpoint_reports_non_finite_incomes_per_line():
+    client = app.test_client()
+    body = '{"zve": NaN}\n{"zve": "inf"}\n{"zve": 1000, "partner_zve": Infinity, "filing_status": "married"}\n{"zve": 1000}'
+
+    response = client.post("/api/tax/bulk", data=body, content_type="application/x-ndjson")
+
+    text = response.get_data(as_text=True)
+    assert "NaN" not in text and "Infinity" not in text
+    lines = [json.loads(line, parse_constant=lambda token: pytest.fail(token)) for line in text.splitlines()]
+    assert [line["index"] for line in lines] == [0, 1, 2, 3]
+    assert all("error" in line for line in lines[:3])
+    assert lines[3]["zve"] == 1000.0
+
+
+def test_splitting_surface_endpoint_returns_matrix_for_axes():
+    client = app.test_client()
+
+    response = client.post(
+        "/api/tax/splitting-surface",
+        json={"zve_max": 100_000, "zve_step": 25_000, "partner_zve_max": 50_000, "partner_zve_points": 3},
+    )
+
+    data = response.get_json()
+    assert data["zve"] == [0.0, 25_000.0, 50_000.0, 75_000.0, 100_000.0]
+    assert data["partner_zve"] == [0.0, 25_000.0, 50_000.0]
+    assert len(data["advantage"]) == 5 and len(data["advantage"][0]) == 3
+    assert data["max_advantage"] == max(max(row) for row in data["advantage"])
+
+
+@pytest.mark.parametrize(
+    "axes",
+    [
+        {"zve_max": "inf", "zve_step": 1000},
+        {"zve_min": "nan", "zve_points": 5},
+        {"partner_zve_max": float("inf")},
+        {"partner_zve_step": "-inf"},
+    ],
+)
+def test_splitting_surface_endpoint_rejects_non_finite_axes(axes):
+    client = app.test_client()
+
+    response = client.post("/api/tax/splitting-surface", json=axes)
+
+    assert response.status_code == 400
+    assert "endliche Zahlen" in response.get_json()["error"]
+
+
+def test_splitting_surface_endpoint_ignores_overflowing_point_counts():
+    client = app.test_client()
+
+    response = client.post(
+        "/api/tax/splitting-surface",
+        data='{"zve_max": 1000, "zve_points": Infinity, "partner_zve_points": 2}',
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    assert len(response.get_json()["zve"]) == 61
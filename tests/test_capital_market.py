@@ -1,8 +1,12 @@
 import math
+import os
 import random
 import sys
 from pathlib import Path
 
+import numpy as np
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
@@ -12,6 +16,15 @@ from capital_market import (
     _serialize_property_with_mortgage,
     build_property_payload,
 )
+from capital_market.backtest import PriceStore, backtest_savings_plan, rolling_savings_plan
+from capital_market.models import simulate_market_investment, simulate_market_products
+from capital_market.rent_vs_buy import crossover_year, etf_wealth, rent_vs_buy_columns
+from capital_market.monte_carlo import MarketMonteCarloParams, simulate_market_monte_carlo
+from controllers.market import run_backtest, run_comparison, run_monte_carlo
+from real_estate.finance import _unit_balances
+from real_estate.models import LoanParams, PropertyParams, SelfUsedPropertyInvestment
+from real_estate.monte_carlo import Distribution
+from real_estate.monthly_loan import MonthlyLoanOptions
 
 
 def test_build_property_payload_contains_mortgage_details():
@@ -50,6 +63,32 @@ def test_build_property_payload_contains_mortgage_details():
     assert first["estimated_rent_per_sqm"] >= 0
 
 
+def test_build_property_payload_respects_true_radius():
+    payload = build_property_payload(
+        latitude=60.0,
+        longitude=10.0,
+        radius=2.0,
+        min_price=0,
+        max_price=2_000_000,
+        min_size=0,
+        max_size=1_000,
+        min_rooms=1,
+        max_rooms=10,
+        interest_rate=0.02,
+        initial_tilgung_rate=0.03,
+        available_assets=0,
+        additional_cost_rate=0.1,
+        rng=random.Random(5),
+        sort_by_distance=True,
+    )
+
+    distances = [entry["distance_km"] for entry in payload]
+    assert len(payload) == 30
+    assert distances == sorted(distances)
+    assert max(distances) <= 2.0
+    assert max(abs(entry["longitude"] - 10.0) for entry in payload) > 2.0 / 111.2
+
+
 def test_serialize_property_with_mortgage_calculations():
     prop = Property(
         identifier="test-prop",
@@ -81,3 +120,325 @@ def test_serialize_property_with_mortgage_calculations():
         expected_total_price * (0.02 + 0.03) / 12,
         rel_tol=1e-6,
     )
+
+
+def test_build_property_payload_with_monthly_loan_engine():
+    common = dict(
+        latitude=52.52,
+        longitude=13.405,
+        radius=1.0,
+        min_price=0,
+        max_price=2_000_000,
+        min_size=0,
+        max_size=1_000,
+        min_rooms=1,
+        max_rooms=10,
+        interest_rate=0.035,
+        initial_tilgung_rate=0.02,
+        available_assets=50_000,
+        additional_cost_rate=0.1,
+    )
+    options = MonthlyLoanOptions(fixed_rate_years=10, follow_up_interest_rate=0.045, special_repayment_rate=0.05)
+
+    yearly = build_property_payload(**common, rng=random.Random(3))
+    monthly = build_property_payload(**common, rng=random.Random(3), loan_options=options)
+
+    assert [p["identifier"] for p in monthly] == [p["identifier"] for p in yearly]
+    for plain, detailed in zip(yearly, monthly):
+        assert detailed["mortgage_monthly_rate"] == plain["mortgage_monthly_rate"]
+        assert detailed["mortgage_years"] < plain["mortgage_years"]
+        assert detailed["mortgage_remaining_after_fixed_rate"] > 0
+        assert detailed["mortgage_special_repayment_total"] > 0
+
+
+def test_build_property_payload_schedules_share_one_cached_run():
+    common = dict(
+        latitude=52.52,
+        longitude=13.405,
+        radius=1.0,
+        min_price=0,
+        max_price=2_000_000,
+        min_size=0,
+        max_size=1_000,
+        min_rooms=1,
+        max_rooms=10,
+        interest_rate=0.035,
+        initial_tilgung_rate=0.02,
+        available_assets=50_000,
+        additional_cost_rate=0.1,
+    )
+    _unit_balances.cache_clear()
+
+    plain = build_property_payload(**common, rng=random.Random(3))
+    detailed = build_property_payload(**common, rng=random.Random(3), include_schedule=True)
+
+    assert len(detailed) > 1
+    assert _unit_balances.cache_info().misses == 1
+    for summary, prop in zip(plain, detailed):
+        schedule = prop["mortgage_schedule"]
+        assert "mortgage_schedule" not in summary
+        assert len(schedule) == prop["mortgage_years"] == summary["mortgage_years"]
+        assert prop["mortgage_total_interest"] == pytest.approx(summary["mortgage_total_interest"], abs=0.01)
+        assert sum(row["principal_paid"] for row in schedule) == pytest.approx(prop["mortgage_loan_amount"], abs=1.0)
+        assert schedule[-1]["remaining_principal"] == 0.0
+
+
+def test_simulate_market_products_matches_yearly_loop():
+    returns = [0.144, 0.0, -0.05, 0.067]
+
+    values = simulate_market_products(returns, 25_000, 3_600, 40)
+
+    assert values.shape == (4, 40)
+    for expected_return, path in zip(returns, values):
+        reference, _ = simulate_market_investment("", "", expected_return, 25_000, 3_600, 40)
+        assert path.tolist() == pytest.approx(reference, rel=1e-12)
+
+
+def test_simulate_market_products_is_accurate_for_tiny_returns():
+    values = simulate_market_products([1e-12, -1e-12], 0, 1_000, 30)
+
+    assert values[:, -1] == pytest.approx([1_000 * 30 + 1_000 * 465e-12, 1_000 * 30 - 1_000 * 465e-12], rel=1e-15)
+
+
+def test_run_comparison_returns_one_series_per_product():
+    products = [{"name": "A", "isin": "X1", "return": "0.05"}, {"name": "B", "isin": "X2", "return": None}]
+
+    result = run_comparison({"available_wealth": 1_000, "yearly_savings": 100, "years": 5}, products)
+
+    assert [entry["product"]["name"] for entry in result["products"]] == ["A", "B"]
+    assert result["products"][1]["final_value"] == pytest.approx(1_500)
+    assert len(result["products"][0]["timeseries"]) == 5
+    assert result["invested_amount"] == 1_500
+    custom = run_comparison({"products": [{"name": "C", "return": 0.1}], "years": 2}, products)
+    assert [entry["product"]["name"] for entry in custom["products"]] == ["C"]
+    assert "error" in run_comparison({"products": []}, products)
+    for expected_return in ("abc", "nan", -1, [0.05]):
+        assert "error" in run_comparison({"products": [{"name": "D", "return": expected_return}]}, products)
+    for amounts in ({"available_wealth": "inf"}, {"yearly_savings": float("nan")}, {"available_wealth": "-inf"}):
+        assert "error" in run_comparison({"years": 5, **amounts}, products)
+
+
+def test_market_monte_carlo_is_reproducible_and_centered_on_closed_form():
+    mc = MarketMonteCarloParams(
+        Distribution("lognormal", mean=0.07, std=0.15), n_paths=20_000, seed=7, target_wealth=250_000
+    )
+
+    result = simulate_market_monte_carlo(10_000, 3_600, 40, mc)
+    again = simulate_market_monte_carlo(10_000, 3_600, 40, mc)
+
+    expected = simulate_market_products(0.07, 10_000, 3_600, 40)
+    assert result["bands"]["mean"] == pytest.approx(expected, rel=0.02)
+    assert np.array_equal(result["bands"]["p50"], again["bands"]["p50"])
+    assert np.all(np.diff(result["shortfall"]["below_invested"][5:]) <= 0.01)
+    assert 0 < result["shortfall"]["below_target"][-1] < 1
+    assert np.all(result["bands"]["p5"] <= result["bands"]["p95"])
+
+
+def test_market_monte_carlo_without_volatility_is_deterministic():
+    mc = MarketMonteCarloParams(Distribution("lognormal", mean=0.05, std=0.0), n_paths=100, seed=1)
+
+    result = simulate_market_monte_carlo(1_000, 100, 10, mc)
+
+    expected = simulate_market_products(0.05, 1_000, 100, 10)
+    assert result["bands"]["p50"] == pytest.approx(expected)
+    assert result["shortfall"]["below_invested"].tolist() == [0.0] * 10
+
+
+def test_run_monte_carlo_uses_product_volatility():
+    products = [{"name": "A", "isin": "X1", "return": "0.06", "volatility": "0.2"}]
+    payload = {"available_wealth": 5_000, "yearly_savings": 1_200, "years": 30, "monte_carlo": {"n_paths": 2_000, "seed": 3}}
+
+    result = run_monte_carlo(payload, products)
+
+    assert result["product"]["volatility"] == 0.2
+    assert len(result["bands"]["p50"]) == 30
+    assert len(result["shortfall"]["below_invested"]) == 30
+    assert result == run_monte_carlo(payload, products)
+
+
+def test_run_monte_carlo_keeps_zero_volatility_and_rejects_invalid_inputs():
+    products = [{"name": "A", "isin": "X1", "return": "0.05", "volatility": 0}]
+    payload = {"available_wealth": 1_000, "yearly_savings": 100, "years": 5, "monte_carlo": {"n_paths": 10, "seed": 1}}
+
+    result = run_monte_carlo(payload, products)
+    assert result["product"]["volatility"] == 0.0
+    assert result["bands"]["p5"] == result["bands"]["p95"]
+
+    for expected_return in (-1, -1.5, "nan"):
+        assert "error" in run_monte_carlo(payload, [{**products[0], "return": expected_return}])
+    assert "error" in run_monte_carlo({**payload, "available_wealth": "inf"}, products)
+    assert "error" in run_monte_carlo({**payload, "yearly_savings": "nan"}, products)
+    assert "error" in run_monte_carlo({**payload, "product_index": 1}, products)
+    assert "error" in run_monte_carlo({**payload, "product_index": -1}, products)
+
+
+def _write_prices(path, dates, closes):
+    lines = ["date,close"] + [f"{date},{close}" for date, close in zip(dates, closes)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_price_store_memory_maps_month_end_closes(tmp_path):
+    dates = np.arange(np.datetime64("2001-01-01"), np.datetime64("2004-01-01"))
+    closes = 100 + np.arange(len(dates)) * 0.1
+    _write_prices(tmp_path / "DE0000000001.csv", dates[::-1], closes[::-1])
+    store = PriceStore(tmp_path)
+
+    stored_dates, stored_closes = store.load("DE0000000001")
+    months, monthly = store.monthly("DE0000000001")
+
+    assert isinstance(stored_closes, np.memmap)
+    assert np.all(np.diff(stored_dates) > np.timedelta64(0, "D"))
+    assert len(months) == 36
+    assert str(months[1]) == "2001-02"
+    assert monthly[1] == pytest.approx(closes[dates.tolist().index(np.datetime64("2001-02-28").item())])
+    assert store.isins() == ["DE0000000001"]
+
+
+def test_rolling_savings_plan_matches_per_start_loop():
+    rng = np.random.default_rng(5)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0.005, 0.04, 300)))
+
+    finals = rolling_savings_plan(prices, 10_000, 1_200, 10)
+
+    assert finals.shape == (300 - 120,)
+    for start in (0, 17, len(finals) - 1):
+        units = 10_000 / prices[start] + sum(1_200 / prices[start + 12 * year] for year in range(10))
+        assert finals[start] == pytest.approx(units * prices[start + 120], rel=1e-12)
+
+
+def test_backtest_with_constant_growth_matches_closed_form():
+    months = np.arange(np.datetime64("1990-01"), np.datetime64("2020-01"))
+    prices = 1.05 ** (np.arange(len(months)) / 12)
+
+    summary = backtest_savings_plan(months, prices, 10_000, 3_600, horizons=(10, 40))
+
+    assert list(summary) == [10]
+    expected = simulate_market_products(0.05, 10_000, 3_600, 10)[-1]
+    for outcome in ("worst", "median", "best"):
+        assert summary[10][outcome]["final_value"] == pytest.approx(expected, rel=1e-9)
+    assert summary[10]["windows"] == len(months) - 120
+    assert summary[10]["shortfall_probability"] == 0.0
+
+
+def test_price_store_rebuilds_both_columns_in_one_file(tmp_path):
+    source = tmp_path / "DE0000000001.csv"
+    _write_prices(source, ["2000-01-03", "2000-01-04"], [10.0, 11.0])
+    store = PriceStore(tmp_path, tmp_path / "columns")
+    store.load("DE0000000001")
+
+    _write_prices(source, ["2000-01-03", "2000-01-04", "2000-01-05"], [10.0, 11.0, 12.0])
+    stored_mtime = (tmp_path / "columns" / "DE0000000001.npy").stat().st_mtime_ns
+    os.utime(source, ns=(stored_mtime + 1, stored_mtime + 1))
+    dates, closes = store.load("DE0000000001")
+
+    assert len(dates) == len(closes) == 3
+    assert closes.tolist() == [10.0, 11.0, 12.0]
+    assert sorted(path.name for path in (tmp_path / "columns").iterdir()) == ["DE0000000001.npy"]
+
+
+def test_run_backtest_summarizes_every_isin(tmp_path):
+    dates = np.arange(np.datetime64("2000-01-01"), np.datetime64("2012-01-01"), 7)
+    _write_prices(tmp_path / "DE0000000001.csv", dates, np.linspace(50, 150, len(dates)))
+    _write_prices(tmp_path / "DE0000000002.csv", dates, np.linspace(150, 50, len(dates)))
+    store = PriceStore(tmp_path, tmp_path / "columns")
+
+    result = run_backtest({"yearly_savings": 1_000, "horizons": [5, 10, 50]}, store)
+
+    assert set(result["results"]) == {"DE0000000001", "DE0000000002"}
+    assert set(result["results"]["DE0000000001"]["horizons"]) == {"5", "10"}
+    assert result["results"]["DE0000000002"]["horizons"]["5"]["shortfall_probability"] == 1.0
+    assert "error" in run_backtest({"isin": "DE0000000003"}, store)
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"horizons": [float("inf")]},
+        {"horizons": [float("nan")]},
+        {"horizons": [2.7]},
+        {"horizons": ["2.7"]},
+        {"horizons": [99, 101]},
+        {"horizons": [0]},
+        {"horizons": []},
+        {"available_wealth": "inf"},
+        {"yearly_savings": float("nan")},
+    ],
+)
+def test_run_backtest_rejects_invalid_horizons_and_amounts(tmp_path, overrides):
+    dates = np.arange(np.datetime64("2000-01-01"), np.datetime64("2004-01-01"), 7)
+    _write_prices(tmp_path / "DE0000000001.csv", dates, np.linspace(50, 150, len(dates)))
+    store = PriceStore(tmp_path, tmp_path / "columns")
+
+    payload = {"yearly_savings": 1_000, "horizons": [1, 2.0, "3"]}
+
+    assert set(run_backtest(payload, store)["results"]["DE0000000001"]["horizons"]) == {"1", "2", "3"}
+    assert "error" in run_backtest({**payload, **overrides}, store)
+
+
+def test_run_backtest_rejects_paths_and_broken_files(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    _write_prices(outside / "secret.csv", ["2000-01-01"], [1.0])
+    prices = tmp_path / "prices"
+    prices.mkdir()
+    (prices / "DE0000000001.csv").write_text("date,close\nnot-a-date,abc\n", encoding="utf-8")
+    store = PriceStore(prices)
+
+    for isin in (str(outside / "secret"), "../outside/secret", "de0000000001"):
+        assert "error" in run_backtest({"isin": isin}, store)
+        with pytest.raises(KeyError):
+            store.load(isin)
+    assert not list(outside.glob("*.npy"))
+    assert "error" in run_backtest({"isin": "DE0000000001"}, store)
+
+
+def _home(rent=1_400.0, holding_years=35):
+    return SelfUsedPropertyInvestment(
+        property_params=PropertyParams(
+            purchase_price=450_000,
+            transaction_cost_factor=0.105,
+            value_growth_rate=0.02,
+            depreciation_basis=0,
+            depreciation_rate=0,
+        ),
+        loan_params=LoanParams(principal=400_000, interest_rate=0.035, years=25),
+        imputed_rent_savings=rent,
+        maintenance_reserve_pct=0.01,
+        opportunity_cost_rate=0.05,
+        holding_years=holding_years,
+    )
+
+
+def test_etf_wealth_matches_monthly_installment_loop():
+    contributions = np.array([1_200.0, 0.0, 5_000.0, 2_400.0])
+
+    values = etf_wealth(10_000, contributions, 0.07)
+
+    value, monthly = 10_000.0, 1.07 ** (1 / 12)
+    for year, contribution in enumerate(contributions):
+        value = value * 1.07 + sum(contribution / 12 * monthly ** (12 - m) for m in range(12))
+        assert values[year] == pytest.approx(value, rel=1e-12)
+    assert etf_wealth(0, contributions, 0.0)[-1] == pytest.approx(contributions.sum())
+
+
+def test_rent_vs_buy_aligns_buyer_equity_with_projection():
+    home = _home()
+
+    columns = rent_vs_buy_columns(home, rent_increase_rate=0.02)
+
+    series = home.projection_series()
+    assert columns["property_value"] - columns["loan_balance"] == pytest.approx(series["equity"][1:], rel=1e-9)
+    assert columns["loan_balance"][-1] == 0.0
+    assert columns["owner_cost"][-1] == pytest.approx(4_500)
+    assert columns["renter_wealth"][0] > 450_000 * 1.105 - 400_000
+
+
+def test_rent_vs_buy_crossover_year():
+    cheap_rent = rent_vs_buy_columns(_home(rent=800.0), rent_increase_rate=0.0, etf_return=0.08)
+    expensive_rent = rent_vs_buy_columns(_home(rent=2_500.0), rent_increase_rate=0.03, etf_return=0.03)
+
+    assert crossover_year(cheap_rent) is None
+    year = crossover_year(expensive_rent)
+    assert year is not None
+    assert np.all(expensive_rent["wealth_difference"][year - 1 :] >= 0)
+    assert year == 1 or expensive_rent["wealth_difference"][year - 2] < 0
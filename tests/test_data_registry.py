@@ -0,0 +1,69 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from data_registry import DataFileRegistry, FrozenDict  # noqa: E402
+
+
+def _counting_registry(directory, check_interval=0.0):
+    calls = []
+
+    def loader(raw):
+        calls.append(raw)
+        return json.loads(raw)
+
+    return DataFileRegistry(directory, check_interval=check_interval, loader=loader), calls
+
+
+def test_registry_parses_once_and_freezes(tmp_path):
+    (tmp_path / "products.json").write_text('[{"name": "A", "tags": ["x"]}]', encoding="utf-8")
+    registry, calls = _counting_registry(tmp_path)
+
+    first = registry.get("products.json")
+    assert registry.get("products.json") is first
+    assert len(calls) == 1
+    assert first == ({"name": "A", "tags": ("x",)},)
+    assert isinstance(first[0], FrozenDict)
+    with pytest.raises(TypeError):
+        first[0]["name"] = "B"
+    assert json.loads(json.dumps(first)) == [{"name": "A", "tags": ["x"]}]
+    assert registry.get("missing.json", ()) == ()
+
+
+def test_registry_reparses_only_when_content_changes(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('{"value": 1}', encoding="utf-8")
+    registry, calls = _counting_registry(tmp_path)
+    original = registry.get("data.json")
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert registry.get("data.json") is original
+    assert len(calls) == 1
+
+    path.write_text('{"value": 2}', encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert registry.get("data.json") == {"value": 2}
+    assert len(calls) == 2
+
+    path.write_text('{"value": ', encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 3 * 10**9))
+    assert registry.get("data.json") == {"value": 2}
+
+
+def test_registry_skips_checks_within_interval(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text('{"value": 1}', encoding="utf-8")
+    registry, calls = _counting_registry(tmp_path, check_interval=3600)
+    registry.get("data.json")
+
+    path.write_text('{"value": 22}', encoding="utf-8")
+    assert registry.get("data.json") == {"value": 1}
+    assert len(calls) == 1
@@ -0,0 +1,162 @@
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from real_estate.finance import _unit_balances, mortgage_schedule, mortgage_summary, scaled_mortgage_schedule  # noqa: E402
+from real_estate.monthly_loan import (  # noqa: E402
+    MonthlyLoanOptions,
+    monthly_installment,
+    monthly_loan_columns,
+    monthly_loan_summary,
+)
+
+
+@pytest.mark.parametrize(
+    "principal, interest_rate, tilgung_rate, max_years",
+    [
+        (330_000, 0.02, 0.03, 100),
+        (250_000, 0.0, 0.04, 100),
+        (100_000, 0.05, 1.5, 100),
+        (400_000, 0.06, 0.005, 30),
+        (0.5, 0.0, 0.014, 100),
+    ],
+)
+def test_mortgage_summary_matches_schedule(principal, interest_rate, tilgung_rate, max_years):
+    schedule, total_interest, total_paid = mortgage_schedule(principal, interest_rate, tilgung_rate, max_years)
+    years, summary_interest, summary_paid = mortgage_summary(principal, interest_rate, tilgung_rate, max_years)
+
+    assert years == len(schedule)
+    assert summary_interest == pytest.approx(total_interest, abs=0.005)
+    assert summary_paid == pytest.approx(total_paid, abs=0.005)
+
+
+def test_mortgage_summary_matches_schedule_on_random_inputs():
+    rng = random.Random(11)
+    for _ in range(2_000):
+        args = (
+            rng.uniform(1_000, 2_000_000),
+            round(rng.uniform(0, 0.08), 3),
+            round(rng.uniform(0.005, 0.1), 3),
+            rng.choice([100, 30, 10]),
+        )
+        schedule, total_interest, total_paid = mortgage_schedule(*args)
+        years, summary_interest, summary_paid = mortgage_summary(*args)
+        assert years == len(schedule)
+        assert summary_interest == pytest.approx(total_interest, abs=0.005)
+        assert summary_paid == pytest.approx(total_paid, abs=0.005)
+
+
+def test_mortgage_summary_rejects_invalid_rates():
+    with pytest.raises(ValueError):
+        mortgage_summary(100_000, 0.03, 0.0)
+    with pytest.raises(ValueError):
+        mortgage_summary(100_000, -0.01, 0.02)
+
+
+
+@pytest.mark.parametrize("principal", [0.5, 3.0, 99_999.99, 330_000, 1_750_000])
+def test_scaled_mortgage_schedule_matches_schedule(principal):
+    for interest_rate, tilgung_rate, max_years in [(0.02, 0.03, 100), (0.0, 0.014, 100), (0.05, 1.5, 100), (0.06, 0.005, 30)]:
+        schedule, total_interest, total_paid = mortgage_schedule(principal, interest_rate, tilgung_rate, max_years)
+        scaled, scaled_interest, scaled_paid = scaled_mortgage_schedule(principal, interest_rate, tilgung_rate, max_years)
+
+        assert len(scaled) == len(schedule)
+        for expected, actual in zip(schedule, scaled):
+            assert actual.year == expected.year
+            assert actual.interest_paid == pytest.approx(expected.interest_paid, abs=1e-6)
+            assert actual.principal_paid == pytest.approx(expected.principal_paid, abs=1e-6)
+            assert actual.remaining_principal == pytest.approx(expected.remaining_principal, abs=1e-6)
+        assert scaled_interest == pytest.approx(total_interest, abs=1e-6)
+        assert scaled_paid == pytest.approx(total_paid, abs=1e-6)
+
+
+def test_scaled_mortgage_schedule_shares_unit_schedule_across_principals():
+    _unit_balances.cache_clear()
+    for principal in (150_000, 275_000, 420_000):
+        scaled_mortgage_schedule(principal, 0.031, 0.027)
+
+    info = _unit_balances.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+
+
+def _monthly_reference(principal, rate, installment, n_years, fixed_years=None, follow_up_rate=None, special=0.0):
+    """Month-by-month loop the closed-form engine must reproduce."""
+
+    balance = principal
+    rows = []
+    for year in range(n_years):
+        if fixed_years is not None and year == fixed_years and follow_up_rate is not None:
+            rate = follow_up_rate
+        start, paid, interest, months = balance, 0.0, 0.0, 0
+        for _ in range(12):
+            if balance <= 0:
+                break
+            month_interest = balance * rate / 12
+            payment = min(installment, balance + month_interest)
+            balance += month_interest - payment
+            interest += month_interest
+            paid += payment
+            months += 1
+        balance -= min(special, balance)
+        if abs(balance) < 0.01:
+            balance = 0.0
+        rows.append((start, balance, paid, interest, months))
+    return np.array(rows).T
+
+
+@pytest.mark.parametrize(
+    "principal, rate, tilgung, fixed_years, follow_up_rate, special",
+    [
+        (330_000, 0.035, 0.02, None, None, 0.0),
+        (250_000, 0.0, 0.04, None, None, 0.0),
+        (480_000, 0.012, 0.03, 10, 0.045, 0.0),
+        (480_000, 0.038, 0.025, 15, 0.02, 24_000.0),
+        (90_000, 0.05, 0.5, None, None, 10_000.0),
+    ],
+)
+def test_monthly_loan_matches_month_by_month_loop(principal, rate, tilgung, fixed_years, follow_up_rate, special):
+    installment = float(monthly_installment(principal, rate, tilgung))
+    options = MonthlyLoanOptions(
+        fixed_rate_years=fixed_years, follow_up_interest_rate=follow_up_rate, special_repayment=special
+    )
+    columns = options.columns(principal, rate, installment, 60)
+    start, rest, paid, interest, months = _monthly_reference(
+        principal, rate, installment, 60, fixed_years, follow_up_rate, special
+    )
+
+    np.testing.assert_allclose(columns["loan_rest_start"], start, atol=1e-4)
+    np.testing.assert_allclose(columns["loan_rest_end"], rest, atol=1e-4)
+    np.testing.assert_allclose(columns["annuity_annual"], paid, atol=1e-4)
+    np.testing.assert_allclose(columns["interest_paid"], interest, atol=1e-4)
+    np.testing.assert_array_equal(columns["months_paid"], months)
+
+
+def test_monthly_loan_batch_matches_single_loans():
+    principals = np.array([120_000.0, 380_000.0, 760_000.0])
+    rates = np.array([0.0, 0.021, 0.043])
+    installment = monthly_installment(principals, rates, 0.03)
+    options = MonthlyLoanOptions(fixed_rate_years=10, follow_up_interest_rate=0.05, special_repayment_rate=0.05)
+
+    batch = options.columns(principals, rates, installment, 40)
+
+    for index in range(3):
+        single = options.columns(principals[index], rates[index], installment[index], 40)
+        for name, values in single.items():
+            np.testing.assert_allclose(batch[name][index], values)
+
+
+def test_monthly_loan_summary_totals():
+    columns = monthly_loan_columns(200_000.0, 0.03, 1_500.0, 40)
+    summary = monthly_loan_summary(columns)
+
+    assert summary["remaining"] == 0
+    assert summary["total_paid"] == pytest.approx(200_000.0 + summary["total_interest"])
+    assert summary["months"] == _monthly_reference(200_000.0, 0.03, 1_500.0, 40)[4].sum()
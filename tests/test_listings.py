@@ -0,0 +1,125 @@
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from capital_market import _generate_properties  # noqa: E402
+from real_estate.listings import ListingStore  # noqa: E402
+from real_estate.spatial import GridIndex, destination_point, haversine_km  # noqa: E402
+
+
+def _reference_query(properties, min_price, max_price, min_size, max_size, min_rooms, max_rooms):
+    matches = [
+        prop
+        for prop in properties
+        if min_price <= prop.price_eur <= max_price
+        and min_size <= prop.living_space_sqm <= max_size
+        and min_rooms <= prop.rooms <= max_rooms
+    ]
+    return sorted(matches, key=lambda prop: prop.price_eur, reverse=True)
+
+
+def test_listing_store_round_trips_properties():
+    properties = _generate_properties(200, 52.52, 13.405, 5.0, random.Random(1))
+    store = ListingStore.from_properties(properties)
+
+    assert len(store) == 200
+    assert store.properties(range(200)) == properties
+    assert not store.columns["price_eur"].flags.writeable
+
+
+def test_listing_store_range_filters_match_python_loop():
+    properties = _generate_properties(2_000, 52.52, 13.405, 5.0, random.Random(2))
+    properties += properties[:50]
+    store = ListingStore.from_properties(properties)
+    rng = random.Random(3)
+
+    for _ in range(50):
+        prices = sorted(rng.uniform(50_000, 1_600_000) for _ in range(2))
+        sizes = sorted(rng.uniform(30, 170) for _ in range(2))
+        rooms = sorted(rng.randint(0, 7) for _ in range(2))
+        bounds = (*prices, *sizes, *rooms)
+
+        rows = store.query(*bounds)
+
+        assert store.properties(rows) == _reference_query(properties, *bounds)
+
+
+def test_listing_store_sort_orders_and_candidates():
+    properties = _generate_properties(500, 52.52, 13.405, 5.0, random.Random(4))
+    store = ListingStore.from_properties(properties)
+    sizes = store.columns["living_space_sqm"]
+
+    by_size = store.query(min_rooms=2, sort_by="living_space_sqm", descending=False)
+    assert np.all(np.diff(sizes[by_size]) >= 0)
+    assert np.all(store.columns["rooms"][by_size] >= 2)
+    assert len(store.query()) == 500
+
+    subset = store.query(max_price=600_000, candidates=np.arange(100))
+    assert set(subset.tolist()) == {i for i in range(100) if properties[i].price_eur <= 600_000}
+
+
+def _brute_force(latitude, longitude, lats, lons, radius_km):
+    distances = haversine_km(latitude, longitude, lats, lons)
+    rows = np.flatnonzero(distances <= radius_km)
+    return rows[np.lexsort((rows, distances[rows]))], distances
+
+
+def test_grid_index_matches_brute_force_everywhere():
+    rng = np.random.default_rng(6)
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, 20_000)))
+    lons = rng.uniform(-180, 180, 20_000)
+    index = GridIndex(lats, lons, cell_km=100)
+
+    queries = [(52.52, 13.405, 300), (0.0, 179.9, 800), (-10.0, -179.95, 1_500), (89.7, 40.0, 400), (-45.0, 10.0, 25_000)]
+    queries += [(rng.uniform(-80, 80), rng.uniform(-180, 180), rng.uniform(10, 3_000)) for _ in range(30)]
+    for latitude, longitude, radius in queries:
+        expected, distances = _brute_force(latitude, longitude, lats, lons, radius)
+        rows, found = index.within(latitude, longitude, radius)
+        assert np.array_equal(rows, expected)
+        assert np.all(np.diff(found) >= 0)
+
+        nearest, _ = index.nearest(latitude, longitude, 7)
+        assert np.array_equal(nearest, np.lexsort((np.arange(len(lats)), distances))[:7])
+
+
+def test_grid_index_nearest_returns_all_points_spread_worldwide():
+    lats = np.array([52.5, -52.0, 0.0, 89.9, -89.9, 10.0])
+    lons = np.array([13.4, -166.0, 100.0, 0.0, 179.0, -179.9])
+    index = GridIndex(lats, lons)
+    assert len(index.nearest(52.5, 13.4, 3)[0]) == 3
+
+    rows, distances = index.nearest(52.5, 13.4, len(lats))
+    expected = haversine_km(52.5, 13.4, lats, lons)
+    assert np.array_equal(rows, np.argsort(expected, kind="stable"))
+    assert np.allclose(distances, np.sort(expected))
+
+
+def test_destination_point_travels_the_requested_distance():
+    lat, lon = destination_point(52.52, 13.405, [0.5, 5.0, 50.0], [0, 90, 225])
+
+    assert haversine_km(52.52, 13.405, lat, lon) == pytest.approx([0.5, 5.0, 50.0])
+    assert haversine_km(0, 0, 0, 1) == pytest.approx(111.195, rel=1e-4)
+
+
+def test_listing_store_radius_query_combines_with_filters():
+    properties = _generate_properties(3_000, 48.137, 11.575, 20.0, random.Random(8))
+    store = ListingStore.from_properties(properties)
+
+    nearby, distances = store.within(48.137, 11.575, 5.0)
+    rows = store.query(min_rooms=3, candidates=nearby)
+
+    assert np.all(distances <= 5.0) and np.all(np.diff(distances) >= 0)
+    expected = {
+        i
+        for i, prop in enumerate(properties)
+        if prop.rooms >= 3 and haversine_km(48.137, 11.575, prop.latitude, prop.longitude) <= 5.0
+    }
+    assert set(rows.tolist()) == expected
+    assert len(store.nearest(48.137, 11.575, 10)[0]) == 10
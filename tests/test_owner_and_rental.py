@@ -1,7 +1,10 @@
 import random
 
-from controllers.owner import average_price, average_rent, list_properties
-from controllers.rental import run_simulation
+import pytest
+
+from controllers.owner import average_price, average_rent, list_properties, run_projection, run_rent_vs_buy
+from controllers.rental import run_monte_carlo, run_simulation, run_solve, run_sweep
+from real_estate.incremental import default_simulator
 
 
 def test_owner_property_listing_includes_mortgage_details():
@@ -29,6 +32,29 @@ def test_owner_average_price_and_rent_are_positive():
     assert rent_summary["average_rent_per_sqm"] > 0
 
 
+def test_owner_projection_returns_yearly_series():
+    result = run_projection({"purchase_price": 500_000, "loan_principal": 400_000, "holding_years": 25})
+
+    assert len(result["series"]["equity"]) == 26
+    assert result["summary"]["projected_equity"] == result["series"]["equity"][-1]
+    assert result["series"]["remaining_balance"][0] == 400_000
+    assert "error" in run_projection({"holding_years": -1})
+    for invalid in ({"purchase_price": "nan"}, {"loan_principal": "inf"}, {"value_growth_rate": "-inf"}):
+        assert "error" in run_projection({"holding_years": 25, **invalid})
+
+
+def test_owner_rent_vs_buy_returns_aligned_wealth_curves():
+    result = run_rent_vs_buy({"imputed_rent_savings": 1_500, "etf_return": 0.05, "holding_years": 30})
+
+    assert len(result["series"]["buyer_wealth"]) == len(result["series"]["renter_wealth"]) == 30
+    assert result["series"]["year"] == list(range(1, 31))
+    assert result["summary"]["renter_wealth_final"] == result["series"]["renter_wealth"][-1]
+    assert "error" in run_rent_vs_buy({"holding_years": 0})
+
+    for invalid in ({"etf_return": -1}, {"etf_return": -1.5}, {"etf_return": "nan"}, {"purchase_price": "inf"}):
+        assert "error" in run_rent_vs_buy({"imputed_rent_savings": 1_500, **invalid})
+
+
 def test_rental_simulation_outputs_complete_payload():
     result = run_simulation({})
 
@@ -45,3 +71,89 @@ def test_rental_simulation_applies_taxation():
     first_record = result["records"][0]
 
     assert first_record["cashflow_after_tax"] < first_record["cashflow_operating"]
+
+
+@pytest.fixture
+def empty_stage_cache():
+    default_simulator.clear()
+    yield
+    default_simulator.clear()
+
+
+def test_rental_simulation_incremental_mode_matches_full_run(empty_stage_cache):
+    payload = {"purchase_price": 512_345.0, "tax_rate": 0.3, "incremental": True}
+
+    first = run_simulation(payload)
+    second = run_simulation({**payload, "tax_rate": 0.42})
+
+    assert first["recomputed_stages"] == ["value", "loan", "rent", "depreciation", "cashflow"]
+    assert second["recomputed_stages"] == ["cashflow"]
+    full = run_simulation({**payload, "tax_rate": 0.42, "incremental": False})
+    assert second["records"] == full["records"]
+    assert second["summary"] == full["summary"]
+    assert "recomputed_stages" not in full
+
+
+def test_rental_sweep_summarizes_every_combination():
+    payload = {
+        "sweep": {
+            "loan_interest_rate": {"start": 0.01, "stop": 0.04, "step": 0.01},
+            "tax_rate": [0.0, 0.42],
+        }
+    }
+
+    result = run_sweep(payload)
+
+    assert result["shape"] == [4, 2]
+    assert result["axes"]["loan_interest_rate"] == pytest.approx([0.01, 0.02, 0.03, 0.04])
+    single = run_simulation({"loan_interest_rate": 0.03, "tax_rate": 0.42})
+    assert result["summary"]["total_taxes"][2 * 2 + 1] == pytest.approx(single["summary"]["total_taxes"], abs=0.01)
+
+
+def test_rental_sweep_rejects_unknown_parameters():
+    assert "error" in run_sweep({"sweep": {"unknown_rate": [0.1]}})
+
+
+def test_rental_monte_carlo_returns_bands_per_year():
+    payload = {
+        "n_years": 10,
+        "monte_carlo": {"n_paths": 500, "seed": 3, "value_growth_rate": {"distribution": "normal", "std": 0.03}},
+    }
+
+    result = run_monte_carlo(payload)
+
+    assert result["years"][0] == 2025 and len(result["years"]) == 10
+    assert set(result["bands"]) == {"equity_end", "cashflow_after_tax", "loan_rest_end"}
+    assert len(result["bands"]["equity_end"]["p50"]) == 10
+    assert result == run_monte_carlo(payload)
+
+
+def test_rental_monte_carlo_rejects_unusable_distributions():
+    for spec in (
+        {"distribution": "lognormal", "mean": -1.5, "std": 0.1},
+        {"distribution": "lognormal", "mean": -1, "std": 0.1},
+        {"distribution": "normal", "mean": "nan", "std": 0.1},
+        {"distribution": "uniform", "low": 0.0, "high": "inf"},
+    ):
+        result = run_monte_carlo({"n_years": 5, "monte_carlo": {"n_paths": 10, "rent_increase_rate": spec}})
+        assert "error" in result
+
+
+def test_rental_solve_finds_break_even_rent():
+    result = run_solve({"solve": {"variable": "net_cold_rent_month", "metric": "cashflow_after_tax_year1"}})
+
+    assert result["converged"]
+    check = run_simulation({"net_cold_rent_month": result["value"]})
+    assert check["summary"]["cashflow_after_tax_year1"] == pytest.approx(0.0, abs=0.01)
+
+
+def test_rental_solve_rejects_unknown_variable():
+    assert "error" in run_solve({"solve": {"variable": "loan_years"}})
+    assert "error" in run_solve({})
+
+
+def test_rental_solve_rejects_invalid_bounds():
+    for bounds in ({"lower": "abc"}, {"upper": "inf"}, {"lower": "nan"}, {"lower": [1]}):
+        result = run_solve({"solve": {"variable": "net_cold_rent_month", **bounds}})
+        assert "error" in result
+    assert run_solve({"solve": {"variable": "net_cold_rent_month", "lower": "500", "upper": 3000}})["converged"]
@@ -0,0 +1,198 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from real_estate.models import (  # noqa: E402
+    AnnuityLoan,
+    Landlord,
+    LoanParams,
+    PropertyParams,
+    RealEstateInvestment,
+    RealEstateObject,
+    SelfUsedPropertyInvestment,
+    TaxInterface,
+    Tenant,
+)
+from real_estate.finance import amortization_step  # noqa: E402
+from real_estate.portfolio import InvestmentBatch, simulate_portfolio  # noqa: E402
+
+
+@pytest.mark.parametrize("marital_status", ["single", " Married"])
+def test_tax_interface_batch_matches_scalar(marital_status):
+    tax_interface = TaxInterface(base_year=2026, bracket_shift_rate_per_year=0.02)
+    incomes = np.array([-100.0, 0.0, 15_000.0, 48_000.0, 95_000.5, 350_000.0])
+    years = np.array([2026, 2027, 2035, 2050, 2070, 2076])
+
+    tax, avg, marginal = tax_interface.calculate_tax_batch(marital_status, incomes, years)
+
+    for index, (income, year) in enumerate(zip(incomes, years)):
+        expected = TaxInterface().calculate_tax(marital_status, float(income), int(year))
+        assert (tax[index], avg[index], marginal[index]) == expected
+        assert tax_interface.calculate_tax(marital_status, float(income), int(year)) == expected
+
+
+def test_tax_interface_horizon_returns_tax_with_and_without_additional_income():
+    tax_interface = TaxInterface()
+    years = np.arange(2026, 2076)
+    incomes = 60_000.0 * 1.02 ** (years - 2026)
+
+    without, with_additional = tax_interface.calculate_tax_horizon("married", incomes, 8_000.0, years)
+
+    assert without.shape == with_additional.shape == (50,)
+    assert np.all(with_additional > without)
+    assert with_additional[10] == tax_interface.calculate_tax("married", incomes[10] + 8_000.0, 2036)[0]
+
+
+def test_tax_interface_batch_rejects_years_before_base_year():
+    with pytest.raises(ValueError):
+        TaxInterface(base_year=2026).calculate_tax_batch("single", [50_000.0], [2025])
+
+
+def _random_investments(count, seed=0):
+    rng = np.random.default_rng(seed)
+    shared_tax = TaxInterface()
+    investments = []
+    for index in range(count):
+        price = float(rng.uniform(150_000, 900_000))
+        investments.append(
+            RealEstateInvestment(
+                RealEstateObject(
+                    price,
+                    price * 0.1,
+                    float(rng.uniform(0.5, 0.9)),
+                    float(rng.uniform(-0.01, 0.04)),
+                    float(rng.choice([0.02, 0.03, 0.1])),
+                    float(rng.uniform(500, 4_000)),
+                    0.02,
+                ),
+                AnnuityLoan(
+                    price * float(rng.uniform(0.3, 1.0)),
+                    float(rng.uniform(0.0, 0.05)),
+                    float(rng.uniform(0.01, 0.2)),
+                ),
+                Tenant(float(rng.uniform(6_000, 40_000)), float(rng.uniform(0.0, 0.03)), 600.0, 0.02),
+                Landlord(float(rng.uniform(-5_000, 180_000)), 0.02, "married" if index % 3 == 0 else "single"),
+                shared_tax if index % 2 else TaxInterface(bracket_shift_rate_per_year=0.015),
+                2026 + index % 4,
+            )
+        )
+    return investments
+
+
+def test_investment_batch_matches_object_model():
+    investments = _random_investments(60)
+    n_years = 35
+
+    columns = simulate_portfolio(investments, n_years)
+
+    for index, investment in enumerate(investments):
+        for year in range(n_years):
+            wealth, roe, roe_wo_value = investment.simulate_year()
+            assert columns["wealth"][year, index] == wealth
+            assert columns["return_on_equity"][year, index] == roe
+            assert columns["return_on_equity_wo_value_increase"][year, index] == roe_wo_value
+        assert columns["property_value"][-1, index] == investment.real_estate_object.total_value
+        assert columns["rent"][-1, index] == investment.tenant.net_rent_per_year
+
+
+def test_investment_batch_leaves_source_objects_untouched():
+    investments = _random_investments(3)
+    batch = InvestmentBatch.from_investments(investments)
+    batch.simulate(5)
+
+    assert all(investment.current_year == investment.initial_year for investment in investments)
+    assert np.all(batch.current_year == np.array([i.initial_year for i in investments]) + 5)
+
+
+def test_domain_objects_use_slots():
+    investment = _random_investments(1)[0]
+    for component in (investment.real_estate_object, investment.annuity_loan, investment.tenant, investment.landlord):
+        assert not hasattr(component, "__dict__")
+
+
+def test_fork_of_subclass_keeps_inherited_slots():
+    class NotedTenant(Tenant):
+        __slots__ = ("note",)
+
+    tenant = NotedTenant(12_000.0, 0.02, 1_000.0, 0.01)
+    tenant.note = "index lease"
+    tenant.simulate_year()
+
+    clone = tenant.fork()
+
+    assert clone.note == "index lease"
+    assert clone.simulate_year() == tenant.simulate_year()
+
+
+def test_investment_fork_continues_from_shared_prefix():
+    investment = _random_investments(1, seed=4)[0]
+    reference = _random_investments(1, seed=4)[0]
+    for _ in range(10):
+        investment.simulate_year()
+        reference.simulate_year()
+
+    unchanged = investment.fork()
+    refinanced = investment.fork()
+    refinanced.annuity_loan = AnnuityLoan(refinanced.annuity_loan.remaining_principal_amount, 0.01, 0.05)
+
+    expected = reference.simulate_year()
+    assert unchanged.simulate_year() == expected
+    assert investment.simulate_year() == expected
+    assert refinanced.simulate_year() != expected
+    assert refinanced.current_year == investment.current_year
+
+
+def test_investment_restore_replays_the_same_years():
+    investment = _random_investments(1, seed=2)[0]
+    investment.simulate_year()
+    state = investment.snapshot()
+
+    first_run = [investment.simulate_year() for _ in range(20)]
+    investment.restore(state)
+    second_run = [investment.simulate_year() for _ in range(20)]
+
+    assert first_run == second_run
+
+
+def test_self_used_projection_series_matches_per_year_loop():
+    investment = SelfUsedPropertyInvestment(
+        property_params=PropertyParams(
+            purchase_price=450_000,
+            transaction_cost_factor=0.105,
+            value_growth_rate=0.02,
+            depreciation_basis=0,
+            depreciation_rate=0,
+        ),
+        loan_params=LoanParams(principal=300_000, interest_rate=0.035, years=20),
+        imputed_rent_savings=1_300,
+        maintenance_reserve_pct=0.01,
+        opportunity_cost_rate=0.04,
+        holding_years=30,
+    )
+
+    series = investment.projection_series()
+
+    assert len(series["year"]) == 31
+    assert series["remaining_balance"][0] == 300_000
+    assert series["remaining_balance"][-1] == 0.0
+    annuity = investment._annuity()
+    for years in range(31):
+        balance, interest = 300_000.0, 0.0
+        for _ in range(years):
+            balance, paid, _ = amortization_step(balance, 0.035, annuity)
+            interest += paid
+            if balance <= 0:
+                balance = 0.0
+                break
+        assert series["remaining_balance"][years] == balance
+        assert series["cumulative_interest"][years] == interest
+        assert series["equity"][years] == 450_000 * 1.02**years - balance
+        assert investment.projected_equity(years) == series["equity"][years]
+        assert investment.total_cost_of_ownership(years) == series["cost_of_ownership"][years]
+    assert investment.projected_equity() == series["equity"][-1]
@@ -0,0 +1,265 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from real_estate import (  # noqa: E402
+    LoanParams,
+    PropertyParams,
+    RentParams,
+    SimulationParams,
+    amortization_step,
+    calc_annuity,
+    rent_for_year,
+    simulate,
+    simulate_columns,
+)
+from real_estate.incremental import IncrementalSimulator  # noqa: E402
+from real_estate.simulation import simulate_batch, simulate_sweep, summarize_columns  # noqa: E402
+from real_estate.solver import solve, variable_overrides  # noqa: E402
+from real_estate.monthly_loan import monthly_loan_stage  # noqa: E402
+from real_estate.monte_carlo import (  # noqa: E402
+    Distribution,
+    MonteCarloParams,
+    PercentileAggregator,
+    simulate_monte_carlo,
+)
+
+
+def _params(**overrides) -> SimulationParams:
+    values = {
+        "purchase_price": 400_000.0,
+        "value_growth_rate": 0.02,
+        "interest_rate": 0.035,
+        "annuity": None,
+        "rent_increase_rate": 0.03,
+        "tax_rate": 0.3,
+        "n_years": 30,
+    }
+    values.update(overrides)
+    return SimulationParams(
+        start_year=2025,
+        n_years=values["n_years"],
+        property_params=PropertyParams(
+            purchase_price=values["purchase_price"],
+            transaction_cost_factor=0.105,
+            value_growth_rate=values["value_growth_rate"],
+            depreciation_basis=values["purchase_price"] * 0.8,
+            depreciation_rate=0.02,
+        ),
+        loan_params=LoanParams(
+            principal=320_000.0, interest_rate=values["interest_rate"], years=25, annuity=values["annuity"]
+        ),
+        rent_params=RentParams(
+            net_cold_rent_month=1_400.0,
+            operating_costs_month=220.0,
+            mgmt_costs_annual=1_200.0,
+            rent_increase_rate=values["rent_increase_rate"],
+            rent_increase_interval_years=3,
+        ),
+        tax_rate=values["tax_rate"],
+    )
+
+
+@pytest.mark.parametrize("overrides", [{}, {"interest_rate": 0.0}, {"annuity": 30_000.0, "n_years": 40}])
+def test_simulate_columns_match_year_by_year_reference(overrides):
+    params = _params(**overrides)
+    lp = params.loan_params
+    annuity = lp.annuity or calc_annuity(lp.principal, lp.interest_rate, lp.years)
+
+    columns = simulate_columns(params)
+
+    value, rest = params.property_params.purchase_price, lp.principal
+    for i in range(params.n_years):
+        new_rest, interest, repayment = amortization_step(rest, lp.interest_rate, annuity)
+        _, _, warm_year = rent_for_year(params.rent_params, i)
+        value *= 1 + params.property_params.value_growth_rate
+
+        assert columns["loan_rest_end"][i] == pytest.approx(new_rest, abs=1e-6)
+        assert columns["interest_paid"][i] == pytest.approx(interest, abs=1e-6)
+        assert columns["warm_rent_year"][i] == pytest.approx(warm_year)
+        assert columns["property_value_end"][i] == pytest.approx(value)
+        rest = new_rest
+
+    assert columns["year"].tolist() == list(range(2025, 2025 + params.n_years))
+    assert columns["depreciation_cum"][-1] == pytest.approx(320_000 * 0.02 * params.n_years)
+
+
+def test_simulate_adapter_returns_records_built_from_columns():
+    params = _params()
+
+    records = simulate(params)
+    columns = simulate_columns(params)
+
+    assert len(records) == params.n_years
+    assert records[3]["taxes"] == columns["taxes"][3]
+    assert np.allclose([r["cashflow_after_tax"] for r in records], columns["cashflow_after_tax"])
+
+
+def test_monte_carlo_is_reproducible_and_brackets_the_deterministic_path():
+    params = _params(n_years=20)
+    mc = MonteCarloParams(
+        value_growth_rate=Distribution("lognormal", mean=0.02, std=0.04),
+        rent_increase_rate=Distribution("normal", mean=0.03, std=0.02),
+        loan_interest_rate=Distribution("uniform", low=0.025, high=0.045),
+        n_paths=3_000,
+        batch_size=1_000,
+        seed=7,
+    )
+
+    first = simulate_monte_carlo(params, mc)
+    second = simulate_monte_carlo(params, mc)
+
+    equity = first["bands"]["equity_end"]
+    assert np.array_equal(equity["p50"], second["bands"]["equity_end"]["p50"])
+    assert np.all(equity["p5"] <= equity["p50"]) and np.all(equity["p50"] <= equity["p95"])
+
+    deterministic = simulate_columns(params)["equity_end"]
+    assert np.all(equity["p5"] < deterministic) and np.all(deterministic[1:] < equity["p95"][1:])
+
+
+def test_percentile_aggregator_approximates_exact_percentiles():
+    values = np.random.default_rng(0).normal(size=(20_000, 3)) * [1.0, 10.0, 100.0]
+    aggregator = PercentileAggregator.from_sample(values[:1_000], bins=1_024)
+    for block in np.split(values, 20):
+        aggregator.add(block)
+
+    approx = aggregator.percentiles([10, 50, 90])
+    exact = np.percentile(values, [10, 50, 90], axis=0)
+    assert np.allclose(approx, exact, atol=0.02 * np.array([1.0, 10.0, 100.0]))
+
+
+def test_incremental_simulator_recomputes_only_downstream_stages():
+    simulator = IncrementalSimulator()
+    base = _params(annuity=None)
+
+    columns, recomputed = simulator.simulate_columns(base)
+    assert recomputed == ["value", "loan", "rent", "depreciation", "cashflow"]
+    expected = simulate_columns(base)
+    for name, values in expected.items():
+        np.testing.assert_array_equal(columns[name], values)
+
+    _, recomputed = simulator.simulate_columns(base)
+    assert recomputed == []
+
+    taxed = _params(annuity=None, tax_rate=0.42)
+    columns, recomputed = simulator.simulate_columns(taxed)
+    assert recomputed == ["cashflow"]
+    np.testing.assert_array_equal(columns["taxes"], simulate_columns(taxed)["taxes"])
+
+    rent = _params(annuity=None, rent_increase_rate=0.01)
+    _, recomputed = simulator.simulate_columns(rent)
+    assert recomputed == ["rent", "cashflow"]
+
+
+@pytest.mark.parametrize(
+    "variable, metric",
+    [
+        ("net_cold_rent_month", "cashflow_after_tax_year1"),
+        ("purchase_price", "cashflow_after_tax_year1"),
+        ("equity", "cashflow_after_tax_year1"),
+        ("loan_interest_rate", "total_cashflow_after_tax"),
+    ],
+)
+def test_solver_hits_target_metric(variable, metric):
+    params = _params()
+    result = solve(params, variable, metric=metric, target=0.0)
+
+    assert result.converged
+    assert result.evaluations <= 10
+    assert result.bracket[0] <= result.value <= result.bracket[1]
+    columns = simulate_batch(params, **variable_overrides(params, variable, np.array([result.value])))
+    assert summarize_columns(columns)[metric][0] == pytest.approx(0.0, abs=0.005)
+
+
+def test_solver_purchase_price_keeps_equity():
+    params = _params()
+    overrides = variable_overrides(params, "purchase_price", np.array([500_000.0]))
+
+    equity_before = 400_000.0 * 1.105 - 320_000.0
+    assert overrides["loan_principal"][0] == pytest.approx(500_000.0 * 1.105 - equity_before)
+    assert overrides["depreciation_basis"][0] == pytest.approx(400_000.0)
+
+
+def test_sweep_over_purchase_price_matches_solver_overrides():
+    params = _params()
+    prices = np.array([350_000.0, 500_000.0])
+
+    _, summary = simulate_sweep(params, {"purchase_price": prices})
+    expected = summarize_columns(simulate_batch(params, **variable_overrides(params, "purchase_price", prices)))
+
+    np.testing.assert_array_equal(summary["loan_rest_final"], expected["loan_rest_final"])
+    np.testing.assert_array_equal(summary["total_taxes"], expected["total_taxes"])
+
+
+def test_solver_reports_missing_sign_change():
+    result = solve(_params(), "net_cold_rent_month", target=1e9)
+
+    assert not result.converged
+    assert result.iterations == 0
+    assert "sign change" in result.message
+
+
+def test_simulate_columns_uses_monthly_loan_engine():
+    params = _params()
+    params.loan_params.monthly = True
+    params.loan_params.fixed_rate_years = 10
+    params.loan_params.follow_up_interest_rate = 0.05
+    params.loan_params.special_repayment = 10_000.0
+
+    columns = simulate_columns(params)
+    loan = monthly_loan_stage(params.loan_params, params.n_years)
+
+    np.testing.assert_array_equal(columns["loan_rest_end"], loan["loan_rest_end"])
+    np.testing.assert_array_equal(columns["principal_paid"], loan["principal_paid"])
+    assert columns["loan_rest_end"][-1] == 0
+    np.testing.assert_allclose(
+        columns["cashflow_operating"],
+        columns["warm_rent_year"] - columns["mgmt_costs_annual"] - loan["interest_paid"] - loan["principal_paid"],
+    )
+    incremental, _ = IncrementalSimulator().simulate_columns(params)
+    np.testing.assert_array_equal(incremental["loan_rest_end"], columns["loan_rest_end"])
+
+
+def test_simulate_batch_and_monte_carlo_honour_monthly_loans():
+    params = _params()
+    params.loan_params.monthly = True
+    params.loan_params.fixed_rate_years = 10
+    params.loan_params.follow_up_interest_rate = 0.05
+    rates = np.array([0.02, 0.035])
+
+    batch = simulate_batch(params, loan_interest_rate=rates)
+
+    for row, rate in enumerate(rates):
+        single = _params(interest_rate=rate)
+        single.loan_params.monthly = True
+        single.loan_params.fixed_rate_years = 10
+        single.loan_params.follow_up_interest_rate = 0.05
+        np.testing.assert_allclose(batch["loan_rest_end"][row], simulate_columns(single)["loan_rest_end"])
+
+    mc = MonteCarloParams(
+        value_growth_rate=Distribution("normal", 0.02, 0.0),
+        rent_increase_rate=Distribution("normal", 0.03, 0.0),
+        loan_interest_rate=Distribution("normal", 0.035, 0.0),
+        n_paths=10,
+        seed=1,
+    )
+    median = simulate_monte_carlo(params, mc)["bands"]["loan_rest_end"]["p50"]
+    np.testing.assert_allclose(median, simulate_columns(params)["loan_rest_end"], rtol=1e-3)
+
+
+def test_monthly_loan_rederives_installment_that_stops_covering_interest():
+    params = _params(interest_rate=0.01)
+    params.loan_params.monthly = True
+    params.loan_params.fixed_rate_years = 5
+    params.loan_params.follow_up_interest_rate = 0.12
+
+    loan = monthly_loan_stage(params.loan_params, params.n_years)
+
+    assert np.all(np.diff(loan["loan_rest_end"]) <= 0)
+    assert loan["annuity_annual"][5] > loan["annuity_annual"][4]
@@ -1,6 +1,7 @@
 import sys
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -10,8 +11,13 @@ if str(ROOT) not in sys.path:
 from tax_calculations import (  # noqa: E402
     est_2026,
     est_2026_married,
+    splitting_surface,
+    tax_curve_piecewise,
+    tax_curve_points,
     tax_rates_married,
+    tax_rates_married_array,
     tax_rates_single,
+    tax_rates_single_array,
 )
 
 
@@ -74,3 +80,87 @@ def test_tax_rates_married_uses_splitting(income1, income2, expected_marginal):
     assert est == pytest.approx(est_2026_married(income1, income2))
     assert avg == pytest.approx(expected_avg)
     assert marginal == pytest.approx(expected_marginal)
+
+
+def test_tax_rates_single_array_matches_scalar():
+    incomes = np.array([-50.0, 0.0, 12_348.9, 12_349.0, 17_799.5, 17_800.0, 55_555.55, 69_879.0, 277_826.0, 1e6])
+
+    est, avg, marginal = tax_rates_single_array(incomes)
+
+    for index, income in enumerate(incomes):
+        assert (est[index], avg[index], marginal[index]) == tax_rates_single(income)
+
+
+def test_tax_rates_married_array_broadcasts_and_matches_scalar():
+    incomes = np.array([0.0, 20_000.0, 69_878.0, 300_000.0])
+    partner_incomes = np.array([0.0, 12_348.0, 45_000.5])
+
+    est, avg, marginal = tax_rates_married_array(incomes[:, None], partner_incomes[None, :])
+
+    assert est.shape == (4, 3)
+    for i, income in enumerate(incomes):
+        for j, partner_income in enumerate(partner_incomes):
+            assert (est[i, j], avg[i, j], marginal[i, j]) == tax_rates_married(income, partner_income)
+
+
+def test_lookup_table_matches_formula_and_falls_back_above_ceiling(tmp_path):
+    from tax_calculations.lookup import TaxLookupTable, disable_lookup_table, enable_lookup_table
+
+    incomes = [0, 12_349.7, 17_800, 69_879, 150_000, 150_001.9, 400_000]
+    expected_single = [tax_rates_single(income) for income in incomes]
+    expected_married = [tax_rates_married(income, 10_000) for income in incomes]
+
+    table = enable_lookup_table(tmp_path / "est_2026.npy", ceiling=150_000)
+    try:
+        assert table.ceiling == 150_000
+        assert [tax_rates_single(income) for income in incomes] == expected_single
+        assert [tax_rates_married(income, 10_000) for income in incomes] == expected_married
+        assert np.array_equal(table.est_array(incomes), np.array([est for est, _, _ in expected_single]))
+    finally:
+        disable_lookup_table()
+
+    reopened = TaxLookupTable.open(tmp_path / "est_2026.npy", ceiling=150_000)
+    assert reopened.est(69_879) == est_2026(69_879)
+
+
+@pytest.mark.parametrize("filing_status", ["single", "married"])
+def test_tax_curve_piecewise_reproduces_sampled_points(filing_status):
+    piecewise = tax_curve_piecewise(filing_status, max_income=0)
+    factor = piecewise["splitting_factor"]
+
+    for point in tax_curve_points(filing_status, max_income=0):
+        x = int(point["zve"] // factor)
+        segment = next(
+            s for s in piecewise["segments"] if s["lower"] <= x and (s["upper"] is None or x <= s["upper"])
+        )
+        c0, c1, c2 = segment["coefficients"]
+        t = (x - segment["origin"]) / segment["scale"]
+        est = factor * ((c2 * t + c1) * t + c0)
+        marginal = (2 * c2 * t + c1) / segment["scale"] * 100
+
+        assert round(est, 2) == pytest.approx(point["est"], abs=0.01)
+        assert round(marginal, 2) == pytest.approx(point["marginal_rate"], abs=0.01)
+
+
+def test_tax_curve_points_include_upper_bound():
+    points = tax_curve_points("single", max_income=300_500.5)
+
+    assert points[0]["zve"] == 0.0
+    assert points[-2]["zve"] == 300_000.0
+    assert points[-1]["zve"] == 300_500.5
+
+
+def test_splitting_surface_matches_scalar_assessments():
+    incomes = np.array([0.0, 30_000.0, 90_000.0])
+    partner_incomes = np.array([0.0, 15_000.0])
+
+    married, separate, advantage = splitting_surface(incomes, partner_incomes)
+
+    assert married.shape == separate.shape == advantage.shape == (3, 2)
+    for i, income in enumerate(incomes):
+        for j, partner_income in enumerate(partner_incomes):
+            assert married[i, j] == tax_rates_married(income, partner_income)[0]
+            expected_separate = tax_rates_single(income)[0] + tax_rates_single(partner_income)[0]
+            assert separate[i, j] == pytest.approx(expected_separate)
+    assert advantage[2, 0] > 0
+    assert advantage[0, 0] == 0